@@ -3,51 +3,71 @@ Flask REST API Server for Astrology Calculations using jyotishganit
 This provides endpoints for your frontend to get birth chart data
 """
 
-from flask import Flask, request, jsonify
+import time
+_import_start = time.perf_counter()
+
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from datetime import datetime
-from jyotishganit import calculate_birth_chart, get_birth_chart_json
 import traceback
-import json
 import os
 
 # Import our analysis modules
-from modules.compatibility import calculate_compatibility_details
-from modules.kundali_summary import get_kundali_summary
-from modules.career_analyzer import analyze_career
-from modules.wealth_analyzer import analyze_wealth
-from modules.health_analyzer import analyze_health
-from modules.marriage_analyzer import analyze_marriage
-from modules.numerology import get_numerology
 from modules.dasha import get_dasha_data
-from modules.yoga_dosha_analyzer import analyze_yoga_dosha
-from modules.personality_insights import get_personality_insights
+from modules.chart_cache import chart_cache, cached_birth_chart
+from modules.yoga_dosha_cache import start_prewarm as start_yoga_dosha_prewarm, yoga_dosha_cache
+from modules.chart_serializer import extract_panchanga
+from modules.report_sections import build_birth_chart_report, parse_datetime, parse_sections
+from modules.batch_reports import generate_birth_chart_batch
 from modules import db as orders_db
 from modules.orders_services import (
     get_amount_and_title,
     validate_create_payload,
     create_razorpay_order,
     verify_payment_signature,
-    order_payload_to_record,
-    send_admin_email_for_order,
+    verify_webhook_signature,
+    finalize_order,
 )
+from modules.email_outbox import start_email_sender
+from modules.janitor import get_janitor_metrics, start_janitor
+from modules.response_cache import admin_response_cache, cached_get
+from modules.report_worker import get_order_report, start_report_workers
 from modules.admin_auth import hash_password, check_password, issue_jwt, verify_jwt, get_bearer_token, admin_required
+from modules import knowledge_base, startup
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
-
-# --- Orders & admin: init DB and seed admin on first use ---
-orders_db.init_db()
-orders_db.seed_admin_if_empty(hash_password)
+startup.timings["imports"] = (time.perf_counter() - _import_start) * 1000
 
-def parse_datetime(date_str, time_str):
-    """Parse date and time strings into datetime object"""
-    try:
-        # Expected format: "YYYY-MM-DD" and "HH:MM"
-        datetime_str = f"{date_str} {time_str}"
-        return datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
-    except Exception as e:
-        raise ValueError(f"Invalid date/time format: {e}")
+app = Flask(__name__)
+CORS(app, expose_headers=["X-Next-Cursor", "Server-Timing", "ETag"])  # Enable CORS for all routes
+
+# Admin list/stats responses are cached until the next order write
+orders_db.add_write_listener(admin_response_cache.invalidate)
+
+
+def start_orders_backend():
+    """Init the orders DB, seed the admin user and start the background threads."""
+    with startup.phase("db_init"):
+        orders_db.init_db()
+    with startup.phase("admin_seed"):
+        orders_db.seed_admin_if_empty(hash_password)
+    with startup.phase("background_threads"):
+        # Background report generation for paid orders, and admin email delivery
+        start_report_workers()
+        start_email_sender()
+        # Expire abandoned checkout payloads and reclaim their space
+        start_janitor()
+        # Yoga/dosha results for configurations seen before (YOGA_DOSHA_CACHE_WARM_FILE)
+        start_yoga_dosha_prewarm()
+
+
+if startup.STARTUP_DEFER_DB_INIT:
+    # First request (e.g. the readiness probe) pays for it instead of worker start
+    app.before_request(startup.run_once(start_orders_backend))
+else:
+    start_orders_backend()
+if startup.STARTUP_PROFILE:
+    with startup.phase("knowledge_base"):
+        knowledge_base.preload()
+    startup.print_report()
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -72,156 +92,27 @@ def get_birth_chart():
         "longitude": 77.2090,
         "timezone": 5.5
     }
+
+    Optional query parameter sections (alias fields): comma-separated subset of
+    charts, compatibility, panchanga, kundali_summary, career, wealth, health, marriage,
+    yoga_dosha, personality_insights, numerology, dasha. Only those (and what they depend on)
+    are computed; omitted top-level keys are left out of the response.
     """
     try:
         data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['name', 'date', 'time', 'latitude', 'longitude', 'timezone']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    "success": False,
-                    "error": f"Missing required field: {field}"
-                }), 400
-        
-        # Parse datetime
-        date_of_birth = parse_datetime(data['date'], data['time'])
-        
-        # 1. Calculate
-        chart = calculate_birth_chart(
-            birth_date=date_of_birth,
-            latitude=float(data['latitude']),
-            longitude=float(data['longitude']),
-            timezone_offset=float(data['timezone']),
-            name=data['name']
-        )
-        
-        # 2. Serialize chart data
-        json_data = get_birth_chart_json(chart)
-        
-        # Handle if it returns dict or string
-        if isinstance(json_data, str):
-            chart_result = json.loads(json_data)
-        else:
-            chart_result = json_data
-
-        # 3. Calculate compatibility details (use chart_result so we read same Moon data as in response)
-        try:
-            compatibility = calculate_compatibility_details(chart, data['name'], chart_result=chart_result)
-        except Exception as e:
-            compatibility = {"error": str(e)}
-
-        # 4. Extract Panchanga data
-        panchanga_data = {}
-        if 'panchanga' in chart_result:
-            panchanga = chart_result['panchanga']
-            panchanga_data = {
-                "tithi": panchanga.get('tithi') if isinstance(panchanga, dict) else None,
-                "nakshatra": panchanga.get('nakshatra') if isinstance(panchanga, dict) else None,
-                "nakshatra_pada": None,  # Will extract from Moon if available
-                "yoga": panchanga.get('yoga') if isinstance(panchanga, dict) else None,
-                "karana": panchanga.get('karana') if isinstance(panchanga, dict) else None,
-                "vaara": panchanga.get('vaara') if isinstance(panchanga, dict) else None
-            }
-        
-        # Extract Nakshatra Pada from Moon
-        try:
-            for planet in chart.d1_chart.planets:
-                if planet.celestial_body == "Moon":
-                    panchanga_data["nakshatra_pada"] = planet.pada if hasattr(planet, 'pada') else None
-                    break
-        except:
-            pass
-
-        # 5. Extract chart data (D1, D2, D9, D10, D16)
-        charts_data = {
-            "d1": chart_result.get('d1Chart', {}),
-            "d2": chart_result.get('divisionalCharts', {}).get('d2', {}),
-            "d9": chart_result.get('divisionalCharts', {}).get('d9', {}),
-            "d10": chart_result.get('divisionalCharts', {}).get('d10', {}),
-            "d16": chart_result.get('divisionalCharts', {}).get('d16', {})
-        }
 
-        # 6. Analyze sections (career, wealth, health, marriage, yoga_dosha, numerology, dasha)
-        sections = {}
-        try:
-            sections["career"] = analyze_career(chart) or {}
-            sections["wealth"] = analyze_wealth(chart) or {}
-            sections["health"] = analyze_health(chart) or {}
-            sections["marriage"] = analyze_marriage(chart) or {}
-        except Exception as e:
-            sections = {"error": f"Analysis error: {str(e)}"}
-
-        try:
-            sections["yoga_dosha"] = analyze_yoga_dosha(chart)
-        except Exception as e:
-            sections["yoga_dosha"] = {"error": str(e), "yogas": [], "doshas": [], "summary": "Yoga/Dosha analysis unavailable."}
-
-        try:
-            sections["personality_insights"] = get_personality_insights(
-                chart,
-                panchanga=panchanga_data,
-                yoga_dosha_result=sections.get("yoga_dosha")
-            )
-        except Exception as e:
-            sections["personality_insights"] = {"error": str(e)}
-
-        try:
-            sections["numerology"] = get_numerology(data['name'], data['date'])
-        except Exception as e:
-            sections["numerology"] = {"error": str(e)}
-
-        try:
-            dasha = get_dasha_data(chart)
-            sections["dasha"] = dasha if dasha is not None else {"error": "Dasha data not available"}
-        except Exception as e:
-            sections["dasha"] = {"error": str(e)}
-
-        # Kundali summary: Manglik, Sade Sati, current Dasha (for display above charts)
-        try:
-            kundali_summary = get_kundali_summary(
-                chart,
-                yoga_dosha_result=sections.get("yoga_dosha"),
-                dasha_data=sections.get("dasha"),
-                latitude=float(data.get("latitude")),
-                longitude=float(data.get("longitude")),
-                timezone_offset=float(data.get("timezone", 5.5))
-            )
-        except Exception as e:
-            kundali_summary = {"manglik_status": "Unknown", "sade_sati_status": "Unknown", "current_dasha": None, "error": str(e)}
-
-        # 7. Build complete response: numerology and dasha ONLY inside sections (never at top level)
-        result = {
-            "success": True,
-            "basic_details": {
-                "name": data['name'],
-                "dob": data['date'],
-                "time": data['time'],
-                "place": data.get('place', ''),  # Optional
-                "latitude": data['latitude'],
-                "longitude": data['longitude'],
-                "timezone": data['timezone']
-            },
-            "charts": charts_data,
-            "compatibility": compatibility,
-            "panchanga": panchanga_data,
-            "kundali_summary": kundali_summary,
-            "sections": sections,
-            "input": {
-                'name': data['name'],
-                'date': data['date'],
-                'time': data['time'],
-                'latitude': data['latitude'],
-                'longitude': data['longitude'],
-                'timezone': data['timezone']
-            }
-        }
-        # Ensure no top-level dasha/numerology (they must only appear under sections)
-        result.pop("dasha", None)
-        result.pop("numerology", None)
+        # Optional subset of sections (?sections=career,dasha or ?fields=...); default is everything
+        requested = parse_sections(request.args.get('sections') or request.args.get('fields'))
 
-        return jsonify(result)
+        timings = {}
+        result = build_birth_chart_report(data, requested, timings=timings)
+
+        response = jsonify(result)
+        # Per-section wall time (ms), visible in browser dev tools
+        response.headers["Server-Timing"] = ", ".join(
+            f"{name};dur={ms:.1f}" for name, ms in timings.items()
+        )
+        return response
         
     except ValueError as e:
         return jsonify({
@@ -235,6 +126,40 @@ def get_birth_chart():
             "traceback": traceback.format_exc()
         }), 500
 
+@app.route('/api/birth-chart/batch', methods=['POST'])
+@admin_required
+def get_birth_chart_batch():
+    """
+    Birth charts for many people in one request (auth).
+
+    Expected JSON body:
+    {
+        "records": [ { same fields as /api/birth-chart }, ... ],
+        "sections": "dasha,kundali_summary"   (optional, as ?sections= on /api/birth-chart)
+    }
+
+    Streams NDJSON: one line per record as soon as its chart is ready (not in input order),
+    each the /api/birth-chart payload plus "index" (position in records), or
+    {"index", "success": false, "error"}. Identical birth inputs share one chart calculation.
+    """
+    try:
+        data = request.get_json() or {}
+        requested = parse_sections(
+            data.get('sections') or request.args.get('sections') or request.args.get('fields')
+        )
+        results = generate_birth_chart_batch(data.get('records'), requested)
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+
+    def ndjson():
+        for result in results:
+            yield app.json.dumps(result) + "\n"
+
+    return Response(stream_with_context(ndjson()), mimetype='application/x-ndjson')
+
 @app.route('/api/panchanga', methods=['POST'])
 def get_panchanga():
     """
@@ -268,29 +193,18 @@ def get_panchanga():
         date_of_birth = parse_datetime(data['date'], data['time'])
         
         # 1. Calculate
-        chart = calculate_birth_chart(
-            birth_date=date_of_birth,
-            latitude=float(data['latitude']),
-            longitude=float(data['longitude']),
-            timezone_offset=float(data['timezone']),
-            name="Panchanga Query"
+        chart = cached_birth_chart(
+            date_of_birth,
+            float(data['latitude']),
+            float(data['longitude']),
+            float(data['timezone'])
         )
         
-        # 2. Serialize
-        json_data = get_birth_chart_json(chart)
-        
-        if isinstance(json_data, str):
-            full_data = json.loads(json_data)
-        else:
-            full_data = json_data
-
+        # 2. Serialize only the Panchanga subtree
         result = {"success": True}
-        
-        # Extract panchanga-related fields if they exist
-        panchanga_fields = ['tithi', 'nakshatra', 'yoga', 'karana', 'vaara', 'panchanga']
-        for field in panchanga_fields:
-            if field in full_data:
-                result[field] = full_data[field]
+        panchanga = extract_panchanga(chart)
+        if panchanga:
+            result["panchanga"] = panchanga
         
         return jsonify(result)
         
@@ -343,12 +257,11 @@ def get_dasha():
         
         date_of_birth = parse_datetime(data['date'], data['time'])
         
-        chart = calculate_birth_chart(
-            birth_date=date_of_birth,
-            latitude=float(data['latitude']),
-            longitude=float(data['longitude']),
-            timezone_offset=float(data['timezone']),
-            name=data['name']
+        chart = cached_birth_chart(
+            date_of_birth,
+            float(data['latitude']),
+            float(data['longitude']),
+            float(data['timezone'])
         )
 
         dasha = get_dasha_data(chart)
@@ -432,12 +345,8 @@ def orders_verify():
             return jsonify({"error": "razorpay_payment_id, razorpay_order_id, razorpay_signature, order_payload required"}), 400
         if not verify_payment_signature(ro_id, rp_id, sig):
             return jsonify({"error": "Invalid signature"}), 400
-        if orders_db.order_exists_by_payment_id(rp_id):
-            return jsonify({"success": True, "order_id": ro_id}), 200
-        record = order_payload_to_record(payload, ro_id, rp_id)
-        orders_db.save_order(record)
-        send_admin_email_for_order(record)
-        orders_db.delete_pending_payload(ro_id)
+        # Idempotent: a webhook that already recorded this payment makes this a no-op
+        finalize_order(ro_id, rp_id, payload)
         return jsonify({"success": True, "order_id": ro_id})
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -451,13 +360,8 @@ def webhooks_razorpay():
     try:
         raw = request.get_data()
         sig = request.headers.get("X-Razorpay-Signature", "")
-        secret = os.environ.get("RAZORPAY_WEBHOOK_SECRET", "")
-        if secret:
-            import hmac
-            import hashlib
-            expected = hmac.new(secret.encode(), raw, hashlib.sha256).hexdigest()
-            if not hmac.compare_digest(expected, sig):
-                return jsonify({"error": "Invalid webhook signature"}), 400
+        if os.environ.get("RAZORPAY_WEBHOOK_SECRET") and not verify_webhook_signature(raw, sig):
+            return jsonify({"error": "Invalid webhook signature"}), 400
         body = request.get_json() or {}
         if body.get("event") != "payment.captured":
             return jsonify({"ok": True}), 200
@@ -467,15 +371,7 @@ def webhooks_razorpay():
         ro_id = payment.get("order_id")
         if not rp_id or not ro_id:
             return jsonify({"ok": True}), 200
-        if orders_db.order_exists_by_payment_id(rp_id):
-            return jsonify({"ok": True}), 200
-        payload = orders_db.get_pending_payload(ro_id)
-        if not payload:
-            return jsonify({"ok": True}), 200
-        record = order_payload_to_record(payload, ro_id, rp_id)
-        orders_db.save_order(record)
-        send_admin_email_for_order(record)
-        orders_db.delete_pending_payload(ro_id)
+        finalize_order(ro_id, rp_id)
         return jsonify({"ok": True}), 200
     except Exception:
         return jsonify({"error": "Webhook processing failed"}), 500
@@ -499,14 +395,32 @@ def admin_login():
 
 @app.route('/api/admin/orders', methods=['GET'])
 @admin_required
+@cached_get()
 def admin_orders_list():
+    """
+    Orders, newest first. Paging: pass ?cursor= (empty for the first page) to get
+    {"orders": [...], "next_cursor": "..." | null} and follow next_cursor; without cursor the
+    response is the plain list, paged with limit/offset. Both forms send X-Next-Cursor.
+    """
     status = request.args.get("status")
     from_date = request.args.get("from_date")
     to_date = request.args.get("to_date")
     limit = min(int(request.args.get("limit", 50) or 50), 100)
     offset = int(request.args.get("offset", 0) or 0)
-    rows = orders_db.list_orders(status=status, from_date=from_date, to_date=to_date, limit=limit, offset=offset)
-    return jsonify(rows)
+    cursor = request.args.get("cursor")
+    try:
+        rows, next_cursor = orders_db.list_orders_page(
+            status=status, from_date=from_date, to_date=to_date, limit=limit, offset=offset, cursor=cursor
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if cursor is not None:
+        response = jsonify({"orders": rows, "next_cursor": next_cursor})
+    else:
+        response = jsonify(rows)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
 
 
 @app.route('/api/admin/orders/<int:order_id>', methods=['GET'])
@@ -515,7 +429,13 @@ def admin_order_detail(order_id):
     order = orders_db.get_order_by_id(order_id)
     if not order:
         return jsonify({"error": "Order not found"}), 404
-    return jsonify(dict(order))
+    result = dict(order)
+    # Birth-chart report precomputed in the background when the order was saved
+    report = get_order_report(order_id)
+    result["report_status"] = report["status"] if report else None
+    result["report_error"] = report["error"] if report else None
+    result["report"] = report["report"] if report else None
+    return jsonify(result)
 
 
 @app.route('/api/admin/orders/<int:order_id>', methods=['PATCH'])
@@ -532,8 +452,57 @@ def admin_order_patch(order_id):
 
 @app.route('/api/admin/stats', methods=['GET'])
 @admin_required
+@cached_get()
 def admin_stats():
-    return jsonify(orders_db.get_orders_stats())
+    stats = orders_db.get_orders_stats()
+    stats["revenue_by_service"] = orders_db.get_revenue_by_service()
+    return jsonify(stats)
+
+@app.route('/api/admin/stats/timeseries', methods=['GET'])
+@admin_required
+@cached_get()
+def admin_stats_timeseries():
+    """Orders and revenue per day/week/month (?bucket=, from_date, to_date, status, service_id)."""
+    try:
+        rows = orders_db.get_orders_timeseries(
+            bucket=request.args.get("bucket", "day"),
+            from_date=request.args.get("from_date"),
+            to_date=request.args.get("to_date"),
+            status=request.args.get("status"),
+            service_id=request.args.get("service_id"),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(rows)
+
+
+@app.route('/api/admin/email-outbox', methods=['GET'])
+@admin_required
+def admin_email_outbox():
+    """Admin email delivery state: counts by status and recent failures."""
+    return jsonify(orders_db.get_email_outbox_stats())
+
+@app.route('/api/admin/pending-payloads', methods=['GET'])
+@admin_required
+def admin_pending_payloads():
+    """Size of pending_order_payloads and the last janitor run."""
+    return jsonify(get_janitor_metrics())
+
+@app.route('/api/admin/chart-cache', methods=['GET'])
+@admin_required
+def admin_chart_cache():
+    """Birth-chart cache size and hit/miss counters."""
+    return jsonify(chart_cache.stats())
+
+@app.route('/api/admin/yoga-dosha-cache', methods=['GET'])
+@admin_required
+def admin_yoga_dosha_cache():
+    """Yoga/dosha configuration cache size and hit rate; ?hot=N adds the N hottest keys (warm file lines)."""
+    stats = yoga_dosha_cache.stats()
+    hot = request.args.get('hot', type=int)
+    if hot:
+        stats["hot_keys"] = yoga_dosha_cache.hot_keys(hot)
+    return jsonify(stats)
 
 
 if __name__ == '__main__':
@@ -548,6 +517,7 @@ if __name__ == '__main__':
     print("\nAvailable endpoints:")
     print("  GET  /api/health           - Health check")
     print("  POST /api/birth-chart      - Get complete birth chart with all analyses")
+    print("  POST /api/birth-chart/batch - Birth charts for many records, NDJSON (auth)")
     print("  POST /api/panchanga        - Get Panchanga details")
     print("  POST /api/dasha            - Get Dasha periods")
     print("  POST /api/orders/create    - Create Razorpay order (test mode)")
@@ -555,9 +525,14 @@ if __name__ == '__main__':
     print("  POST /api/webhooks/razorpay - Razorpay webhook")
     print("  POST /api/admin/login      - Admin login (JWT)")
     print("  GET  /api/admin/orders     - List orders (auth)")
-    print("  GET  /api/admin/orders/<id> - Order detail (auth)")
+    print("  GET  /api/admin/orders/<id> - Order detail + precomputed report (auth)")
     print("  PATCH /api/admin/orders/<id> - Mark completed (auth)")
     print("  GET  /api/admin/stats      - Stats (auth)")
+    print("  GET  /api/admin/stats/timeseries - Orders/revenue per day, week or month (auth)")
+    print("  GET  /api/admin/email-outbox - Admin email delivery state (auth)")
+    print("  GET  /api/admin/pending-payloads - Pending payload table size, janitor runs (auth)")
+    print("  GET  /api/admin/chart-cache - Chart cache stats (auth)")
+    print("  GET  /api/admin/yoga-dosha-cache - Yoga/dosha cache stats, ?hot=N hottest keys (auth)")
     print("\n✨ /api/birth-chart includes:")
     print("  - Compatibility parameters (Varna, Vashya, Yoni, etc.)")
     print("  - Career, Wealth, Health, Marriage analyses (D10, D2, D16, D9)")
@@ -0,0 +1,70 @@
+"""
+Benchmark: full get_birth_chart_json(chart) + subtree picking vs. modules.chart_serializer.
+Measures latency and peak Python allocations (tracemalloc) of producing the
+d1/d2/d9/d10/d16/panchanga dicts used by /api/birth-chart.
+
+Run from the repo root (needs jyotishganit ephemeris files):
+    python -m benchmarks.bench_chart_serialization [iterations]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from jyotishganit import calculate_birth_chart, get_birth_chart_json
+
+from modules.chart_serializer import extract_charts_data, extract_panchanga
+
+
+def full_round_trip(chart):
+    json_data = get_birth_chart_json(chart)
+    chart_result = json.loads(json_data) if isinstance(json_data, str) else json_data
+    charts_data = {"d1": chart_result.get('d1Chart', {})}
+    for key in ("d2", "d9", "d10", "d16"):
+        charts_data[key] = chart_result.get('divisionalCharts', {}).get(key, {})
+    return charts_data, chart_result.get('panchanga', {})
+
+
+def direct_subtrees(chart):
+    return extract_charts_data(chart), extract_panchanga(chart)
+
+
+def measure(fn, chart, iterations):
+    fn(chart)  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(chart)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / iterations
+
+    tracemalloc.start()
+    fn(chart)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    chart = calculate_birth_chart(
+        birth_date=datetime(1990, 5, 15, 10, 30),
+        latitude=28.6139,
+        longitude=77.2090,
+        timezone_offset=5.5,
+        name=None
+    )
+    assert full_round_trip(chart) == direct_subtrees(chart), "serializer output differs"
+
+    results = {}
+    for label, fn in (("get_birth_chart_json", full_round_trip), ("chart_serializer", direct_subtrees)):
+        results[label] = measure(fn, chart, iterations)
+        ms, peak = results[label]
+        print(f"{label:22s} {ms:8.3f} ms/call   peak alloc {peak / 1024:8.1f} KiB")
+
+    (full_ms, full_peak), (direct_ms, direct_peak) = results.values()
+    print(f"speedup {full_ms / direct_ms:.1f}x, peak allocation {full_peak / max(direct_peak, 1):.1f}x smaller")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: cold-start cost of the data/*.json knowledge bases, each case in a fresh
+interpreter (median of several runs):
+  - importing the analyzer modules that use them (tables now load lazily),
+  - loading every table by parsing JSON (what each worker did at import before),
+  - loading every table from the compiled marshal files.
+
+    python -m benchmarks.bench_knowledge_base_startup [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+IMPORT_ANALYZERS = """
+import time
+t = time.perf_counter()
+import modules.analysis_engine, modules.compatibility, modules.dasha, modules.numerology, modules.personality_insights
+print((time.perf_counter() - t) * 1000)
+"""
+
+LOAD_ALL = """
+import time
+from modules import knowledge_base
+t = time.perf_counter()
+knowledge_base.preload()
+print((time.perf_counter() - t) * 1000)
+"""
+
+
+def run(code, runs, **env):
+    times = []
+    env = {**os.environ, **env}
+    # Deployed workers import from .pyc files; compiling the sources would dominate the timing
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, env=env,
+            capture_output=True, text=True, check=True,
+        ).stdout
+        times.append(float(out.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = {"KNOWLEDGE_BASE_CACHE_DIR": cache_dir, "PYTHONPYCACHEPREFIX": os.path.join(cache_dir, "pyc")}
+        # Build the compiled tables and bytecode once
+        run(IMPORT_ANALYZERS + LOAD_ALL, 1, **env)
+        rows = [
+            ("import analyzer modules (lazy tables)", run(IMPORT_ANALYZERS, runs, **env)),
+            ("load all tables: parse JSON", run(LOAD_ALL, runs, KNOWLEDGE_BASE_COMPILED="0", **env)),
+            ("load all tables: compiled", run(LOAD_ALL, runs, **env)),
+        ]
+    print(f"median of {runs} fresh interpreters")
+    for label, ms in rows:
+        print(f"  {label:<40} {ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: numerology for a whole customer list, get_numerology per record vs
+get_numerology_batch (NumPy), after checking that they agree.
+Records mix canonical dates with other layouts the per-record parser accepts or rejects, and
+ASCII names with accented, non-Latin and empty ones.
+
+    python -m benchmarks.bench_numerology_batch [records] [seed]
+"""
+
+import random
+import string
+import sys
+import time
+
+from modules.numerology import get_numerology, get_numerology_batch, numerology_numbers_batch
+
+_ODD_DATES = ["", "1990-5-17", " 1990-05-17 ", "1990/05/17", "1990-13-01", "1990-00-10", "0000-01-01",
+              "12345-01-01", "1990-05-32", "abcd-ef-gh", "1990-05", "1990-05-1７", "1990_05_17"]
+_ODD_NAMES = ["", "  ", "José Ñúñez", "Straße", "ﬁona", "Анна Иванова", "李小龙", "o'brien-smith", "A.B. C"]
+
+
+def random_record(rng):
+    if rng.random() < 0.05:
+        date = rng.choice(_ODD_DATES)
+    else:
+        date = f"{rng.randint(1930, 2015):04d}-{rng.randint(1, 12):02d}-{rng.randint(1, 31):02d}"
+    if rng.random() < 0.05:
+        name = rng.choice(_ODD_NAMES)
+    else:
+        name = " ".join(
+            "".join(rng.choice(string.ascii_letters) for _ in range(rng.randint(2, 10)))
+            for _ in range(rng.randint(1, 3))
+        )
+    return name, date
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rng = random.Random(int(sys.argv[2]) if len(sys.argv) > 2 else 1)
+    records = [random_record(rng) for _ in range(n)]
+    names = [r[0] for r in records]
+    dates = [r[1] for r in records]
+
+    start = time.perf_counter()
+    expected = [get_numerology(name, date) for name, date in records]
+    per_record = time.perf_counter() - start
+
+    start = time.perf_counter()
+    got = get_numerology_batch(names, dates)
+    batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    numerology_numbers_batch(names, dates)
+    numbers_only = time.perf_counter() - start
+
+    mismatches = [i for i, (a, b) in enumerate(zip(expected, got)) if a != b]
+    for i in mismatches[:3]:
+        print("MISMATCH", repr(records[i]), expected[i], got[i], sep="\n  ")
+    print(f"{n} records, {len(mismatches)} mismatches, {sum(1 for e in expected if 'error' in e)} invalid dates")
+    print(f"  get_numerology per record   {per_record * 1000:8.1f} ms")
+    print(f"  get_numerology_batch        {batch * 1000:8.1f} ms  ({per_record / batch:.1f}x)")
+    print(f"  numerology_numbers_batch    {numbers_only * 1000:8.1f} ms  (numbers only)")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: LIMIT/OFFSET vs keyset (cursor) pagination of the admin order listing over a
+synthetic orders table (default one million rows). Offset pages get slower with depth because
+SQLite walks and discards every skipped row; cursor pages are a single index seek.
+
+    python -m benchmarks.bench_order_pagination [rows]
+"""
+
+import sys
+import time
+
+from benchmarks.order_query_plans import populate
+from modules import db
+
+PAGE_SIZE = 50
+
+
+def time_ms(fn, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    db.init_db()
+    t = time.perf_counter()
+    populate(n_rows)
+    print(f"{n_rows} orders built in {time.perf_counter() - t:.1f}s ({db.DATABASE_PATH})\n")
+
+    for status in (None, "pending"):
+        print(f"status={status or 'any'}")
+        print(f"{'depth':>10} {'offset ms':>10} {'cursor ms':>10}")
+        with db.get_db() as conn:
+            total = conn.execute(
+                "SELECT COUNT(*) FROM orders WHERE ? IS NULL OR status = ?", (status, status)
+            ).fetchone()[0]
+        for depth in sorted({0, 1_000, 10_000, 100_000, total // 2, total - 2 * PAGE_SIZE}):
+            offset_ms, offset_rows = time_ms(
+                lambda: db.list_orders(status=status, limit=PAGE_SIZE, offset=depth)
+            )
+            cursor = None
+            if depth:
+                # Cursor of the row just before this page, as the previous page would have returned it
+                prev = db.list_orders(status=status, limit=1, offset=depth - 1)[0]
+                cursor = db.encode_order_cursor(prev["created_at"], prev["id"])
+            cursor_ms, cursor_rows = time_ms(
+                lambda: db.list_orders(status=status, limit=PAGE_SIZE, cursor=cursor)
+            )
+            assert offset_rows == cursor_rows
+            print(f"{depth:>10} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+        print()
+
+
+if __name__ == '__main__':
+    main()
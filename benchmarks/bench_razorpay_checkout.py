@@ -0,0 +1,102 @@
+"""
+Benchmark: checkout order creation and signature verification against a local HTTP stand-in
+for the Razorpay API. Compares a new razorpay.Client per call (fresh connection every
+checkout) with the shared pooled client in orders_services, and SDK vs local HMAC
+signature checks. The stand-in delays each new connection by HANDSHAKE_MS to model the
+TCP + TLS setup a real https://api.razorpay.com connection pays.
+
+    python -m benchmarks.bench_razorpay_checkout [calls] [handshake_ms]
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+KEY_ID = "rzp_test_bench"
+KEY_SECRET = "bench_secret"
+
+
+class RazorpayStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # Headers and body go out in separate writes; without this, delayed ACKs add ~40 ms
+    disable_nagle_algorithm = True
+    handshake_ms = 0.0
+
+    def setup(self):
+        super().setup()
+        time.sleep(self.handshake_ms / 1000)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path != "/v1/orders":
+            self.send_error(404)
+            return
+        order = {"id": "order_" + uuid.uuid4().hex[:14], "entity": "order", "status": "created", **body}
+        out = json.dumps(order).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+
+def time_ms(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    RazorpayStandIn.handshake_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RazorpayStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    os.environ.update(
+        RAZORPAY_KEY_ID=KEY_ID, RAZORPAY_KEY_SECRET=KEY_SECRET, RAZORPAY_BASE_URL=base_url
+    )
+    import razorpay
+    from modules import orders_services
+
+    def per_call_client():
+        client = razorpay.Client(auth=(KEY_ID, KEY_SECRET), base_url=base_url)
+        client.order.create(data={"amount": 179900, "currency": "INR", "receipt": "bench"})
+
+    def pooled_client():
+        orders_services.create_razorpay_order(179900)
+
+    print(f"order create, {calls} calls, {RazorpayStandIn.handshake_ms:.0f} ms per new connection")
+    per_call_client(), pooled_client()  # warm imports
+    print(f"  new client per call: {time_ms(per_call_client, calls):8.2f} ms/order")
+    print(f"  shared pooled client: {time_ms(pooled_client, calls):8.2f} ms/order")
+
+    order_id, payment_id = "order_bench", "pay_bench"
+    signature = hmac.new(KEY_SECRET.encode(), f"{order_id}|{payment_id}".encode(), hashlib.sha256).hexdigest()
+    params = {"razorpay_order_id": order_id, "razorpay_payment_id": payment_id, "razorpay_signature": signature}
+
+    def sdk_verify():
+        razorpay.Client(auth=(KEY_ID, KEY_SECRET)).utility.verify_payment_signature(params)
+
+    def hmac_verify():
+        assert orders_services.verify_payment_signature(order_id, payment_id, signature)
+
+    n = calls * 50
+    print(f"\nsignature verification, {n} calls")
+    print(f"  SDK client per call: {time_ms(sdk_verify, n) * 1000:8.1f} us")
+    print(f"  local HMAC:          {time_ms(hmac_verify, n) * 1000:8.1f} us")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
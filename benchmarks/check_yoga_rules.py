@@ -0,0 +1,109 @@
+"""
+Check that the compiled yoga/dosha rules in modules/yoga_dosha_analyzer.py give exactly the
+output of the original hand-written checks (benchmarks/yoga_dosha_reference.py), then time both.
+Also checks that a whole-sign chart's configuration key (the yoga/dosha cache key) determines its
+result: the chart rebuilt from the key must give the same yogas and doshas.
+
+Charts are random D1 layouts: whole charts with houses, charts with some planets or signs
+missing, and planets-only charts (no houses). Planet signs are drawn from a few signs at a
+time as well as from all twelve, so crowded layouts (Gola, Yuga, Nabhasa, ...) come up too.
+
+    python -m benchmarks.check_yoga_rules [charts] [seed]
+"""
+
+import random
+import sys
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+from benchmarks import yoga_dosha_reference as reference
+from modules import yoga_dosha_analyzer as compiled
+from modules.chart_index import PLANETS, SIGN_LORD, SIGNS, ChartIndex
+from modules.yoga_dosha_cache import YogaDoshaCache
+
+
+def random_chart(rng):
+    lagna = rng.randrange(12)
+    pool = rng.sample(range(12), rng.choice((1, 2, 3, 4, 12, 12)))
+    present = [p for p in PLANETS if rng.random() > 0.05]
+    rng.shuffle(present)
+    signs = {p: rng.choice(pool) for p in present}
+    unknown_signs = rng.random() < 0.1
+    houses_known = rng.random() > 0.1
+
+    def planet(name, with_house):
+        sign = None if unknown_signs and rng.random() < 0.2 else SIGNS[signs[name]]
+        house = (signs[name] - lagna) % 12 + 1 if with_house else None
+        return SimpleNamespace(celestial_body=name, sign=sign, house=house)
+
+    houses = []
+    if houses_known:
+        for h in range(1, 13):
+            sign = (lagna + h - 1) % 12
+            occupants = [planet(p, False) for p in present if signs[p] == sign]
+            lord = PLANETS[SIGN_LORD[sign]] if rng.random() > 0.03 else None
+            houses.append(SimpleNamespace(number=h, sign=SIGNS[sign], lord=lord, occupants=occupants))
+    planets = [planet(p, True) for p in present]
+    return SimpleNamespace(d1_chart=SimpleNamespace(houses=houses, planets=planets))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(int(sys.argv[2]) if len(sys.argv) > 2 else 1)
+    indexes = [ChartIndex(random_chart(rng)) for _ in range(n)]
+
+    mismatches = 0
+    key_mismatches = 0
+    keyed = 0
+    seen = Counter()
+    for index in indexes:
+        key = compiled.chart_configuration(index)
+        if key is not None:
+            keyed += 1
+            bits, rebuilt = compiled._ChartBits(index), compiled._ChartBits(compiled.configuration_chart(key))
+            if (compiled._yoga_mask(bits), compiled._dosha_mask(bits)) != (
+                    compiled._yoga_mask(rebuilt), compiled._dosha_mask(rebuilt)):
+                key_mismatches += 1
+                if key_mismatches <= 3:
+                    print(f"KEY MISMATCH {key:#012x}", index.planet_house, index.planet_sign)
+        expected = (reference.detect_yogas(index), reference.detect_doshas(index))
+        got = (compiled.detect_yogas(index), compiled.detect_doshas(index))
+        if got != expected:
+            mismatches += 1
+            if mismatches <= 3:
+                print("MISMATCH", index.planet_house, index.planet_sign, index.house_lord)
+                print("  expected", [e["name"] + ": " + e["description"] for e in expected[0] + expected[1]])
+                print("  got     ", [e["name"] + ": " + e["description"] for e in got[0] + got[1]])
+        seen.update(e["name"] for e in expected[0] + expected[1])
+    all_names = {rule[0] for rule in compiled._YOGA_RULES + compiled._DOSHA_RULES}
+    print(f"{n} charts, {mismatches} mismatches; {len(seen)}/{len(all_names)} yogas and doshas occurred")
+    never = sorted(all_names - set(seen))
+    if never:
+        print("  never occurred:", ", ".join(never))
+    print(f"  {keyed} charts with a configuration key, {key_mismatches} rebuilt from it differ")
+
+    for label, detect_yogas, detect_doshas, max_entries in (
+        ("reference", reference.detect_yogas, reference.detect_doshas, 0),
+        ("compiled", compiled.detect_yogas, compiled.detect_doshas, 0),
+        # Every chart seen before (as far as it has a configuration key)
+        ("cached", compiled.detect_yogas, compiled.detect_doshas, n),
+    ):
+        for index in indexes:
+            index._maps = index._bits = None
+        compiled.yoga_dosha_cache = YogaDoshaCache(max_entries)
+        if max_entries:
+            for index in indexes:
+                detect_yogas(index)
+        start = time.perf_counter()
+        for index in indexes:
+            detect_yogas(index)
+            detect_doshas(index)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<10} {elapsed / n * 1e6:7.1f} us per chart (yogas + doshas)")
+    print(f"  cache: {compiled.yoga_dosha_cache.stats()}")
+    sys.exit(1 if mismatches or key_mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
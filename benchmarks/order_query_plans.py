@@ -0,0 +1,122 @@
+"""
+Query-plan regression check for the admin order listing (modules.db.list_orders).
+Builds a synthetic orders table in a temporary database, asserts via EXPLAIN QUERY PLAN that
+every filter combination is answered from an index (no full table scan, no temp B-tree sort),
+and times the listing against the old date(created_at) predicates.
+
+    python -m benchmarks.order_query_plans [rows]      (exit status 1 if a plan regresses)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(), "orders_bench.db")
+
+from modules import db  # noqa: E402  (DATABASE_PATH must be set first)
+
+STATUSES = ("pending", "completed")
+
+FILTER_CASES = [
+    {},
+    {"status": "pending"},
+    {"from_date": "2025-03-01"},
+    {"to_date": "2025-03-31"},
+    {"from_date": "2025-03-01", "to_date": "2025-03-31"},
+    {"status": "completed", "from_date": "2025-03-01", "to_date": "2025-03-31"},
+    {"status": "pending", "to_date": "2025-01-15"},
+    {"cursor": "WyIyMDI1LTA2LTAxIDEyOjAwOjAwIiwxMjM0NV0"},
+    {"status": "completed", "cursor": "WyIyMDI1LTA2LTAxIDEyOjAwOjAwIiwxMjM0NV0"},
+]
+
+# Pre-change query: date() around the column defeats the created_at indexes
+LEGACY_QUERY = (
+    "SELECT id, razorpay_order_id, service_title, customer_name, customer_email, amount_paise, status, created_at "
+    "FROM orders WHERE 1=1{where} ORDER BY created_at DESC LIMIT 50 OFFSET 0"
+)
+
+
+def populate(n_rows):
+    start = datetime(2024, 1, 1)
+    span = int(timedelta(days=730).total_seconds())
+    rng = random.Random(42)
+    rows = []
+    for i in range(n_rows):
+        created = start + timedelta(seconds=rng.randrange(span))
+        rows.append((
+            f"order_{i}", f"pay_{i}", "career", "Career Report", 139900,
+            "Customer", "c@example.com", "9999999999",
+            rng.choice(STATUSES), created.strftime("%Y-%m-%d %H:%M:%S"),
+        ))
+    with db.get_db() as conn:
+        conn.executemany("""
+            INSERT INTO orders (razorpay_order_id, razorpay_payment_id, service_id, service_title, amount_paise,
+                                customer_name, customer_email, customer_mobile, status, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        conn.execute("ANALYZE")
+
+
+def plan_problems(filters, plan):
+    problems = []
+    for detail in plan:
+        if "TEMP B-TREE" in detail:
+            problems.append(detail)
+        elif detail.startswith("SCAN") and "orders" in detail:
+            # An ordered walk of the created_at index is fine when there is nothing to filter on
+            if filters or "USING INDEX" not in detail and "USING COVERING INDEX" not in detail:
+                problems.append(detail)
+    return problems
+
+
+def time_call(fn, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def legacy_list(conn, filters):
+    where, params = "", []
+    if filters.get("status"):
+        where += " AND status = ?"
+        params.append(filters["status"])
+    if filters.get("from_date"):
+        where += " AND date(created_at) >= date(?)"
+        params.append(filters["from_date"])
+    if filters.get("to_date"):
+        where += " AND date(created_at) <= date(?)"
+        params.append(filters["to_date"])
+    return conn.execute(LEGACY_QUERY.format(where=where), params).fetchall()
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    db.init_db()
+    populate(n_rows)
+    print(f"{n_rows} orders in {db.DATABASE_PATH}\n")
+
+    failed = False
+    for filters in FILTER_CASES:
+        plan = db.list_orders_query_plan(**filters)
+        problems = plan_problems(filters, plan)
+        failed = failed or bool(problems)
+        if "cursor" in filters:
+            print(f"{'FAIL' if problems else 'ok  '} {filters}\n     plan: {' | '.join(plan)}")
+            continue
+        with db.get_db() as conn:
+            assert [dict(r) for r in legacy_list(conn, filters)] == db.list_orders(**filters)
+            legacy_ms = time_call(lambda: legacy_list(conn, filters))
+            q, params = db._list_orders_query(**filters)
+            new_ms = time_call(lambda: conn.execute(q, params).fetchall())
+        print(f"{'FAIL' if problems else 'ok  '} {filters or 'no filters'}")
+        print(f"     plan: {' | '.join(plan)}")
+        print(f"     {legacy_ms:8.2f} ms date(created_at)  ->  {new_ms:6.2f} ms range predicates")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Cold-start profile of the API worker. Each case runs in a fresh interpreter with bytecode
+cached (as in a deployed worker) and reports:
+  - api_server's phase timings (imports, db_init, admin_seed, background_threads,
+    knowledge_base) from modules/startup.py, and the first request after startup,
+  - eager vs deferred DB init (STARTUP_DEFER_DB_INIT=1), on a new and an existing database,
+  - an -X importtime breakdown: the slowest direct imports of api_server and self time
+    per top-level package,
+  - what importing jyotishganit costs (paid by the first chart request, not at startup).
+
+    python -m benchmarks.profile_startup [runs]
+"""
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+WORKER = """
+import time
+t = time.perf_counter()
+import api_server
+import_ms = (time.perf_counter() - t) * 1000
+t = time.perf_counter()
+api_server.app.test_client().get("/api/health")
+first_request_ms = (time.perf_counter() - t) * 1000
+print(f"STARTUP_RESULT {import_ms} {first_request_ms}")
+"""
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def run_worker(env, importtime=False):
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", WORKER]
+    proc = subprocess.run(args, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    line = next(l for l in proc.stdout.splitlines() if l.startswith("STARTUP_RESULT"))
+    import_ms, first_request_ms = map(float, line.split()[1:])
+    phases = {}
+    for err_line in proc.stderr.splitlines():
+        if err_line.startswith("{"):
+            phases = json.loads(err_line)["phases_ms"]
+    return import_ms, first_request_ms, phases, proc.stderr
+
+
+def importtime_breakdown(stderr, top=12):
+    direct, children = [], []
+    by_package = defaultdict(int)
+    for line in stderr.splitlines():
+        m = _IMPORTTIME.match(line)
+        if not m:
+            continue
+        self_us, cumulative_us, indent, name = int(m[1]), int(m[2]), len(m[3]), m[4]
+        by_package[name.split(".")[0]] += self_us
+        # A module's imports are listed just before it, one level deeper
+        if indent == 3:
+            children.append((cumulative_us, name))
+        elif indent == 1:
+            if name == "api_server":
+                direct = children
+            children = []
+    print("\n  slowest direct imports of api_server (cumulative ms)")
+    for us, name in sorted(direct, reverse=True)[:top]:
+        print(f"    {name:<32} {us / 1000:7.1f}")
+    print("\n  self time by top-level package (ms)")
+    for name, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"    {name:<32} {us / 1000:7.1f}")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    with tempfile.TemporaryDirectory() as tmp:
+        base_env = {**os.environ, "PYTHONPYCACHEPREFIX": os.path.join(tmp, "pyc"), "STARTUP_PROFILE": "1"}
+        # Deployed workers import from .pyc files; compiling the sources would dominate the timing
+        base_env.pop("PYTHONDONTWRITEBYTECODE", None)
+        db_path = os.path.join(tmp, "orders.db")
+        run_worker({**base_env, "DATABASE_PATH": db_path})  # warm bytecode + compiled tables
+
+        print(f"median of {runs} fresh workers (ms)")
+        for label, defer, fresh_db in (
+            ("eager, existing database", "0", False),
+            ("deferred, existing database", "1", False),
+            ("eager, new database", "0", True),
+            ("deferred, new database", "1", True),
+        ):
+            results = []
+            for i in range(runs):
+                path = os.path.join(tmp, f"new{i}{defer}.db") if fresh_db else db_path
+                results.append(run_worker({**base_env, "DATABASE_PATH": path, "STARTUP_DEFER_DB_INIT": defer}))
+            phase_names = list(results[0][2])
+            phases = {n: statistics.median(r[2].get(n, 0.0) for r in results) for n in phase_names}
+            print(f"\n  {label}")
+            print(f"    import api_server   {statistics.median(r[0] for r in results):7.1f}")
+            print(f"    first request       {statistics.median(r[1] for r in results):7.1f}")
+            print("    " + ", ".join(f"{n} {ms:.1f}" for n, ms in phases.items()))
+
+        _, _, _, stderr = run_worker({**base_env, "DATABASE_PATH": db_path}, importtime=True)
+        importtime_breakdown(stderr)
+
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import jyotishganit"],
+            cwd=ROOT, env=base_env, capture_output=True, text=True,
+        )
+        last = [m for m in map(_IMPORTTIME.match, proc.stderr.splitlines()) if m and m[4] == "jyotishganit"]
+        if last:
+            print(f"\n  import jyotishganit (deferred to the first chart request): {int(last[-1][2]) / 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Stress check: checkout verify and the payment.captured webhook delivered at the same moment
+for every order, through the Flask app, against a scratch database. Each order must be
+recorded exactly once, with one report job and one queued admin email, no pending payload
+left behind and no request failing.
+
+    python -m benchmarks.stress_order_finalize [orders] [threads]   (threads >= 2)
+
+Uses DATABASE_PATH (default /tmp/stress_order_finalize.db, recreated on each run).
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+KEY_SECRET = "stress_key_secret"
+WEBHOOK_SECRET = "stress_webhook_secret"
+
+os.environ.setdefault("DATABASE_PATH", "/tmp/stress_order_finalize.db")
+os.environ.update(
+    RAZORPAY_KEY_ID="rzp_test_stress",
+    RAZORPAY_KEY_SECRET=KEY_SECRET,
+    RAZORPAY_WEBHOOK_SECRET=WEBHOOK_SECRET,
+    # Queue admin emails but never send them
+    ADMIN_EMAIL="admin@localhost",
+    SMTP_HOST="localhost",
+    SMTP_FROM="orders@localhost",
+    EMAIL_OUTBOX_SENDER="0",
+    REPORT_WORKERS="0",
+    JANITOR_INTERVAL_SECONDS="0",
+)
+for suffix in ("", "-wal", "-shm"):
+    try:
+        os.remove(os.environ["DATABASE_PATH"] + suffix)
+    except FileNotFoundError:
+        pass
+
+import api_server  # noqa: E402
+from modules import db  # noqa: E402
+
+ORDER_PAYLOAD = {
+    "service_id": "career",
+    "plan_id": None,
+    "customer": {"name": "Stress Test", "email": "stress@example.com", "mobile": "9999999999"},
+    "birth_details": {
+        "date_of_birth": "1990-01-15", "time_of_birth": "10:30", "place_of_birth": "Delhi",
+        "latitude": 28.6139, "longitude": 77.209, "gender": "female",
+    },
+}
+
+_clients = threading.local()
+
+
+def client():
+    if not hasattr(_clients, "c"):
+        _clients.c = api_server.app.test_client()
+    return _clients.c
+
+
+def verify(ro_id, rp_id, barrier):
+    sig = hmac.new(KEY_SECRET.encode(), f"{ro_id}|{rp_id}".encode(), hashlib.sha256).hexdigest()
+    barrier.wait()
+    return client().post("/api/orders/verify", json={
+        "razorpay_order_id": ro_id, "razorpay_payment_id": rp_id,
+        "razorpay_signature": sig, "order_payload": ORDER_PAYLOAD,
+    })
+
+
+def webhook(ro_id, rp_id, barrier):
+    body = json.dumps({
+        "event": "payment.captured",
+        "payload": {"payment": {"entity": {"id": rp_id, "order_id": ro_id}}},
+    }).encode()
+    sig = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    barrier.wait()
+    return client().post("/api/webhooks/razorpay", data=body, headers={
+        "Content-Type": "application/json", "X-Razorpay-Signature": sig,
+    })
+
+
+def main():
+    n_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    if threads < 2:
+        # Each verify waits on a barrier for its webhook, so both must be able to run at once
+        sys.exit("threads must be at least 2")
+    ids = [(f"order_stress{i:06d}", f"pay_stress{i:06d}") for i in range(n_orders)]
+    for ro_id, _ in ids:
+        db.save_pending_payload(ro_id, ORDER_PAYLOAD)
+
+    failures = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = []
+        for ro_id, rp_id in ids:
+            # Both deliveries for an order are released together
+            barrier = threading.Barrier(2)
+            # Alternate which one is queued first
+            pair = [(verify, ro_id, rp_id, barrier), (webhook, ro_id, rp_id, barrier)]
+            if len(futures) % 4:
+                pair.reverse()
+            futures += [pool.submit(*call) for call in pair]
+        for future in futures:
+            resp = future.result()
+            if resp.status_code != 200:
+                failures.append((resp.status_code, resp.get_json()))
+    elapsed = time.perf_counter() - start
+
+    with db.get_db() as conn:
+        counts = {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("orders", "report_jobs", "email_outbox", "pending_order_payloads")
+        }
+        stats_orders = conn.execute("SELECT COALESCE(SUM(orders), 0) FROM order_stats_daily").fetchone()[0]
+    print(f"{n_orders} orders x (verify + webhook), {threads} threads: {elapsed:.1f}s "
+          f"({2 * n_orders / elapsed:.0f} requests/s)")
+    print(f"  failed requests: {len(failures)} {failures[:3] if failures else ''}")
+    print(f"  {counts}, rollup orders: {stats_orders}")
+    expected = {"orders": n_orders, "report_jobs": n_orders, "email_outbox": n_orders, "pending_order_payloads": 0}
+    ok = not failures and counts == expected and stats_orders == n_orders
+    print("OK" if ok else "MISMATCH")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
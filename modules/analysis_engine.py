@@ -3,39 +3,12 @@ Analysis Engine Module
 Core engine for generating insights, strengths, concerns, and predictions
 """
 
-import json
-import os
 import random
 
-# Load data files
-_data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+from .knowledge_base import load_table
 
-# Load meanings databases
-_meanings_files = {
-    "d2": os.path.join(_data_dir, 'planet_house_meanings_d2.json'),
-    "d9": os.path.join(_data_dir, 'planet_house_meanings_d9.json'),
-    "d10": os.path.join(_data_dir, 'planet_house_meanings_d10.json'),
-    "d16": os.path.join(_data_dir, 'planet_house_meanings_d16.json')
-}
-
-_meanings_cache = {}
-for chart_type, file_path in _meanings_files.items():
-    with open(file_path, 'r', encoding='utf-8') as f:
-        _meanings_cache[chart_type] = json.load(f)
-
-# Load other data
-_strength_keywords_file = os.path.join(_data_dir, 'strength_keywords.json')
-_concern_templates_file = os.path.join(_data_dir, 'concern_templates.json')
-_prediction_templates_file = os.path.join(_data_dir, 'prediction_templates.json')
-
-with open(_strength_keywords_file, 'r', encoding='utf-8') as f:
-    STRENGTH_KEYWORDS = json.load(f)
-
-with open(_concern_templates_file, 'r', encoding='utf-8') as f:
-    CONCERN_TEMPLATES = json.load(f)
-
-with open(_prediction_templates_file, 'r', encoding='utf-8') as f:
-    PREDICTION_TEMPLATES = json.load(f)
+# Divisional charts with a data/planet_house_meanings_<chart>.json meanings database
+_MEANINGS_CHARTS = ("d2", "d9", "d10", "d16")
 
 
 def analyze_chart_section(chart, chart_type: str, section_name: str):
@@ -64,8 +37,10 @@ def analyze_chart_section(chart, chart_type: str, section_name: str):
     else:
         return None
     
-    # Get meanings database (use lowercase for our cache)
-    meanings_db = _meanings_cache.get(chart_key_lower, {})
+    # Get meanings database (loaded on first use)
+    if chart_key_lower not in _MEANINGS_CHARTS:
+        return None
+    meanings_db = load_table(f"planet_house_meanings_{chart_key_lower}")
     if not meanings_db or "meanings" not in meanings_db:
         return None
     
@@ -199,7 +174,7 @@ def _identify_strengths(placements: list, chart_type: str, section_name: str) ->
     top_planets = sorted(planet_counts.items(), key=lambda x: x[1], reverse=True)[:3]
     
     # Map planets to strengths
-    planet_keywords = STRENGTH_KEYWORDS.get("planets", {})
+    planet_keywords = load_table("strength_keywords").get("planets", {})
     
     for planet, _ in top_planets:
         if planet in planet_keywords:
@@ -268,8 +243,9 @@ def _generate_concern_description(placement: dict, chart_type: str, section_name
         return negative_text
     
     # Fallback to template
-    templates = CONCERN_TEMPLATES.get("templates", {}).get(section_name, {})
-    planet_templates = CONCERN_TEMPLATES.get("planet_specific", {})
+    concern_templates = load_table("concern_templates")
+    templates = concern_templates.get("templates", {}).get(section_name, {})
+    planet_templates = concern_templates.get("planet_specific", {})
     
     if planet in planet_templates:
         pattern = planet_templates[planet].get("pattern", "")
@@ -285,7 +261,7 @@ def _generate_prediction(placements: list, chart_type: str, section_name: str) -
     avg_score = sum(p["score"] for p in placements) / len(placements) if placements else 5.0
     
     # Get templates
-    templates = PREDICTION_TEMPLATES.get(section_name, {})
+    templates = load_table("prediction_templates").get(section_name, {})
     
     if avg_score >= 7.0:
         predictions = templates.get("positive", [])
@@ -0,0 +1,135 @@
+"""
+Batch Reports Module
+Birth-chart reports for many people in one job (POST /api/birth-chart/batch).
+Records with identical birth inputs share one chart; distinct charts are computed in parallel
+on a process pool, and each record's report is yielded as soon as its chart is ready.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from modules.chart_cache import chart_cache, normalize_birth_inputs, compute_birth_chart
+from modules.report_sections import REQUIRED_FIELDS, build_birth_chart_report, parse_datetime
+
+# Largest batch accepted in one request
+BATCH_MAX_RECORDS = int(os.environ.get("BATCH_MAX_RECORDS", "500"))
+# Chart worker processes (default: one per core)
+BATCH_WORKERS = int(os.environ.get("BATCH_WORKERS", "0")) or os.cpu_count() or 1
+
+_pool_lock = threading.Lock()
+_pool = None
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Workers start from a clean forkserver process instead of a fork of this
+                # multi-threaded server (locks held by other threads, open database connections)
+                _pool = ProcessPoolExecutor(
+                    max_workers=BATCH_WORKERS, mp_context=multiprocessing.get_context("forkserver")
+                )
+    return _pool
+
+
+def _record_error(index, message):
+    return {"index": index, "success": False, "error": message}
+
+
+def _chart_inputs(record):
+    """Normalized (birth_date, lat, lon, tz) for a record; raises ValueError if invalid."""
+    if not isinstance(record, dict):
+        raise ValueError("Record must be a JSON object")
+    for field in REQUIRED_FIELDS:
+        if field not in record:
+            raise ValueError(f"Missing required field: {field}")
+    try:
+        latitude = float(record['latitude'])
+        longitude = float(record['longitude'])
+        timezone_offset = float(record['timezone'])
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid coordinates: {e}")
+    birth_date = parse_datetime(record['date'], record['time'])
+    return normalize_birth_inputs(
+        birth_date, latitude, longitude, timezone_offset, chart_cache.coord_precision
+    )
+
+
+def _report(index, record, chart, requested):
+    try:
+        result = build_birth_chart_report(record, requested, chart=chart)
+    except ValueError as e:
+        return _record_error(index, str(e))
+    except Exception as e:
+        return _record_error(index, f"Report error: {e}")
+    return {"index": index, **result}
+
+
+def generate_birth_chart_batch(records, requested=None):
+    """
+    Return an iterator of one report dict per record, {"index": i, **birth-chart payload} or
+    {"index": i, "success": False, "error": ...}, in completion order (not input order).
+
+    requested: tuple from report_sections.parse_sections (None = full report).
+    Charts already in the shared chart cache are used directly; the rest are computed once per
+    distinct input on the process pool and added to the cache.
+    Raises ValueError (before any work starts) if records is not a list or is too large.
+    """
+    if not isinstance(records, list):
+        raise ValueError("records must be a list")
+    if len(records) > BATCH_MAX_RECORDS:
+        raise ValueError(f"Batch too large: {len(records)} records (max {BATCH_MAX_RECORDS})")
+    return _run_batch(records, requested)
+
+
+def _run_batch(records, requested):
+    # chart key -> [record index, ...]
+    groups = {}
+    inputs = {}
+    invalid = []
+    for index, record in enumerate(records):
+        try:
+            chart_inputs = _chart_inputs(record)
+        except ValueError as e:
+            invalid.append(_record_error(index, str(e)))
+            continue
+        key = chart_cache.key(*chart_inputs)
+        groups.setdefault(key, []).append(index)
+        inputs[key] = chart_inputs
+
+    # Start the ephemeris work first, then report cache hits while it runs
+    cached = {}
+    running = {}
+    for key in groups:
+        chart = chart_cache.get(key)
+        if chart is not None:
+            cached[key] = chart
+        else:
+            running[_get_pool().submit(compute_birth_chart, *inputs[key])] = key
+
+    try:
+        yield from invalid
+        for key, chart in cached.items():
+            for index in groups[key]:
+                yield _report(index, records[index], chart, requested)
+
+        while running:
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                try:
+                    chart = future.result()
+                except Exception as e:
+                    for index in groups[key]:
+                        yield _record_error(index, f"Chart calculation failed: {e}")
+                    continue
+                chart_cache.put(key, chart)
+                for index in groups[key]:
+                    yield _report(index, records[index], chart, requested)
+    finally:
+        # Client went away: drop charts that have not started yet
+        for future in running:
+            future.cancel()
@@ -0,0 +1,204 @@
+"""
+Bit Chart Module
+Bitmask view of the D1 chart for house / sign / planet questions ("which planets are in the 2nd
+and 12th from the Moon", "are all seven grahas in Kendras", "is the 7th flanked by malefics"),
+each answered with a few integer operations instead of walking lists of (planet, sign) tuples.
+
+Planets are 9-bit masks (bit p for chart_index.PLANETS[p]); houses are 12-bit masks (bit h - 1
+for house h) and signs 12-bit masks (bit s for chart_index.SIGNS[s]). Occupancy is kept as a
+12 x 9 bitboard (bit 9 * (house - 1) + planet), which "counted from house X" views rotate.
+"""
+
+from .chart_index import PLANET_INDEX, PLANETS, SIGN_INDEX
+
+# House groups (1-based house numbers)
+KENDRA = {1, 4, 7, 10}
+TRIKONA = {1, 5, 9}
+KENDRA_TRIKONA = KENDRA | TRIKONA
+UPACHAYA = {3, 6, 10, 11}
+PANAPHARA = {2, 5, 8, 11}
+APOKLIMA = {3, 6, 9, 12}
+DUSTHANA = {6, 8, 12}
+
+ALL_HOUSES = 0xFFF
+ALL_PLANETS = 0x1FF
+ALL_SIGNS = 0xFFF
+_BOARD_BITS = 108
+_FULL_BOARD = (1 << _BOARD_BITS) - 1
+# planets * _REPEAT copies a 9-bit planet mask into all twelve houses of a board
+_REPEAT = sum(1 << 9 * h for h in range(12))
+
+
+def planet_mask(names) -> int:
+    return sum(1 << PLANET_INDEX[p] for p in set(names))
+
+
+def sign_mask(names) -> int:
+    return sum(1 << SIGN_INDEX[s] for s in set(names))
+
+
+def house_mask(houses) -> int:
+    return sum(1 << (h - 1) for h in set(houses))
+
+
+KENDRA_MASK = house_mask(KENDRA)
+TRIKONA_MASK = house_mask(TRIKONA)
+KENDRA_TRIKONA_MASK = house_mask(KENDRA_TRIKONA)
+UPACHAYA_MASK = house_mask(UPACHAYA)
+PANAPHARA_MASK = house_mask(PANAPHARA)
+APOKLIMA_MASK = house_mask(APOKLIMA)
+DUSTHANA_MASK = house_mask(DUSTHANA)
+
+# Sign dignities of the seven grahas (none for the nodes)
+EXALTATION_SIGN = {
+    "Sun": "Aries", "Moon": "Taurus", "Mars": "Capricorn", "Mercury": "Virgo",
+    "Jupiter": "Cancer", "Venus": "Pisces", "Saturn": "Libra"
+}
+OWN_SIGNS = {
+    "Sun": ["Leo"], "Moon": ["Cancer"], "Mars": ["Aries", "Scorpio"],
+    "Mercury": ["Gemini", "Virgo"], "Jupiter": ["Sagittarius", "Pisces"],
+    "Venus": ["Taurus", "Libra"], "Saturn": ["Capricorn", "Aquarius"]
+}
+DEBILITATION_SIGN = {
+    "Sun": "Libra", "Moon": "Scorpio", "Mars": "Cancer", "Mercury": "Pisces",
+    "Jupiter": "Capricorn", "Venus": "Virgo", "Saturn": "Aries"
+}
+# Per planet index, 12-bit sign masks for BitChart.in_signs
+DIGNITY_MASKS = tuple(
+    sign_mask(OWN_SIGNS.get(p, []) + ([EXALTATION_SIGN[p]] if p in EXALTATION_SIGN else [])) for p in PLANETS
+)
+DEBILITATION_MASKS = tuple(sign_mask([DEBILITATION_SIGN[p]] if p in DEBILITATION_SIGN else []) for p in PLANETS)
+
+# Board rows of a 12-bit house mask, looked up 6 houses at a time
+_ROWS_LOW = tuple(sum(ALL_PLANETS << 9 * h for h in range(6) if m >> h & 1) for m in range(64))
+_ROWS_HIGH = tuple(rows << 54 for rows in _ROWS_LOW)
+
+
+def cells(houses: int, planets: int = ALL_PLANETS) -> int:
+    """Board mask of planets (9-bit) in houses (12-bit)."""
+    return (_ROWS_LOW[houses & 63] | _ROWS_HIGH[houses >> 6]) & (planets * _REPEAT)
+
+
+def rotate(board: int, base: int) -> int:
+    """board counted from house base (base becomes the 1st house)."""
+    shift = 9 * ((base - 1) % 12)
+    return ((board >> shift) | (board << (_BOARD_BITS - shift))) & _FULL_BOARD
+
+
+def fold(board: int) -> int:
+    """9-bit mask of the planets present anywhere on board."""
+    board |= board >> 54
+    board &= (1 << 54) - 1
+    board |= board >> 27
+    board &= (1 << 27) - 1
+    return (board | board >> 9 | board >> 18) & ALL_PLANETS
+
+
+def counted_from(mask: int, base: int) -> int:
+    """
+    Houses (12-bit) that are mask's houses counted from house base, e.g.
+    counted_from(KENDRA_MASK, moon_house) are the Kendras from the Moon. Works the same for signs,
+    with base = sign index + 1.
+    """
+    shift = (base - 1) % 12
+    return ((mask << shift) | (mask >> (12 - shift))) & ALL_HOUSES
+
+
+class BitChart:
+    """
+    Bitmask view of a ChartIndex (get one with ChartIndex.bits()).
+
+    board              occupancy bitboard from each house's occupants
+    positions          occupancy bitboard from each planet's own house (planet_house); the two
+                       differ only for charts whose house lists disagree with their planets
+    placed             planets in the chart
+    planet_house_bit   per planet, the bit of its house (0 if absent)
+    planet_sign_bit    per planet, the bit of its sign (0 if absent or unknown)
+    sign_planets       per sign index, the planets in that sign
+    occupied           houses with at least one occupant
+    """
+
+    __slots__ = (
+        "board", "positions", "placed", "planet_house_bit", "planet_sign_bit", "sign_planets", "occupied",
+    )
+
+    def __init__(self, index):
+        board = 0
+        occupied = 0
+        for h in range(1, 13):
+            for p in index.house_occupants[h]:
+                board |= 1 << (9 * (h - 1) + p)
+                occupied |= 1 << (h - 1)
+        positions = placed = 0
+        planet_house_bit = [0] * 9
+        planet_sign_bit = [0] * 9
+        sign_planets = [0] * 12
+        for p, h in enumerate(index.planet_house):
+            if not h:
+                continue
+            placed |= 1 << p
+            positions |= 1 << (9 * (h - 1) + p)
+            planet_house_bit[p] = 1 << (h - 1)
+            s = index.planet_sign[p]
+            if s >= 0:
+                planet_sign_bit[p] = 1 << s
+                sign_planets[s] |= 1 << p
+        self.board = board
+        self.positions = positions
+        self.placed = placed
+        self.planet_house_bit = planet_house_bit
+        self.planet_sign_bit = planet_sign_bit
+        self.sign_planets = sign_planets
+        self.occupied = occupied
+
+    def relative(self, base: int) -> int:
+        """The board counted from house base."""
+        return rotate(self.board, base)
+
+    def planets_in(self, houses: int, base: int = 1) -> int:
+        """Planets occupying houses (12-bit) counted from house base."""
+        board = self.board if base == 1 else rotate(self.board, base)
+        return fold(board & cells(houses))
+
+    def placed_in(self, houses: int) -> int:
+        """Planets whose own house (planet_house) is one of houses (12-bit)."""
+        return fold(self.positions & cells(houses))
+
+    def house_planets(self, house: int, base: int = 1) -> int:
+        """Planets occupying one house counted from base."""
+        return (self.board >> 9 * ((base + house - 2) % 12)) & ALL_PLANETS
+
+    def houses_of(self, planets: int) -> int:
+        """Houses (12-bit) holding any of planets, by their own house."""
+        houses = 0
+        for p in range(9):
+            if planets >> p & 1:
+                houses |= self.planet_house_bit[p]
+        return houses
+
+    def signs_of(self, planets: int) -> int:
+        """Signs (12-bit) holding any of planets with a known sign."""
+        signs = 0
+        for p in range(9):
+            if planets >> p & 1:
+                signs |= self.planet_sign_bit[p]
+        return signs
+
+    def planets_in_signs(self, signs: int) -> int:
+        """Planets in any of signs (12-bit)."""
+        planets = 0
+        for s in range(12):
+            if signs >> s & 1:
+                planets |= self.sign_planets[s]
+        return planets
+
+    def in_signs(self, signs_by_planet) -> int:
+        """
+        Planets whose sign is in their own entry of signs_by_planet (nine 12-bit sign masks, by
+        planet index), e.g. own or exaltation signs.
+        """
+        planets = 0
+        for p in range(9):
+            if self.planet_sign_bit[p] & signs_by_planet[p]:
+                planets |= 1 << p
+        return planets
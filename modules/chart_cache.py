@@ -0,0 +1,167 @@
+"""
+Chart Cache Module
+Caches jyotishganit birth charts keyed on normalized birth inputs, so repeat requests
+for the same date, time, place and timezone skip the ephemeris computation.
+Entries are evicted LRU-first, when older than the TTL, or past max_entries. The byte budget
+is a secondary bound that charges every entry the size of the first chart stored, since
+charts for different birth inputs have the same structure and nearly the same size.
+"""
+
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+CHART_CACHE_MAX_ENTRIES = int(os.environ.get("CHART_CACHE_MAX_ENTRIES", "512"))
+CHART_CACHE_TTL_SECONDS = float(os.environ.get("CHART_CACHE_TTL_SECONDS", "3600"))
+CHART_CACHE_MAX_BYTES = int(os.environ.get("CHART_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+# 4 decimal places of latitude/longitude is ~11 m, far below any change in the chart
+CHART_CACHE_COORD_PRECISION = int(os.environ.get("CHART_CACHE_COORD_PRECISION", "4"))
+
+# Per-entry size used when a chart cannot be pickled to measure it
+_FALLBACK_ENTRY_BYTES = 256 * 1024
+
+
+def compute_birth_chart(birth_date, latitude, longitude, timezone_offset):
+    """Uncached jyotishganit chart (module-level so it can run in a worker process)."""
+    from jyotishganit import calculate_birth_chart
+    # Name is not part of the key, so the cached chart is computed without one
+    return calculate_birth_chart(
+        birth_date=birth_date,
+        latitude=latitude,
+        longitude=longitude,
+        timezone_offset=timezone_offset,
+        name=None
+    )
+
+
+def _estimate_size(chart) -> int:
+    try:
+        return len(pickle.dumps(chart, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return _FALLBACK_ENTRY_BYTES
+
+
+def normalize_birth_inputs(birth_date, latitude, longitude, timezone_offset,
+                           precision=CHART_CACHE_COORD_PRECISION):
+    """Return (birth_date, latitude, longitude, timezone_offset) rounded to cache precision."""
+    return (
+        birth_date.replace(second=0, microsecond=0),
+        round(float(latitude), precision),
+        round(float(longitude), precision),
+        round(float(timezone_offset), 2),
+    )
+
+
+def chart_cache_key(birth_date, latitude, longitude, timezone_offset,
+                    precision=CHART_CACHE_COORD_PRECISION):
+    """Cache key for a birth chart: minute-resolution local time, rounded coordinates, timezone."""
+    bd, lat, lon, tz = normalize_birth_inputs(birth_date, latitude, longitude, timezone_offset, precision)
+    return (bd.strftime("%Y-%m-%dT%H:%M"), lat, lon, tz)
+
+
+class ChartCache:
+    """Thread-safe LRU + TTL cache of VedicBirthChart objects with a byte-size limit."""
+
+    def __init__(self, max_entries=CHART_CACHE_MAX_ENTRIES, ttl_seconds=CHART_CACHE_TTL_SECONDS,
+                 max_bytes=CHART_CACHE_MAX_BYTES, coord_precision=CHART_CACHE_COORD_PRECISION,
+                 compute_fn=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.coord_precision = coord_precision
+        self._compute_fn = compute_fn or compute_birth_chart
+        self._lock = threading.Lock()
+        # key -> (chart, size_bytes, stored_at)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # Measured once on the first put and charged to every entry after that
+        self._entry_bytes = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def key(self, birth_date, latitude, longitude, timezone_offset):
+        return chart_cache_key(birth_date, latitude, longitude, timezone_offset, self.coord_precision)
+
+    def get(self, key):
+        """Return cached chart for key or None (counts a hit or a miss)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds > 0 and now - entry[2] > self.ttl_seconds:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, chart):
+        size = self._entry_bytes
+        if size is None:
+            size = self._entry_bytes = _estimate_size(chart)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (chart, size, time.monotonic())
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def get_or_compute(self, birth_date, latitude, longitude, timezone_offset):
+        """Return the chart for these birth inputs, computing and caching it on a miss."""
+        bd, lat, lon, tz = normalize_birth_inputs(
+            birth_date, latitude, longitude, timezone_offset, self.coord_precision
+        )
+        key = (bd.strftime("%Y-%m-%dT%H:%M"), lat, lon, tz)
+        chart = self.get(key)
+        if chart is None:
+            chart = self._compute_fn(bd, lat, lon, tz)
+            self.put(key, chart)
+        return chart
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "entry_bytes": self._entry_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "coord_precision": self.coord_precision,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+# Process-wide cache shared by /api/birth-chart, /api/panchanga and /api/dasha
+chart_cache = ChartCache()
+
+
+def cached_birth_chart(birth_date, latitude, longitude, timezone_offset):
+    """Birth chart for the given inputs from the shared cache (computed on first request)."""
+    return chart_cache.get_or_compute(birth_date, latitude, longitude, timezone_offset)
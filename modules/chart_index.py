@@ -0,0 +1,253 @@
+"""
+Chart Index Module
+Compact, single-pass index of the D1 (Rasi) chart shared by all analyzers.
+Built once per request from a jyotishganit VedicBirthChart; planets, signs, nakshatras and
+houses are stored as small integers so analyzers do not re-walk chart.d1_chart with getattr probing.
+"""
+
+PLANETS = ("Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu")
+PLANET_INDEX = {p: i for i, p in enumerate(PLANETS)}
+
+SIGNS = (
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+)
+SIGN_INDEX = {s: i for i, s in enumerate(SIGNS)}
+
+# jyotishganit spellings
+NAKSHATRAS = (
+    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra",
+    "Punarvasu", "Pushya", "Ashlesha", "Magha", "Purva Phalguni",
+    "Uttara Phalguni", "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha",
+    "Jyeshtha", "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana",
+    "Dhanishta", "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
+)
+NAKSHATRA_INDEX = {n: i for i, n in enumerate(NAKSHATRAS)}
+
+# sign index -> planet index of its lord
+SIGN_LORD = (2, 5, 3, 1, 0, 3, 5, 2, 4, 6, 6, 4)
+
+_NONE = -1
+
+
+def _planet_name(obj):
+    return getattr(obj, "celestial_body", None) or getattr(obj, "planet", None)
+
+
+class ChartIndex:
+    """
+    Integer-array view of a D1 chart.
+
+    planet_house[p]     house 1-12 of planet index p (0 if absent)
+    planet_sign[p]      sign index 0-11 (-1 if unknown)
+    planet_nakshatra[p] nakshatra index 0-26 (-1 if unknown)
+    planet_pada[p]      pada 1-4 (0 if unknown)
+    house_sign[h]       sign index of house h (index 0 unused)
+    house_lord[h]       planet index of the lord of house h (-1 if unknown)
+    house_occupants[h]  tuple of planet indices in house h, in chart order
+    lagna_sign          sign index of the 1st house (-1 if unknown)
+
+    The wrapped chart's d1_chart, divisional_charts, dashas and panchanga are exposed
+    unchanged, so a ChartIndex can be passed wherever a VedicBirthChart is accepted.
+    """
+
+    __slots__ = (
+        "chart", "planet_house", "planet_sign", "planet_nakshatra", "planet_pada",
+        "house_sign", "house_lord", "house_occupants", "lagna_sign",
+        "_order", "_raw_nakshatra", "_maps", "_bits",
+    )
+
+    def __init__(self, chart):
+        self.chart = chart
+        self.planet_house = [0] * 9
+        self.planet_sign = [_NONE] * 9
+        self.planet_nakshatra = [_NONE] * 9
+        self.planet_pada = [0] * 9
+        self.house_sign = [_NONE] * 13
+        self.house_lord = [_NONE] * 13
+        self.house_occupants = [()] * 13
+        self.lagna_sign = _NONE
+        # Planet indices in the order they appear in the chart (for dict views)
+        self._order = []
+        # Nakshatra names outside NAKSHATRAS (alternate spellings), by planet index
+        self._raw_nakshatra = {}
+        self._maps = None
+        self._bits = None
+        self._build(getattr(chart, "d1_chart", None) if chart is not None else None)
+
+    @classmethod
+    def of(cls, chart):
+        """Return chart itself if it is already a ChartIndex, else index it."""
+        if isinstance(chart, cls):
+            return chart
+        return cls(chart)
+
+    # ----- Delegation to the wrapped chart -----
+
+    @property
+    def d1_chart(self):
+        return getattr(self.chart, "d1_chart", None)
+
+    @property
+    def divisional_charts(self):
+        return getattr(self.chart, "divisional_charts", None)
+
+    @property
+    def dashas(self):
+        return getattr(self.chart, "dashas")
+
+    @property
+    def panchanga(self):
+        return getattr(self.chart, "panchanga", None)
+
+    # ----- Build -----
+
+    def _set_planet_details(self, pi, obj):
+        naks = (getattr(obj, "nakshatra", None) or getattr(obj, "nakshatra_name", None) or "").strip()
+        if naks and self.planet_nakshatra[pi] == _NONE and pi not in self._raw_nakshatra:
+            ni = NAKSHATRA_INDEX.get(naks)
+            if ni is None:
+                self._raw_nakshatra[pi] = naks
+            else:
+                self.planet_nakshatra[pi] = ni
+        if not self.planet_pada[pi]:
+            pada = getattr(obj, "pada", None) or getattr(obj, "nakshatra_pada", None)
+            if pada is not None:
+                try:
+                    self.planet_pada[pi] = int(pada)
+                except (TypeError, ValueError):
+                    pass
+
+    def _build(self, d1):
+        if not d1:
+            return
+        houses = getattr(d1, "houses", None)
+        if houses:
+            for house in houses:
+                hnum = getattr(house, "number", None)
+                if hnum is None:
+                    continue
+                hnum = int(hnum)
+                sign = SIGN_INDEX.get(getattr(house, "sign", None) or "", _NONE)
+                self.house_sign[hnum] = sign
+                lord = PLANET_INDEX.get(getattr(house, "lord", None) or "", _NONE)
+                if lord != _NONE:
+                    self.house_lord[hnum] = lord
+                occupants = []
+                for occ in getattr(house, "occupants", []):
+                    pi = PLANET_INDEX.get(_planet_name(occ))
+                    if pi is None:
+                        continue
+                    occupants.append(pi)
+                    self.planet_house[pi] = hnum
+                    self.planet_sign[pi] = SIGN_INDEX.get(getattr(occ, "sign", None) or "", sign)
+                    self._set_planet_details(pi, occ)
+                    if pi not in self._order:
+                        self._order.append(pi)
+                self.house_occupants[hnum] = tuple(occupants)
+            self.lagna_sign = self.house_sign[1]
+
+        # Planets list: nakshatra/pada, and positions when the chart has no houses
+        from_planets = not houses
+        for p in getattr(d1, "planets", []):
+            pi = PLANET_INDEX.get(_planet_name(p))
+            if pi is None:
+                continue
+            if from_planets or not self.planet_house[pi]:
+                h = getattr(p, "house", None)
+                if h is not None:
+                    h = int(h)
+                    self.planet_house[pi] = h
+                    self.planet_sign[pi] = SIGN_INDEX.get(getattr(p, "sign", None) or "", _NONE)
+                    if pi not in self.house_occupants[h]:
+                        self.house_occupants[h] = self.house_occupants[h] + (pi,)
+                    if pi not in self._order:
+                        self._order.append(pi)
+            elif self.planet_sign[pi] == _NONE:
+                self.planet_sign[pi] = SIGN_INDEX.get(getattr(p, "sign", None) or "", _NONE)
+            self._set_planet_details(pi, p)
+
+        if from_planets:
+            # Infer house lords (and Lagna) from the first occupant's sign
+            for h in range(1, 13):
+                occ = self.house_occupants[h]
+                if occ and self.house_lord[h] == _NONE and self.planet_sign[occ[0]] != _NONE:
+                    self.house_lord[h] = SIGN_LORD[self.planet_sign[occ[0]]]
+            if self.house_occupants[1]:
+                self.lagna_sign = self.planet_sign[self.house_occupants[1][0]]
+
+    # ----- Name-based accessors -----
+
+    def has(self, planet: str) -> bool:
+        pi = PLANET_INDEX.get(planet)
+        return pi is not None and self.planet_house[pi] != 0
+
+    def house_of(self, planet: str):
+        """House 1-12 of planet, or None."""
+        pi = PLANET_INDEX.get(planet)
+        if pi is None or not self.planet_house[pi]:
+            return None
+        return self.planet_house[pi]
+
+    def sign_of(self, planet: str):
+        """Sign name of planet, or None."""
+        pi = PLANET_INDEX.get(planet)
+        if pi is None or self.planet_sign[pi] == _NONE:
+            return None
+        return SIGNS[self.planet_sign[pi]]
+
+    def nakshatra_of(self, planet: str):
+        """Nakshatra name of planet as given by the chart, or None."""
+        pi = PLANET_INDEX.get(planet)
+        if pi is None:
+            return None
+        if self.planet_nakshatra[pi] != _NONE:
+            return NAKSHATRAS[self.planet_nakshatra[pi]]
+        return self._raw_nakshatra.get(pi)
+
+    def pada_of(self, planet: str):
+        """Nakshatra pada 1-4 of planet, or None."""
+        pi = PLANET_INDEX.get(planet)
+        if pi is None or not self.planet_pada[pi]:
+            return None
+        return self.planet_pada[pi]
+
+    def lagna_sign_name(self):
+        return SIGNS[self.lagna_sign] if self.lagna_sign != _NONE else None
+
+    def house_lord_name(self, house: int):
+        lord = self.house_lord[house]
+        return PLANETS[lord] if lord != _NONE else None
+
+    # ----- Dict views (built once, for analyzers written against name maps) -----
+
+    def maps(self):
+        """
+        Returns (planet_to_house, house_to_planets, house_lords):
+          planet_to_house: planet -> (house, sign)
+          house_to_planets: house -> [(planet, sign), ...]
+          house_lords: house -> lord planet
+        Houses present in the chart map to a (possibly empty) list. Do not mutate the results.
+        """
+        if self._maps is None:
+            planet_to_house = {}
+            for pi in self._order:
+                s = self.planet_sign[pi]
+                planet_to_house[PLANETS[pi]] = (self.planet_house[pi], SIGNS[s] if s != _NONE else "")
+            house_to_planets = {}
+            house_lords = {}
+            for h in range(1, 13):
+                occ = self.house_occupants[h]
+                if occ or self.house_sign[h] != _NONE or self.house_lord[h] != _NONE:
+                    house_to_planets[h] = [(PLANETS[pi], planet_to_house[PLANETS[pi]][1]) for pi in occ]
+                if self.house_lord[h] != _NONE:
+                    house_lords[h] = PLANETS[self.house_lord[h]]
+            self._maps = (planet_to_house, house_to_planets, house_lords)
+        return self._maps
+
+    def bits(self):
+        """BitChart (bitmask view) of this chart, built once."""
+        if self._bits is None:
+            from .bit_chart import BitChart  # bit_chart imports this module
+            self._bits = BitChart(self)
+        return self._bits
@@ -0,0 +1,67 @@
+"""
+Chart Serializer Module
+Builds only the parts of the jyotishganit chart JSON that API responses use (D1, D2, D9, D10,
+D16 and Panchanga), straight from the chart objects. get_birth_chart_json(chart) serializes the
+whole chart, including all 15 divisional charts, Ashtakavarga and the full Dasha tree, and most
+of that is thrown away.
+"""
+
+# Divisional charts included in /api/birth-chart responses
+RESPONSE_DIVISIONAL_CHARTS = ("d2", "d9", "d10", "d16")
+
+
+def _to_dict(obj):
+    if obj is None:
+        return {}
+    if isinstance(obj, dict):
+        return obj
+    return obj.to_dict()
+
+
+def _serializable(obj):
+    """_to_dict can serialize obj without the full-chart fallback."""
+    return obj is None or isinstance(obj, dict) or callable(getattr(obj, "to_dict", None))
+
+
+def _full_chart_json(chart):
+    """Fallback: whole chart via get_birth_chart_json (dict or JSON string, depending on version)."""
+    import json
+    from jyotishganit import get_birth_chart_json
+    json_data = get_birth_chart_json(getattr(chart, "chart", chart))
+    if isinstance(json_data, str):
+        return json.loads(json_data)
+    return json_data
+
+
+def _divisional_chart(divisional_charts, key):
+    # Library uses lowercase keys; accept uppercase as analysis_engine does
+    if key in divisional_charts:
+        return divisional_charts[key]
+    return divisional_charts.get(key.upper())
+
+
+def extract_charts_data(chart, divisional=RESPONSE_DIVISIONAL_CHARTS) -> dict:
+    """
+    Return {"d1": {...}, "d2": {...}, ...} in the same shape as
+    get_birth_chart_json(chart)["d1Chart"] / ["divisionalCharts"][key].
+    chart may be a VedicBirthChart or ChartIndex.
+    """
+    if hasattr(chart, "d1_chart") and hasattr(chart, "divisional_charts"):
+        divisional_charts = chart.divisional_charts or {}
+        parts = {"d1": chart.d1_chart}
+        for key in divisional:
+            parts[key] = _divisional_chart(divisional_charts, key)
+        if all(_serializable(part) for part in parts.values()):
+            return {key: _to_dict(part) for key, part in parts.items()}
+    full = _full_chart_json(chart)
+    charts_data = {"d1": full.get('d1Chart', {})}
+    for key in divisional:
+        charts_data[key] = full.get('divisionalCharts', {}).get(key, {})
+    return charts_data
+
+
+def extract_panchanga(chart) -> dict:
+    """Panchanga as serialized by the library ({"@type", tithi, nakshatra, yoga, karana, vaara})."""
+    if hasattr(chart, "panchanga") and _serializable(chart.panchanga):
+        return _to_dict(chart.panchanga)
+    return _full_chart_json(chart).get('panchanga', {})
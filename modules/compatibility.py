@@ -3,15 +3,14 @@ Compatibility Calculator Module
 Calculates all compatibility/matching parameters from birth chart
 """
 
-import json
-import os
+from .chart_index import ChartIndex
+from .knowledge_base import load_table
 
-# Load compatibility data
-_data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
-_compatibility_file = os.path.join(_data_dir, 'compatibility_data.json')
 
-with open(_compatibility_file, 'r', encoding='utf-8') as f:
-    COMPAT_DATA = json.load(f)
+def _compat_data():
+    """data/compatibility_data.json (loaded on first use)."""
+    return load_table("compatibility_data")
+
 
 # Alternate nakshatra spellings from library -> our JSON key (for lookups)
 NAKSHATRA_NORMALIZE = {
@@ -41,51 +40,18 @@ NAKSHATRA_NORMALIZE = {
 
 
 def _normalize_nakshatra(name: str) -> str:
-    """Return nakshatra key for use in COMPAT_DATA lookups."""
+    """Return nakshatra key for use in compatibility data lookups."""
     if not name:
         return ""
     s = (name or "").strip()
     # Try known alternate spellings first
     out = NAKSHATRA_NORMALIZE.get(s, s)
     # Ensure title-case for lookup (e.g. "UTTARA BHADRAPADA" -> "Uttara Bhadrapada")
-    if out and out not in COMPAT_DATA.get("nakshatra_nadi", {}):
+    if out and out not in _compat_data().get("nakshatra_nadi", {}):
         out = " ".join(w.capitalize() for w in out.split())
     return out
 
 
-def _get_moon_house_from_chart(chart):
-    """Get Moon's D1 house number from chart (houses with occupants or planet.house)."""
-    d1 = getattr(chart, "d1_chart", None)
-    if not d1:
-        return None
-    # From planet object first
-    for p in getattr(d1, "planets", []):
-        if getattr(p, "celestial_body", None) == "Moon":
-            h = getattr(p, "house", None)
-            if h is not None:
-                return int(h)
-            break
-    # Build house map from houses with occupants
-    houses = getattr(d1, "houses", None)
-    if houses:
-        for house in houses:
-            hnum = getattr(house, "number", None)
-            if hnum is None:
-                continue
-            for occ in getattr(house, "occupants", []):
-                body = getattr(occ, "celestial_body", None) or getattr(occ, "planet", None)
-                if body == "Moon":
-                    return int(hnum)
-    # Fallback: planets with house
-    for p in getattr(d1, "planets", []):
-        if getattr(p, "celestial_body", None) == "Moon":
-            h = getattr(p, "house", None)
-            if h is not None:
-                return int(h)
-            break
-    return None
-
-
 def _moon_from_chart_result(chart_result: dict) -> dict:
     """
     Extract Moon's sign, nakshatra, house, pada from the serialized chart JSON.
@@ -137,11 +103,11 @@ def _moon_from_chart_result(chart_result: dict) -> dict:
 def calculate_compatibility_details(chart, name: str = "", chart_result: dict = None):
     """
     Calculate all compatibility/matching parameters from the birth chart.
-    Uses chart_result (JSON from get_birth_chart_json) when provided, so values
-    match the serialized chart. name is not used for name_alphabet (that comes from nakshatra pada).
+    Reads the Moon from the chart's ChartIndex; chart_result (JSON from get_birth_chart_json)
+    is only used when no chart is given. name is not used for name_alphabet (that comes from nakshatra pada).
     
     Args:
-        chart: VedicBirthChart object from jyotishganit
+        chart: VedicBirthChart object from jyotishganit, or its ChartIndex
         name: Person's name (unused for compatibility; kept for API signature)
         chart_result: Optional dict from get_birth_chart_json(chart) to read Moon from JSON
     
@@ -150,48 +116,20 @@ def calculate_compatibility_details(chart, name: str = "", chart_result: dict =
     """
     moon_sign = None
     moon_nakshatra_raw = None
-    moon_house = None
     moon_pada = None
 
-    # Prefer chart_result (serialized JSON) so we use the same data as the API response
-    if chart_result and isinstance(chart_result, dict):
+    # Prefer the chart index (same values as the serialized chart, without walking the JSON)
+    index = ChartIndex.of(chart) if chart is not None else None
+    if index is not None and index.has("Moon"):
+        moon_sign = index.sign_of("Moon")
+        moon_nakshatra_raw = index.nakshatra_of("Moon")
+        moon_pada = index.pada_of("Moon")
+    elif chart_result and isinstance(chart_result, dict):
         m = _moon_from_chart_result(chart_result)
         moon_sign = m.get("sign")
         moon_nakshatra_raw = m.get("nakshatra")
-        moon_house = m.get("house")
         moon_pada = m.get("pada")
 
-    # Fallback: read from chart object (support multiple attribute names)
-    if not moon_sign or not moon_nakshatra_raw:
-        moon = None
-        d1 = getattr(chart, "d1_chart", None) if chart else None
-        if d1:
-            for planet in getattr(d1, "planets", []):
-                cb = getattr(planet, "celestial_body", None) or getattr(planet, "planet", None) or getattr(planet, "name", None)
-                if cb and str(cb).strip().lower() == "moon":
-                    moon = planet
-                    break
-            else:
-                moon = None
-        else:
-            moon = None
-        if moon:
-            if not moon_sign:
-                moon_sign = (getattr(moon, "sign", None) or getattr(moon, "rashi", None) or "").strip()
-            if not moon_nakshatra_raw:
-                moon_nakshatra_raw = (getattr(moon, "nakshatra", None) or getattr(moon, "nakshatra_name", None) or "").strip()
-            if moon_house is None:
-                moon_house = getattr(moon, "house", None)
-                if moon_house is not None:
-                    moon_house = int(moon_house)
-            if moon_pada is None:
-                moon_pada = getattr(moon, "pada", None) or getattr(moon, "nakshatra_pada", None)
-                if moon_pada is not None:
-                    moon_pada = int(moon_pada)
-
-        if moon_house is None and chart:
-            moon_house = _get_moon_house_from_chart(chart)
-
     if not moon_sign and not moon_nakshatra_raw:
         raise ValueError("Moon position not found in chart or chart_result")
 
@@ -214,7 +152,7 @@ def calculate_compatibility_details(chart, name: str = "", chart_result: dict =
     varna = _get_varna_from_sign(moon_sign)
 
     # Paya: by Janma Nakshatra (Revati/Ashwini/Bharani=Gold; Kritika/Rohini/Mrigashira=Iron; Ardra..Anuradha=Silver; Jyeshtha..Uttara Bhadrapada=Copper)
-    paya_key = COMPAT_DATA["nakshatra_paya"].get(moon_nakshatra, "Unknown")
+    paya_key = _compat_data()["nakshatra_paya"].get(moon_nakshatra, "Unknown")
     paya_display = {"Dhana": "Gold", "Rajat": "Silver", "Tamra": "Copper", "Loh": "Iron"}.get(paya_key, paya_key)
     paya = paya_display
 
@@ -224,10 +162,10 @@ def calculate_compatibility_details(chart, name: str = "", chart_result: dict =
     compatibility = {
         "varna": varna,
         "vashya": _get_vashya_type(moon_sign),
-        "yoni": COMPAT_DATA["nakshatra_yoni"].get(moon_nakshatra, {}).get("yoni", "Unknown"),
-        "gan": COMPAT_DATA["nakshatra_gan"].get(moon_nakshatra, "Unknown"),
-        "nadi": COMPAT_DATA["nakshatra_nadi"].get(moon_nakshatra, "Unknown"),
-        "tatva": COMPAT_DATA["sign_tatva"].get(moon_sign, "Unknown"),
+        "yoni": _compat_data()["nakshatra_yoni"].get(moon_nakshatra, {}).get("yoni", "Unknown"),
+        "gan": _compat_data()["nakshatra_gan"].get(moon_nakshatra, "Unknown"),
+        "nadi": _compat_data()["nakshatra_nadi"].get(moon_nakshatra, "Unknown"),
+        "tatva": _compat_data()["sign_tatva"].get(moon_sign, "Unknown"),
         "paya": paya,
         "name_alphabet": name_alphabet,
         "sign": moon_sign,
@@ -267,7 +205,7 @@ def _get_paya_from_house(house: int) -> str:
 
 def _get_name_letters_for_nakshatra_pada(nakshatra: str, pada: int) -> str:
     """Favourable name letters (Swar) for the native's Janma Nakshatra Pada, with Roman and Hindi (Devanagari)."""
-    letters = COMPAT_DATA.get("nakshatra_pada_letters", {})
+    letters = _compat_data().get("nakshatra_pada_letters", {})
     padas = letters.get(nakshatra, [])
     if not padas or not (1 <= pada <= 4):
         return ""
@@ -1,10 +1,20 @@
 """
 SQLite database for orders and admin users.
-Schema: orders, admin_users, pending_order_payloads (for webhook).
+Schema: orders, admin_users, pending_order_payloads (for webhook),
+report_jobs + order_reports (precomputed birth-chart reports, see modules/report_worker.py),
+email_outbox (admin emails sent in the background, see modules/email_outbox.py),
+order_stats_daily (per day/status/service counts and revenue, kept current by triggers on orders).
+
+A database created before auto_vacuum=INCREMENTAL is converted once (a full VACUUM, holding
+an exclusive lock), e.g. in the deploy step, with:
+    python -m modules.db
 """
+import base64
 import os
+import queue
 import sqlite3
 import json
+import threading
 from contextlib import contextmanager
 
 # Default path: instance/orders.db (create instance if needed)
@@ -12,26 +22,225 @@ BASE_DIR = os.path.join(os.path.dirname(__file__), '..')
 INSTANCE_DIR = os.path.join(BASE_DIR, 'instance')
 DATABASE_PATH = os.environ.get('DATABASE_PATH') or os.path.join(INSTANCE_DIR, 'orders.db')
 
+# Connections kept open per process; checkout waits up to DB_POOL_TIMEOUT_SECONDS when all are busy
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '8'))
+DB_POOL_TIMEOUT_SECONDS = float(os.environ.get('DB_POOL_TIMEOUT_SECONDS', '10'))
+# How long a writer waits for another writer's lock before "database is locked"
+DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', '5000'))
+DB_CACHE_SIZE_KB = int(os.environ.get('DB_CACHE_SIZE_KB', '8192'))
+DB_MMAP_SIZE = int(os.environ.get('DB_MMAP_SIZE', str(64 * 1024 * 1024)))
+
 
 def get_db_path():
     return DATABASE_PATH
 
 
+def _connect(path):
+    # Autocommit mode: transactions are opened explicitly by get_db()/transaction()
+    conn = sqlite3.connect(
+        path,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        isolation_level=None,
+        check_same_thread=False,
+        cached_statements=256,
+    )
+    conn.row_factory = sqlite3.Row
+    # Must precede journal_mode, which writes the header of a new file; existing databases
+    # are converted by convert_to_incremental_vacuum()
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    # WAL: readers never block the writer and vice versa; NORMAL sync is safe with WAL
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections to one database file, shared by all threads."""
+
+    def __init__(self, path, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT_SECONDS):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return _connect(self.path)
+                except Exception:
+                    self._created -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"No database connection available within {self.timeout:g}s (pool size {self.size})"
+            )
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def discard(self, conn):
+        """Drop a broken connection so a fresh one is opened next time."""
+        try:
+            conn.close()
+        finally:
+            with self._lock:
+                self._created -= 1
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self.discard(conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+# Per-thread (connection, nesting depth, immediate, tables written) of the transaction in progress
+_local = threading.local()
+# Called with the set of written table names after each committed transaction that wrote
+_write_listeners = []
+
+
+def add_write_listener(fn):
+    """Register fn(tables: set) to run after commits that wrote tables marked with _mark_written."""
+    _write_listeners.append(fn)
+
+
+def _mark_written(table: str):
+    # Must be called inside get_db()/transaction(); listeners run once the outermost block commits
+    _local.written.add(table)
+
+
+def get_pool() -> ConnectionPool:
+    """Process-wide pool for DATABASE_PATH (a fresh one after fork or if the path changed)."""
+    global _pool
+    pool = _pool
+    if pool is None or pool.pid != os.getpid() or pool.path != DATABASE_PATH:
+        with _pool_lock:
+            pool = _pool
+            if pool is None or pool.pid != os.getpid() or pool.path != DATABASE_PATH:
+                if pool is not None and pool.pid == os.getpid():
+                    pool.close_all()
+                pool = _pool = ConnectionPool(DATABASE_PATH)
+    return pool
+
+
+@contextmanager
+def transaction(immediate=True):
+    """
+    Run the block in one transaction on a pooled connection: committed if the block
+    succeeds, rolled back if it raises. immediate=True takes the write lock up front
+    (use it for read-then-write flows, so the write cannot fail with "database is locked"
+    after the read). get_db()/transaction() calls nested in the block (same thread)
+    reuse this connection and run as a SAVEPOINT in its transaction, so existing helpers
+    compose; a nested block that raises is rolled back on its own:
+
+        with transaction():
+            if not order_exists_by_payment_id(pid):
+                save_order(record)
+                delete_pending_payload(oid)
+
+    A nested transaction(immediate=True) inside a deferred get_db() block raises
+    RuntimeError: the write lock can no longer be taken up front.
+    """
+    current = getattr(_local, "conn", None)
+    if current is not None:
+        if immediate and not _local.immediate:
+            raise RuntimeError("transaction(immediate=True) cannot be nested in a deferred get_db() block")
+        _local.depth += 1
+        savepoint = f"nested_{_local.depth}"
+        written = set(_local.written)
+        current.execute(f"SAVEPOINT {savepoint}")
+        try:
+            yield current
+        except BaseException:
+            current.execute(f"ROLLBACK TO {savepoint}")
+            current.execute(f"RELEASE {savepoint}")
+            _local.written = written
+            raise
+        else:
+            current.execute(f"RELEASE {savepoint}")
+        finally:
+            _local.depth -= 1
+        return
+
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    except Exception:
+        pool.discard(conn)
+        raise
+    _local.conn, _local.depth, _local.immediate, _local.written = conn, 0, immediate, set()
+    try:
+        yield conn
+        if conn.in_transaction:
+            conn.commit()
+        written = _local.written
+    except BaseException:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            _local.conn = None
+            pool.discard(conn)
+            raise
+        raise
+    finally:
+        if _local.conn is conn:
+            _local.conn = None
+            pool.release(conn)
+    if written:
+        for fn in _write_listeners:
+            fn(written)
+
+
 @contextmanager
 def get_db():
-    os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
+    """Pooled connection; the block runs as one (deferred) transaction, committed on success."""
+    with transaction(immediate=False) as conn:
+        yield conn
+
+
+@contextmanager
+def maintenance_connection():
+    """Pooled connection outside any transaction (autocommit), for PRAGMA/VACUUM statements."""
+    if getattr(_local, "conn", None) is not None:
+        raise RuntimeError("maintenance_connection() cannot be used inside a transaction")
+    pool = get_pool()
+    conn = pool.acquire()
     try:
         yield conn
-        conn.commit()
     finally:
-        conn.close()
+        pool.release(conn)
 
 
 def init_db():
     """Create tables if they do not exist. Call on app startup."""
     with get_db() as conn:
+        has_rollup = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'order_stats_daily'"
+        ).fetchone() is not None
         conn.executescript("""
             CREATE TABLE IF NOT EXISTS orders (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -55,7 +264,10 @@ def init_db():
                 created_at TEXT NOT NULL,
                 completed_at TEXT
             );
-            CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
+            -- (status, created_at) serves status filters, date ranges and ORDER BY created_at together;
+            -- it replaces the single-column status index
+            DROP INDEX IF EXISTS idx_orders_status;
+            CREATE INDEX IF NOT EXISTS idx_orders_status_created_at ON orders(status, created_at);
             CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders(created_at);
 
             CREATE TABLE IF NOT EXISTS admin_users (
@@ -69,7 +281,95 @@ def init_db():
                 payload TEXT NOT NULL,
                 created_at TEXT NOT NULL
             );
+            CREATE INDEX IF NOT EXISTS idx_pending_payloads_created_at ON pending_order_payloads(created_at);
+
+            CREATE TABLE IF NOT EXISTS report_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                order_id INTEGER UNIQUE NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 3,
+                last_error TEXT,
+                available_at TEXT NOT NULL,
+                locked_at TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_report_jobs_status ON report_jobs(status, available_at);
+
+            CREATE TABLE IF NOT EXISTS order_reports (
+                order_id INTEGER PRIMARY KEY,
+                report BLOB NOT NULL,
+                created_at TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS email_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                to_addr TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                body TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 5,
+                last_error TEXT,
+                available_at TEXT NOT NULL,
+                locked_at TEXT,
+                created_at TEXT NOT NULL,
+                sent_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_email_outbox_status ON email_outbox(status, available_at);
+
+            -- Daily rollup of orders; every change to orders is mirrored by the triggers below
+            CREATE TABLE IF NOT EXISTS order_stats_daily (
+                day TEXT NOT NULL,
+                status TEXT NOT NULL,
+                service_id TEXT NOT NULL,
+                orders INTEGER NOT NULL DEFAULT 0,
+                revenue_paise INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, status, service_id)
+            ) WITHOUT ROWID;
+
+            CREATE TRIGGER IF NOT EXISTS trg_orders_stats_insert AFTER INSERT ON orders
+            BEGIN
+                INSERT INTO order_stats_daily (day, status, service_id, orders, revenue_paise)
+                VALUES (date(NEW.created_at), NEW.status, NEW.service_id, 1, NEW.amount_paise)
+                ON CONFLICT (day, status, service_id) DO UPDATE SET
+                    orders = orders + 1, revenue_paise = revenue_paise + excluded.revenue_paise;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_orders_stats_delete AFTER DELETE ON orders
+            BEGIN
+                UPDATE order_stats_daily SET orders = orders - 1, revenue_paise = revenue_paise - OLD.amount_paise
+                WHERE day = date(OLD.created_at) AND status = OLD.status AND service_id = OLD.service_id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_orders_stats_update
+            AFTER UPDATE OF status, service_id, amount_paise, created_at ON orders
+            BEGIN
+                UPDATE order_stats_daily SET orders = orders - 1, revenue_paise = revenue_paise - OLD.amount_paise
+                WHERE day = date(OLD.created_at) AND status = OLD.status AND service_id = OLD.service_id;
+                INSERT INTO order_stats_daily (day, status, service_id, orders, revenue_paise)
+                VALUES (date(NEW.created_at), NEW.status, NEW.service_id, 1, NEW.amount_paise)
+                ON CONFLICT (day, status, service_id) DO UPDATE SET
+                    orders = orders + 1, revenue_paise = revenue_paise + excluded.revenue_paise;
+            END;
+        """)
+    if not has_rollup:
+        # First start with the rollup: fill it from existing orders
+        rebuild_order_stats()
+
+
+def rebuild_order_stats():
+    """Recompute order_stats_daily from the orders table."""
+    with transaction() as conn:
+        conn.execute("DELETE FROM order_stats_daily")
+        conn.execute("""
+            INSERT INTO order_stats_daily (day, status, service_id, orders, revenue_paise)
+            SELECT date(created_at), status, service_id, COUNT(*), COALESCE(SUM(amount_paise), 0)
+            FROM orders GROUP BY 1, 2, 3
         """)
+        _mark_written("orders")
 
 
 def save_pending_payload(razorpay_order_id: str, payload: dict):
@@ -94,6 +394,69 @@ def get_pending_payload(razorpay_order_id: str):
 def delete_pending_payload(razorpay_order_id: str):
     with get_db() as conn:
         conn.execute("DELETE FROM pending_order_payloads WHERE razorpay_order_id = ?", (razorpay_order_id,))
+        _mark_written("pending_order_payloads")
+
+
+def expire_pending_payloads(ttl_seconds: int, batch_size: int = 500) -> int:
+    """Delete pending payloads older than ttl_seconds, batch_size rows per transaction
+    (so the webhook never waits long for the write lock). Returns rows deleted."""
+    deleted = 0
+    while True:
+        with transaction() as conn:
+            n = conn.execute("""
+                DELETE FROM pending_order_payloads WHERE rowid IN (
+                    SELECT rowid FROM pending_order_payloads
+                    WHERE created_at < datetime('now', ?) LIMIT ?
+                )
+            """, (f"-{int(ttl_seconds)} seconds", batch_size)).rowcount
+        deleted += n
+        if n < batch_size:
+            return deleted
+
+
+def get_pending_payload_stats():
+    """Row count, payload bytes and age range of pending_order_payloads, plus file/freelist pages."""
+    with get_db() as conn:
+        row = conn.execute("""
+            SELECT COUNT(*) AS rows, COALESCE(SUM(length(payload)), 0) AS payload_bytes,
+                   MIN(created_at) AS oldest, MAX(created_at) AS newest
+            FROM pending_order_payloads
+        """).fetchone()
+        stats = dict(row)
+        for pragma in ("page_count", "page_size", "freelist_count", "auto_vacuum"):
+            stats[pragma] = conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+    stats["db_bytes"] = stats["page_count"] * stats["page_size"]
+    stats["free_bytes"] = stats["freelist_count"] * stats["page_size"]
+    return stats
+
+
+def convert_to_incremental_vacuum() -> bool:
+    """
+    Switch a database created before auto_vacuum=INCREMENTAL over with one full VACUUM
+    (exclusive lock for its duration; run it once, not from the workers). Returns True if
+    the database was converted, False if it already was.
+    """
+    with maintenance_connection() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+    return True
+
+
+def incremental_vacuum(max_pages: int = 1000) -> int:
+    """
+    Return up to max_pages free pages to the filesystem; returns pages freed. Does nothing
+    (returns 0) until the database uses auto_vacuum=INCREMENTAL (see convert_to_incremental_vacuum).
+    """
+    with maintenance_connection() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return 0
+        before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        # execute() steps this pragma once (one page); executescript() runs it to completion
+        conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)});")
+        after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return before - after
 
 
 def order_exists_by_payment_id(razorpay_payment_id: str) -> bool:
@@ -106,14 +469,20 @@ def order_exists_by_payment_id(razorpay_payment_id: str) -> bool:
 
 
 def save_order(record: dict):
+    """
+    Insert an order; returns its id, or None if an order with the same razorpay_order_id or
+    razorpay_payment_id already exists (a retried verify or webhook), without raising.
+    """
     with get_db() as conn:
-        conn.execute("""
+        row = conn.execute("""
             INSERT INTO orders (
                 razorpay_order_id, razorpay_payment_id, service_id, plan_id, service_title,
                 amount_paise, customer_name, customer_email, customer_mobile,
                 date_of_birth, time_of_birth, place_of_birth, latitude, longitude, gender,
                 questions, status, created_at
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending', datetime('now'))
+            ON CONFLICT DO NOTHING
+            RETURNING id
         """, (
             record["razorpay_order_id"],
             record.get("razorpay_payment_id"),
@@ -131,27 +500,85 @@ def save_order(record: dict):
             record.get("longitude"),
             record.get("gender"),
             record.get("questions"),
-        ))
-        return conn.execute("SELECT last_insert_rowid()").fetchone()[0]
-
-
-def list_orders(status=None, from_date=None, to_date=None, limit=50, offset=0):
-    with get_db() as conn:
-        q = "SELECT id, razorpay_order_id, service_title, customer_name, customer_email, amount_paise, status, created_at FROM orders WHERE 1=1"
-        params = []
-        if status:
-            q += " AND status = ?"
-            params.append(status)
-        if from_date:
-            q += " AND date(created_at) >= date(?)"
-            params.append(from_date)
-        if to_date:
-            q += " AND date(created_at) <= date(?)"
-            params.append(to_date)
-        q += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
-        rows = conn.execute(q, params).fetchall()
-    return [dict(r) for r in rows]
+        )).fetchone()
+        if row is None:
+            return None
+        _mark_written("orders")
+        return row[0]
+
+
+def encode_order_cursor(created_at: str, order_id: int) -> str:
+    """Opaque keyset cursor for the order after which the next page starts."""
+    raw = json.dumps([created_at, order_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_order_cursor(cursor: str):
+    """(created_at, id) from encode_order_cursor; raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, order_id = json.loads(raw)
+        if not isinstance(created_at, str) or not isinstance(order_id, int):
+            raise ValueError
+        return created_at, order_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _list_orders_query(status=None, from_date=None, to_date=None, limit=50, offset=0, after=None):
+    # Range predicates on the bare column (not date(created_at)) so the indexes can be used.
+    # created_at is 'YYYY-MM-DD HH:MM:SS'; to_date is inclusive, hence < the next day.
+    # after=(created_at, id) continues below that row (keyset pagination); both created_at
+    # indexes end in the rowid, so (created_at, id) order comes straight from the index.
+    q = "SELECT id, razorpay_order_id, service_title, customer_name, customer_email, amount_paise, status, created_at FROM orders WHERE 1=1"
+    params = []
+    if status:
+        q += " AND status = ?"
+        params.append(status)
+    if from_date:
+        q += " AND created_at >= date(?)"
+        params.append(from_date)
+    if to_date:
+        q += " AND created_at < date(?, '+1 day')"
+        params.append(to_date)
+    if after is not None:
+        q += " AND (created_at, id) < (?, ?)"
+        params.extend(after)
+        offset = 0
+    q += " ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+    params.extend([limit, offset])
+    return q, params
+
+
+def list_orders(status=None, from_date=None, to_date=None, limit=50, offset=0, cursor=None):
+    """Newest first. cursor (from list_orders_page) takes precedence over offset."""
+    return list_orders_page(status, from_date, to_date, limit, offset, cursor)[0]
+
+
+def list_orders_page(status=None, from_date=None, to_date=None, limit=50, offset=0, cursor=None):
+    """
+    Returns (rows, next_cursor). Pass next_cursor back as cursor for the following page;
+    it is None on the last page. Each cursor page is an index seek, independent of depth.
+    """
+    after = decode_order_cursor(cursor) if cursor else None
+    # One extra row tells whether there is a next page
+    q, params = _list_orders_query(status, from_date, to_date, limit + 1, offset, after)
+    with get_db() as conn:
+        rows = [dict(r) for r in conn.execute(q, params).fetchall()]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_order_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return rows, next_cursor
+
+
+def list_orders_query_plan(status=None, from_date=None, to_date=None, limit=50, offset=0, cursor=None):
+    """EXPLAIN QUERY PLAN detail lines for list_orders with these filters."""
+    after = decode_order_cursor(cursor) if cursor else None
+    q, params = _list_orders_query(status, from_date, to_date, limit, offset, after)
+    with get_db() as conn:
+        rows = conn.execute("EXPLAIN QUERY PLAN " + q, params).fetchall()
+    return [r["detail"] for r in rows]
 
 
 def get_order_by_id(order_id: int):
@@ -166,32 +593,253 @@ def update_order_status(order_id: int, status: str):
             "UPDATE orders SET status = ?, completed_at = datetime('now') WHERE id = ?",
             (status, order_id)
         )
+        _mark_written("orders")
         row = conn.execute("SELECT * FROM orders WHERE id = ?", (order_id,)).fetchone()
     return dict(row) if row else None
 
 
+def _orders_since(conn, modifier: str) -> int:
+    """Orders created since datetime('now', modifier): whole days from the rollup, plus the
+    partial first day counted exactly from orders (an index range over one day)."""
+    cutoff = conn.execute("SELECT datetime('now', ?)", (modifier,)).fetchone()[0]
+    full_days = conn.execute(
+        "SELECT COALESCE(SUM(orders), 0) FROM order_stats_daily WHERE day > date(?)", (cutoff,)
+    ).fetchone()[0]
+    first_day = conn.execute(
+        "SELECT COUNT(*) FROM orders WHERE created_at >= ? AND created_at < date(?, '+1 day')",
+        (cutoff, cutoff)
+    ).fetchone()[0]
+    return full_days + first_day
+
+
 def get_orders_stats():
     with get_db() as conn:
-        total = conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
-        pending = conn.execute("SELECT COUNT(*) FROM orders WHERE status = 'pending'").fetchone()[0]
-        completed = conn.execute("SELECT COUNT(*) FROM orders WHERE status = 'completed'").fetchone()[0]
-        revenue = conn.execute("SELECT COALESCE(SUM(amount_paise), 0) FROM orders").fetchone()[0]
-        last_7 = conn.execute(
-            "SELECT COUNT(*) FROM orders WHERE created_at >= datetime('now', '-7 days')"
-        ).fetchone()[0]
-        last_30 = conn.execute(
-            "SELECT COUNT(*) FROM orders WHERE created_at >= datetime('now', '-30 days')"
-        ).fetchone()[0]
+        totals = conn.execute("""
+            SELECT COALESCE(SUM(orders), 0) AS total,
+                   COALESCE(SUM(CASE WHEN status = 'pending' THEN orders END), 0) AS pending,
+                   COALESCE(SUM(CASE WHEN status = 'completed' THEN orders END), 0) AS completed,
+                   COALESCE(SUM(revenue_paise), 0) AS revenue
+            FROM order_stats_daily
+        """).fetchone()
+        last_7 = _orders_since(conn, '-7 days')
+        last_30 = _orders_since(conn, '-30 days')
     return {
-        "total_orders": total,
-        "pending_orders": pending,
-        "completed_orders": completed,
-        "total_revenue_paise": revenue,
+        "total_orders": totals["total"],
+        "pending_orders": totals["pending"],
+        "completed_orders": totals["completed"],
+        "total_revenue_paise": totals["revenue"],
         "orders_last_7_days": last_7,
         "orders_last_30_days": last_30,
     }
 
 
+def get_revenue_by_service(from_date=None, to_date=None):
+    """[{service_id, orders, revenue_paise}, ...] by revenue, optionally for a date range (inclusive)."""
+    q = "SELECT service_id, SUM(orders) AS orders, SUM(revenue_paise) AS revenue_paise FROM order_stats_daily WHERE 1=1"
+    params = []
+    if from_date:
+        q += " AND day >= date(?)"
+        params.append(from_date)
+    if to_date:
+        q += " AND day <= date(?)"
+        params.append(to_date)
+    q += " GROUP BY service_id HAVING SUM(orders) > 0 ORDER BY revenue_paise DESC, service_id"
+    with get_db() as conn:
+        rows = conn.execute(q, params).fetchall()
+    return [dict(r) for r in rows]
+
+
+# bucket -> SQL expression for the bucket's first day
+_STATS_BUCKETS = {
+    "day": "day",
+    "week": "date(day, '-6 days', 'weekday 1')",  # weeks start on Monday
+    "month": "strftime('%Y-%m-01', day)",
+}
+
+
+def get_orders_timeseries(bucket="day", from_date=None, to_date=None, status=None, service_id=None):
+    """[{bucket, orders, revenue_paise}, ...] oldest first; bucket is 'day', 'week' or 'month'."""
+    if bucket not in _STATS_BUCKETS:
+        raise ValueError(f"bucket must be one of: {', '.join(_STATS_BUCKETS)}")
+    q = f"SELECT {_STATS_BUCKETS[bucket]} AS bucket, SUM(orders) AS orders, SUM(revenue_paise) AS revenue_paise FROM order_stats_daily WHERE 1=1"
+    params = []
+    if from_date:
+        q += " AND day >= date(?)"
+        params.append(from_date)
+    if to_date:
+        q += " AND day <= date(?)"
+        params.append(to_date)
+    if status:
+        q += " AND status = ?"
+        params.append(status)
+    if service_id:
+        q += " AND service_id = ?"
+        params.append(service_id)
+    q += " GROUP BY 1 HAVING SUM(orders) > 0 ORDER BY 1"
+    with get_db() as conn:
+        rows = conn.execute(q, params).fetchall()
+    return [dict(r) for r in rows]
+
+
+def enqueue_report_job(order_id: int, payload: dict, max_attempts: int = 3):
+    """Queue report generation for an order (no-op if the order already has a job)."""
+    with get_db() as conn:
+        conn.execute("""
+            INSERT OR IGNORE INTO report_jobs (order_id, payload, status, max_attempts, available_at, created_at, updated_at)
+            VALUES (?, ?, 'queued', ?, datetime('now'), datetime('now'), datetime('now'))
+        """, (order_id, json.dumps(payload), max_attempts))
+        _mark_written("report_jobs")
+
+
+def claim_report_job(lock_timeout_seconds: int = 600):
+    """
+    Atomically take the oldest due job (queued, or running with a lock older than
+    lock_timeout_seconds, i.e. its worker died) and mark it running.
+    Returns dict(id, order_id, payload, attempts, max_attempts) or None.
+    """
+    with transaction() as conn:
+        row = conn.execute("""
+            SELECT id, order_id, payload, attempts, max_attempts FROM report_jobs
+            WHERE (status = 'queued' AND available_at <= datetime('now'))
+               OR (status = 'running' AND locked_at <= datetime('now', ?))
+            ORDER BY available_at, id LIMIT 1
+        """, (f"-{int(lock_timeout_seconds)} seconds",)).fetchone()
+        if not row:
+            return None
+        conn.execute(
+            "UPDATE report_jobs SET status = 'running', attempts = attempts + 1, locked_at = datetime('now'), updated_at = datetime('now') WHERE id = ?",
+            (row["id"],)
+        )
+    job = dict(row)
+    job["payload"] = json.loads(job["payload"])
+    job["attempts"] += 1
+    return job
+
+
+def complete_report_job(job_id: int, order_id: int, report: bytes):
+    """Store the (compressed) report for the order and mark the job done."""
+    with get_db() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO order_reports (order_id, report, created_at) VALUES (?, ?, datetime('now'))",
+            (order_id, sqlite3.Binary(report))
+        )
+        conn.execute(
+            "UPDATE report_jobs SET status = 'done', last_error = NULL, locked_at = NULL, updated_at = datetime('now') WHERE id = ?",
+            (job_id,)
+        )
+
+
+def fail_report_job(job_id: int, error: str, retry_in_seconds=None):
+    """Record a failed attempt: requeue after retry_in_seconds, or mark failed if None."""
+    with get_db() as conn:
+        if retry_in_seconds is None:
+            conn.execute(
+                "UPDATE report_jobs SET status = 'failed', last_error = ?, locked_at = NULL, updated_at = datetime('now') WHERE id = ?",
+                (error, job_id)
+            )
+        else:
+            conn.execute(
+                "UPDATE report_jobs SET status = 'queued', last_error = ?, locked_at = NULL, available_at = datetime('now', ?), updated_at = datetime('now') WHERE id = ?",
+                (error, f"+{int(retry_in_seconds)} seconds", job_id)
+            )
+
+
+def get_order_report(order_id: int):
+    """Returns dict(status, attempts, last_error, report) for the order's report job, or None.
+    report is the stored (compressed) bytes or None if not generated yet."""
+    with get_db() as conn:
+        row = conn.execute("""
+            SELECT j.status, j.attempts, j.last_error, r.report FROM report_jobs j
+            LEFT JOIN order_reports r ON r.order_id = j.order_id
+            WHERE j.order_id = ?
+        """, (order_id,)).fetchone()
+    return dict(row) if row else None
+
+
+def enqueue_email(to_addr: str, subject: str, body: str, max_attempts: int = 5):
+    with get_db() as conn:
+        cur = conn.execute("""
+            INSERT INTO email_outbox (to_addr, subject, body, status, max_attempts, available_at, created_at)
+            VALUES (?, ?, ?, 'pending', ?, datetime('now'), datetime('now'))
+        """, (to_addr, subject, body, max_attempts))
+        _mark_written("email_outbox")
+        return cur.lastrowid
+
+
+def claim_emails(limit: int = 20, lock_timeout_seconds: int = 300):
+    """
+    Atomically take up to limit due emails (pending, or sending with a stale lock) and mark
+    them sending. Returns list of dict(id, to_addr, subject, body, attempts, max_attempts).
+    """
+    with transaction() as conn:
+        rows = conn.execute("""
+            SELECT id, to_addr, subject, body, attempts, max_attempts FROM email_outbox
+            WHERE (status = 'pending' AND available_at <= datetime('now'))
+               OR (status = 'sending' AND locked_at <= datetime('now', ?))
+            ORDER BY available_at, id LIMIT ?
+        """, (f"-{int(lock_timeout_seconds)} seconds", limit)).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE email_outbox SET status = 'sending', attempts = attempts + 1, locked_at = datetime('now') WHERE id = ?",
+                [(r["id"],) for r in rows]
+            )
+    emails = [dict(r) for r in rows]
+    for e in emails:
+        e["attempts"] += 1
+    return emails
+
+
+def mark_email_sent(email_id: int):
+    with get_db() as conn:
+        conn.execute(
+            "UPDATE email_outbox SET status = 'sent', last_error = NULL, locked_at = NULL, sent_at = datetime('now') WHERE id = ?",
+            (email_id,)
+        )
+
+
+def mark_email_failed(email_id: int, error: str, retry_in_seconds=None):
+    """Record a failed attempt: back to pending after retry_in_seconds, or failed if None."""
+    with get_db() as conn:
+        if retry_in_seconds is None:
+            conn.execute(
+                "UPDATE email_outbox SET status = 'failed', last_error = ?, locked_at = NULL WHERE id = ?",
+                (error, email_id)
+            )
+        else:
+            conn.execute(
+                "UPDATE email_outbox SET status = 'pending', last_error = ?, locked_at = NULL, available_at = datetime('now', ?) WHERE id = ?",
+                (error, f"+{int(retry_in_seconds)} seconds", email_id)
+            )
+
+
+def release_emails(email_ids, retry_in_seconds: int):
+    """Hand claimed emails that were never tried back to pending (not counted as an attempt)."""
+    with get_db() as conn:
+        conn.executemany(
+            "UPDATE email_outbox SET status = 'pending', attempts = attempts - 1, locked_at = NULL, available_at = datetime('now', ?) WHERE id = ?",
+            [(f"+{int(retry_in_seconds)} seconds", email_id) for email_id in email_ids]
+        )
+
+
+def get_email_outbox_stats(recent_failures: int = 20):
+    with get_db() as conn:
+        counts = {r["status"]: r["n"] for r in conn.execute(
+            "SELECT status, COUNT(*) AS n FROM email_outbox GROUP BY status"
+        ).fetchall()}
+        failed = conn.execute("""
+            SELECT id, to_addr, subject, attempts, last_error, created_at FROM email_outbox
+            WHERE status = 'failed' OR (status = 'pending' AND attempts > 0)
+            ORDER BY id DESC LIMIT ?
+        """, (recent_failures,)).fetchall()
+    return {
+        "pending": counts.get("pending", 0),
+        "sending": counts.get("sending", 0),
+        "sent": counts.get("sent", 0),
+        "failed": counts.get("failed", 0),
+        "recent_failures": [dict(r) for r in failed],
+    }
+
+
 def get_admin_by_username(username: str):
     with get_db() as conn:
         row = conn.execute("SELECT id, username, password_hash FROM admin_users WHERE username = ?", (username,)).fetchone()
@@ -200,7 +848,7 @@ def get_admin_by_username(username: str):
 
 def seed_admin_if_empty(password_hash_fn):
     """Create one admin user if admin_users is empty. password_hash_fn(username, password) -> hash."""
-    with get_db() as conn:
+    with transaction() as conn:
         n = conn.execute("SELECT COUNT(*) FROM admin_users").fetchone()[0]
         if n > 0:
             return
@@ -208,3 +856,10 @@ def seed_admin_if_empty(password_hash_fn):
         password = os.environ.get("ADMIN_PASSWORD", "admin_change_me")
         h = password_hash_fn(password)
         conn.execute("INSERT INTO admin_users (username, password_hash) VALUES (?, ?)", (username, h))
+
+
+if __name__ == "__main__":
+    if convert_to_incremental_vacuum():
+        print(f"{DATABASE_PATH}: converted to auto_vacuum=INCREMENTAL")
+    else:
+        print(f"{DATABASE_PATH}: already auto_vacuum=INCREMENTAL")
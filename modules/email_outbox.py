@@ -0,0 +1,185 @@
+"""
+Email Outbox Module
+Admin emails are written to the SQLite email_outbox table inside the request and delivered by
+a background sender thread, so payment confirmation never waits on the mail server.
+The sender claims pending emails in batches, sends them over one persistent SMTP connection
+(kept open while mail keeps coming), retries failures with exponential backoff and records
+each email's delivery state (pending / sending / sent / failed).
+
+SMTP settings: SMTP_HOST, SMTP_PORT (587), SMTP_USER, SMTP_PASSWORD, SMTP_FROM (defaults to
+SMTP_USER), SMTP_STARTTLS (1). Login is skipped when SMTP_USER/SMTP_PASSWORD are empty, so a
+local stand-in works for testing, e.g.
+    python -m aiosmtpd -n -l localhost:1025      (or on Python <= 3.11:
+    python -m smtpd -n -c DebuggingServer localhost:1025)
+with SMTP_HOST=localhost SMTP_PORT=1025 SMTP_STARTTLS=0 SMTP_FROM=orders@localhost.
+"""
+
+import logging
+import os
+import smtplib
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from modules import db as orders_db
+
+# Set to 0 to disable the background sender in this process
+EMAIL_OUTBOX_SENDER = os.environ.get("EMAIL_OUTBOX_SENDER", "1") not in ("0", "false", "False", "")
+EMAIL_BATCH_SIZE = int(os.environ.get("EMAIL_BATCH_SIZE", "20"))
+EMAIL_MAX_ATTEMPTS = int(os.environ.get("EMAIL_MAX_ATTEMPTS", "5"))
+# Retry delay is EMAIL_RETRY_SECONDS * 2 ** (attempt - 1)
+EMAIL_RETRY_SECONDS = int(os.environ.get("EMAIL_RETRY_SECONDS", "60"))
+EMAIL_POLL_SECONDS = float(os.environ.get("EMAIL_POLL_SECONDS", "5"))
+# Close the SMTP connection after this long without mail
+EMAIL_SMTP_IDLE_SECONDS = float(os.environ.get("EMAIL_SMTP_IDLE_SECONDS", "60"))
+EMAIL_LOCK_TIMEOUT_SECONDS = int(os.environ.get("EMAIL_LOCK_TIMEOUT_SECONDS", "300"))
+SMTP_TIMEOUT_SECONDS = float(os.environ.get("SMTP_TIMEOUT_SECONDS", "30"))
+
+logger = logging.getLogger(__name__)
+
+_wakeup = threading.Event()
+_start_lock = threading.Lock()
+_sender_thread = None
+
+
+def smtp_settings():
+    """SMTP config from the environment, or None if mail is not configured."""
+    host = os.environ.get("SMTP_HOST", "")
+    user = os.environ.get("SMTP_USER", "")
+    from_addr = os.environ.get("SMTP_FROM", "") or user
+    if not host or not from_addr:
+        return None
+    return {
+        "host": host,
+        "port": int(os.environ.get("SMTP_PORT", "587")),
+        "user": user,
+        "password": os.environ.get("SMTP_PASSWORD", ""),
+        "from_addr": from_addr,
+        "starttls": os.environ.get("SMTP_STARTTLS", "1") not in ("0", "false", "False"),
+    }
+
+
+def queue_email(to_addr: str, subject: str, body: str):
+    """Add a plain-text email to the outbox (the sender wakes once it is committed). Returns the outbox id."""
+    return orders_db.enqueue_email(to_addr, subject, body, EMAIL_MAX_ATTEMPTS)
+
+
+def _wake_on_commit(tables):
+    # Write listener: an email is only claimable once the enclosing transaction has committed
+    if "email_outbox" in tables:
+        _wakeup.set()
+
+
+class SMTPSender:
+    """One SMTP connection reused for consecutive messages; reconnects when it drops."""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._conn = None
+        self.last_used = 0.0
+
+    def _connect(self):
+        s = self.settings
+        conn = smtplib.SMTP(s["host"], s["port"], timeout=SMTP_TIMEOUT_SECONDS)
+        try:
+            if s["starttls"]:
+                conn.starttls()
+            if s["user"] and s["password"]:
+                conn.login(s["user"], s["password"])
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def send(self, to_addr, subject, body):
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = self.settings["from_addr"]
+        msg["To"] = to_addr
+        msg.attach(MIMEText(body, "plain"))
+        if self._conn is None:
+            self._conn = self._connect()
+        try:
+            self._conn.sendmail(self.settings["from_addr"], [to_addr], msg.as_string())
+        except smtplib.SMTPServerDisconnected:
+            # Server closed the idle connection: reconnect once
+            self._conn = self._connect()
+            self._conn.sendmail(self.settings["from_addr"], [to_addr], msg.as_string())
+        self.last_used = time.monotonic()
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.quit()
+            except Exception:
+                self._conn.close()
+            self._conn = None
+
+
+def _is_permanent(error) -> bool:
+    # 5xx replies (bad recipient, rejected message) will not succeed on retry
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False  # credentials may be fixed without touching the outbox
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+def send_pending_emails(sender: SMTPSender, limit=None) -> int:
+    """Deliver due outbox emails through sender until none are left (or limit); returns emails tried."""
+    n = 0
+    while limit is None or n < limit:
+        batch = orders_db.claim_emails(EMAIL_BATCH_SIZE, EMAIL_LOCK_TIMEOUT_SECONDS)
+        if not batch:
+            break
+        for i, email in enumerate(batch):
+            try:
+                sender.send(email["to_addr"], email["subject"], email["body"])
+            except Exception as e:
+                retry_in = None
+                if not _is_permanent(e) and email["attempts"] < email["max_attempts"]:
+                    retry_in = EMAIL_RETRY_SECONDS * 2 ** (email["attempts"] - 1)
+                orders_db.mark_email_failed(email["id"], str(e), retry_in)
+                if isinstance(e, (OSError, smtplib.SMTPServerDisconnected)):
+                    # Connection-level failure: hand the rest of the batch back for later, without
+                    # counting an attempt for emails that were never tried
+                    sender.close()
+                    orders_db.release_emails([rest["id"] for rest in batch[i + 1:]], EMAIL_RETRY_SECONDS)
+                    return n + i + 1
+                continue
+            orders_db.mark_email_sent(email["id"])
+        n += len(batch)
+    return n
+
+
+def _sender_loop():
+    sender = None
+    while True:
+        try:
+            settings = smtp_settings()
+            if settings is not None:
+                if sender is None or sender.settings != settings:
+                    if sender is not None:
+                        sender.close()
+                    sender = SMTPSender(settings)
+                send_pending_emails(sender)
+                if time.monotonic() - sender.last_used > EMAIL_SMTP_IDLE_SECONDS:
+                    sender.close()
+        except Exception:
+            logger.exception("Email sender error")
+            if sender is not None:
+                sender.close()
+        _wakeup.wait(EMAIL_POLL_SECONDS)
+        _wakeup.clear()
+
+
+def start_email_sender():
+    """Start the background sender thread once per process (unless EMAIL_OUTBOX_SENDER=0)."""
+    global _sender_thread
+    with _start_lock:
+        if _sender_thread is not None or not EMAIL_OUTBOX_SENDER:
+            return
+        orders_db.add_write_listener(_wake_on_commit)
+        _sender_thread = threading.Thread(target=_sender_loop, name="email-outbox", daemon=True)
+        _sender_thread.start()
@@ -0,0 +1,84 @@
+"""
+Janitor Module
+Background housekeeping for the orders database: pending_order_payloads rows are written for
+every checkout but only removed on payment, so abandoned carts are expired after a TTL
+(in small batches) and the freed pages are returned with incremental VACUUM. A database not yet
+converted to auto_vacuum=INCREMENTAL (python -m modules.db) is not vacuumed.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from modules import db as orders_db
+
+# Abandoned checkouts older than this are deleted (Razorpay may still capture late, so keep days)
+PENDING_PAYLOAD_TTL_HOURS = float(os.environ.get("PENDING_PAYLOAD_TTL_HOURS", "168"))
+PENDING_PAYLOAD_DELETE_BATCH = int(os.environ.get("PENDING_PAYLOAD_DELETE_BATCH", "500"))
+# Seconds between janitor runs; 0 disables the background thread
+JANITOR_INTERVAL_SECONDS = float(os.environ.get("JANITOR_INTERVAL_SECONDS", "3600"))
+# Free pages returned to the filesystem per run
+JANITOR_VACUUM_PAGES = int(os.environ.get("JANITOR_VACUUM_PAGES", "2000"))
+
+logger = logging.getLogger(__name__)
+
+_start_lock = threading.Lock()
+_thread = None
+# Outcome of the most recent run, for the admin metrics endpoint
+last_run = {}
+
+
+def run_janitor() -> dict:
+    """Expire old pending payloads and vacuum incrementally; returns what was done."""
+    start = time.monotonic()
+    expired = orders_db.expire_pending_payloads(
+        int(PENDING_PAYLOAD_TTL_HOURS * 3600), PENDING_PAYLOAD_DELETE_BATCH
+    )
+    pages_freed = orders_db.incremental_vacuum(JANITOR_VACUUM_PAGES)
+    result = {
+        "expired_payloads": expired,
+        "pages_freed": pages_freed,
+        "duration_ms": round((time.monotonic() - start) * 1000, 1),
+        "finished_at": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+    }
+    last_run.clear()
+    last_run.update(result)
+    return result
+
+
+def get_janitor_metrics() -> dict:
+    stats = orders_db.get_pending_payload_stats()
+    metrics = {
+        "pending_payloads": stats,
+        "ttl_hours": PENDING_PAYLOAD_TTL_HOURS,
+        "interval_seconds": JANITOR_INTERVAL_SECONDS,
+        "last_run": dict(last_run) or None,
+    }
+    if stats["auto_vacuum"] != 2:
+        metrics["warning"] = (
+            "Database is not auto_vacuum=INCREMENTAL, so freed pages are never returned; "
+            "run python -m modules.db (the Procfile release step) once"
+        )
+    return metrics
+
+
+def _janitor_loop():
+    while True:
+        try:
+            result = run_janitor()
+            if result["expired_payloads"] or result["pages_freed"]:
+                logger.info("Janitor: %s", result)
+        except Exception:
+            logger.exception("Janitor run failed")
+        time.sleep(JANITOR_INTERVAL_SECONDS)
+
+
+def start_janitor():
+    """Start the background janitor thread once per process (unless JANITOR_INTERVAL_SECONDS is 0)."""
+    global _thread
+    with _start_lock:
+        if _thread is not None or JANITOR_INTERVAL_SECONDS <= 0:
+            return
+        _thread = threading.Thread(target=_janitor_loop, name="db-janitor", daemon=True)
+        _thread.start()
@@ -0,0 +1,139 @@
+"""
+Knowledge Base Module
+Lazy loader for the data/*.json knowledge bases (meanings, templates, compatibility tables).
+Each table is read on first use rather than at import, so workers start without parsing
+files they may never need. A table is compiled once to a marshal file (dict keys interned,
+so tables share their repeated key strings) in KNOWLEDGE_BASE_CACHE_DIR, and later
+processes load that instead of re-parsing the JSON; it is rebuilt whenever the JSON changes.
+
+Precompile every table (e.g. in the deploy step) with:
+    python -m modules.knowledge_base
+"""
+
+import importlib.util
+import json
+import marshal
+import os
+import sys
+import threading
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+KNOWLEDGE_BASE_CACHE_DIR = os.environ.get(
+    "KNOWLEDGE_BASE_CACHE_DIR", os.path.join(DATA_DIR, '.compiled')
+)
+# 0 = always parse the JSON (no compiled files read or written)
+KNOWLEDGE_BASE_COMPILED = os.environ.get("KNOWLEDGE_BASE_COMPILED", "1") not in ("0", "false", "False", "")
+
+# marshal's format may change between Python versions
+_CACHE_TAG = importlib.util.MAGIC_NUMBER.hex()
+
+_tables = {}
+_lock = threading.Lock()
+
+
+def json_path(name: str) -> str:
+    return os.path.join(DATA_DIR, f"{name}.json")
+
+
+def _compiled_path(name: str) -> str:
+    return os.path.join(KNOWLEDGE_BASE_CACHE_DIR, f"{name}.{_CACHE_TAG}.marshal")
+
+
+def _intern_keys(obj):
+    if isinstance(obj, dict):
+        return {sys.intern(k) if isinstance(k, str) else k: _intern_keys(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_intern_keys(v) for v in obj]
+    return obj
+
+
+def _source_stamp(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_compiled(name, stamp):
+    try:
+        with open(_compiled_path(name), 'rb') as f:
+            compiled_stamp, data = marshal.loads(f.read())
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+    return data if tuple(compiled_stamp) == stamp else None
+
+
+def _write_compiled(name, stamp, data):
+    path = _compiled_path(name)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(KNOWLEDGE_BASE_CACHE_DIR, exist_ok=True)
+        with open(tmp, 'wb') as f:
+            f.write(marshal.dumps((stamp, data)))
+        os.replace(tmp, path)
+    except OSError:
+        # Read-only deploy: keep working from the JSON
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _load(name):
+    path = json_path(name)
+    stamp = _source_stamp(path)
+    if KNOWLEDGE_BASE_COMPILED:
+        data = _read_compiled(name, stamp)
+        if data is not None:
+            return data
+    with open(path, 'r', encoding='utf-8') as f:
+        data = _intern_keys(json.load(f))
+    if KNOWLEDGE_BASE_COMPILED:
+        _write_compiled(name, stamp, data)
+    return data
+
+
+_NO_DEFAULT = object()
+
+
+def load_table(name: str, default=_NO_DEFAULT):
+    """
+    Parsed contents of data/<name>.json, loaded on first call and shared afterwards.
+    Callers must not modify the result. Raises OSError if the file is missing (ValueError if
+    it is not valid JSON) unless a default is given, which is then returned for good.
+    """
+    table = _tables.get(name)
+    if table is None:
+        with _lock:
+            table = _tables.get(name)
+            if table is None:
+                try:
+                    table = _load(name)
+                except (OSError, ValueError):
+                    if default is _NO_DEFAULT:
+                        raise
+                    table = default
+                _tables[name] = table
+    return table
+
+
+def table_names():
+    return sorted(f[:-5] for f in os.listdir(DATA_DIR) if f.endswith('.json'))
+
+
+def preload(names=None):
+    """Load tables now (e.g. before forking workers, so they share the pages)."""
+    for name in names or table_names():
+        load_table(name)
+
+
+def compile_all():
+    """(Re)build the compiled file for every data/*.json table."""
+    for name in table_names():
+        path = json_path(name)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = _intern_keys(json.load(f))
+        _write_compiled(name, _source_stamp(path), data)
+        print(f"{name}: {os.path.getsize(path)} -> {os.path.getsize(_compiled_path(name))} bytes")
+
+
+if __name__ == "__main__":
+    compile_all()
@@ -5,63 +5,45 @@ Computes Manglik status, Sade Sati (current), and current Dasha for display abov
 
 from datetime import datetime
 
-# Zodiac sign order (for Sade Sati: 12th, 1st, 2nd from Moon)
-SIGNS_ORDER = [
-    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
-    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-]
+from .transit import get_transit_chart
+from .saturn_ingress import saturn_sign_at, sade_sati_report
+from .chart_index import SIGN_INDEX, ChartIndex
+from .bit_chart import counted_from, house_mask
+
+# Sade Sati: 12th, 1st, 2nd from Moon
+_SADE_SATI_MASK = house_mask((12, 1, 2))
 
 
 def _moon_sign_from_chart(chart):
-    """Get natal Moon sign from D1 chart."""
-    if not chart or not getattr(chart, "d1_chart", None):
+    """Get natal Moon sign from D1 chart (VedicBirthChart or ChartIndex)."""
+    if not chart:
         return None
-    for p in getattr(chart.d1_chart, "planets", []):
-        cb = getattr(p, "celestial_body", None) or getattr(p, "planet", None)
-        if cb and str(cb).strip().lower() == "moon":
-            return (getattr(p, "sign", None) or getattr(p, "rashi", None) or "").strip()
-    return None
+    return ChartIndex.of(chart).sign_of("Moon")
 
 
 def _saturn_sign_from_chart(chart):
     """Get Saturn sign from a chart (natal or transit)."""
-    if not chart or not getattr(chart, "d1_chart", None):
+    if not chart:
         return None
-    for p in getattr(chart.d1_chart, "planets", []):
-        cb = getattr(p, "celestial_body", None) or getattr(p, "planet", None)
-        if cb and str(cb).strip().lower() == "saturn":
-            return (getattr(p, "sign", None) or getattr(p, "rashi", None) or "").strip()
-    # Try houses with occupants (from JSON-style structure)
-    houses = getattr(chart.d1_chart, "houses", None)
-    if houses:
-        for house in houses:
-            for occ in getattr(house, "occupants", []):
-                cb = getattr(occ, "celestial_body", None) or getattr(occ, "planet", None)
-                if cb and str(cb).strip().lower() == "saturn":
-                    return (getattr(occ, "sign", None) or getattr(occ, "rashi", None) or "").strip()
-    return None
-
-
-def is_sade_sati(moon_sign: str, saturn_sign: str) -> bool:
+    return ChartIndex.of(chart).sign_of("Saturn")
+
+
+def is_sade_sati(moon_sign: str, saturn_sign: str = None, when=None) -> bool:
     """
     Sade Sati = Saturn transiting 12th, 1st, or 2nd house from natal Moon (by sign).
     Returns True if Saturn is in the sign before Moon (12th), Moon sign (1st), or sign after Moon (2nd).
+    If saturn_sign is None, it is looked up in the Saturn ingress table for when (UTC, default now).
     """
+    if saturn_sign is None:
+        saturn_sign = saturn_sign_at(when or datetime.utcnow())
     if not moon_sign or not saturn_sign:
         return False
-    try:
-        moon_idx = SIGNS_ORDER.index(moon_sign.strip())
-    except ValueError:
+    moon_idx = SIGN_INDEX.get(moon_sign.strip())
+    saturn_idx = SIGN_INDEX.get(saturn_sign.strip())
+    if moon_idx is None or saturn_idx is None:
         return False
-    try:
-        saturn_idx = SIGNS_ORDER.index(saturn_sign.strip())
-    except ValueError:
-        return False
-    # 12th from Moon = (moon_idx - 1) % 12, 1st = moon_idx, 2nd = (moon_idx + 1) % 12
-    twelfth = (moon_idx - 1) % 12
-    first = moon_idx
-    second = (moon_idx + 1) % 12
-    return saturn_idx in (twelfth, first, second)
+    # Signs (12-bit) 12th, 1st and 2nd counted from the Moon's sign
+    return counted_from(_SADE_SATI_MASK, moon_idx + 1) >> saturn_idx & 1 == 1
 
 
 def get_kundali_summary(chart, yoga_dosha_result=None, dasha_data=None,
@@ -71,17 +53,18 @@ def get_kundali_summary(chart, yoga_dosha_result=None, dasha_data=None,
     Compute Manglik status, Sade Sati (present or not), and current Dasha string.
 
     Args:
-        chart: VedicBirthChart (natal)
+        chart: VedicBirthChart (natal) or its ChartIndex
         yoga_dosha_result: Result from analyze_yoga_dosha(chart) for Manglik
         dasha_data: Result from get_dasha_data(chart) for current dasha
-        latitude, longitude, timezone_offset: For computing transit (Sade Sati)
+        latitude, longitude, timezone_offset: Passed to transit_chart_fn (Sade Sati)
         transit_chart_fn: Optional callable (lat, lon, tz) -> chart for "today".
-                          If None, will use jyotishganit.calculate_birth_chart with datetime.now().
+                          If None, uses the shared transit chart from modules.transit.
 
     Returns:
         dict: {
           "manglik_status": "Yes" | "No",
           "sade_sati_status": "Present" | "Not present",
+          "sade_sati_detail": { present, phase, saturn_sign, current, next } (from the ingress table),
           "current_dasha": "Ketu - Saturn" (mahadasha - antardasha),
           "current_dasha_detail": { optional summary fields }
         }
@@ -123,26 +106,25 @@ def get_kundali_summary(chart, yoga_dosha_result=None, dasha_data=None,
     if not moon_sign:
         return out
 
+    # Precomputed Saturn ingress table: no ephemeris work on the request path
+    if not transit_chart_fn:
+        report = sade_sati_report(moon_sign)
+        if report is not None:
+            out["sade_sati_detail"] = report
+            if report["present"]:
+                out["sade_sati_status"] = "Present"
+            return out
+
     transit_chart = None
     if transit_chart_fn and callable(transit_chart_fn):
         try:
             transit_chart = transit_chart_fn(latitude, longitude, timezone_offset)
         except Exception:
             pass
-    if transit_chart is None and latitude is not None and longitude is not None:
+    if transit_chart is None:
         try:
-            from jyotishganit import calculate_birth_chart
-            now = datetime.utcnow()
-            # Use local time for the given timezone
-            from datetime import timedelta
-            local_now = now + timedelta(hours=float(timezone_offset or 0))
-            transit_chart = calculate_birth_chart(
-                birth_date=local_now,
-                latitude=float(latitude),
-                longitude=float(longitude),
-                timezone_offset=float(timezone_offset or 5.5),
-                name="Transit"
-            )
+            # Shared per-bucket transit chart (Saturn's sign does not depend on location)
+            transit_chart = get_transit_chart()
         except Exception:
             pass
 
@@ -4,9 +4,10 @@ Computes Radical (Psychic), Destiny, and Name numbers from birth date and full n
 Uses data from data/numerology_data.json. Supports karmic debt numbers 13, 14, 16, 19.
 """
 
-import json
-import os
 import re
+from types import MappingProxyType
+
+from .knowledge_base import load_table
 
 # Letter to number (1-9 cycle): A=1..I=9, J=1..R=9, S=1..Z=8 (Pythagorean / Chaldean style)
 _LETTER_VALUES = {}
@@ -15,17 +16,9 @@ for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZ"):
 # Fix: 9th letter I=9, 18th R=9, so 27th would be 9 but we only have 26 letters. Actually A=1,B=2,...,I=9,J=1,...,R=9,S=1,T=2,...,Z=8.
 # 0-index: A=0 -> 1, B=1 -> 2, ... I=8 -> 9, J=9 -> 1 (9 mod 9 = 0 -> 9), K=10 -> 1, ... R=17 -> 9 (18%9=0->9), S=18 -> 1, ... Z=25 -> 8 (25%9=7 -> 8). So val = (i % 9) + 1 gives 1-9 for 0-8, but for i=8 we get 9, i=9 we get 1. So (i+1)%9 gives 1 for 0, 2 for 1, ... 9 for 8, 1 for 9. So (i % 9) + 1: i=0->1, i=8->9, i=9->1. Good. i=25->(25%9)+1=7+1=8. So Z=8. Correct.
 
-_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
-_NUMEROLOGY_DATA_PATH = os.path.join(_DATA_DIR, 'numerology_data.json')
-_numerology_data = None
-
 
 def _load_data():
-    global _numerology_data
-    if _numerology_data is None:
-        with open(_NUMEROLOGY_DATA_PATH, 'r', encoding='utf-8') as f:
-            _numerology_data = json.load(f)
-    return _numerology_data
+    return load_table("numerology_data")
 
 
 def _reduce_to_digit(n):
@@ -100,57 +93,22 @@ def get_karmic_debt(raw_sum):
     return None
 
 
-def get_numerology(name, date_str):
-    """
-    Build full numerology payload from full name and date string (YYYY-MM-DD).
-    
-    Returns dict with:
-      radical_number, destiny_number, name_number,
-      favourable_alphabets, favourable_days, favourable_dates, favourable_colours,
-      gemstone, deity, mantra, fast_day, ruling_planet, favourable_numbers, direction,
-      radical_summary, destiny_summary, name_summary,
-      karmic_debt (optional, present when destiny raw sum is 13, 14, 16, or 19)
-    """
-    data = _load_data()
-    numbers_data = data.get("numbers", {})
-    karmic_data = data.get("karmic_debt", {})
-
-    parsed = _parse_date(date_str)
-    if not parsed:
-        return {
-            "error": "Invalid date format. Use YYYY-MM-DD.",
-            "radical_number": None,
-            "destiny_number": None,
-            "name_number": None
-        }
+def _ordinal(n):
+    if 10 <= n % 100 <= 13:
+        return str(n) + "th"
+    return str(n) + {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
 
-    year, month, day = parsed
-    rad = radical_number(day)
-    dest_single, dest_raw = destiny_number(day, month, year)
-    name_num = name_number(name)
 
+def _radical_fields(numbers_data, rad):
+    """Payload fields that follow from the radical number (favourable_alphabets .. radical_summary)."""
     # Use radical number for "favourable" fields (main personality)
-    num_key = str(rad)
-    info = numbers_data.get(num_key, {})
-
+    info = numbers_data.get(str(rad), {})
     favourable_dates = info.get("favourable_dates", [])
-
-    def _ordinal(n):
-        if 10 <= n % 100 <= 13:
-            return str(n) + "th"
-        return str(n) + {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
-    favourable_dates_display = ", ".join(_ordinal(d) for d in favourable_dates)
-
-    result = {
-        "radical_number": rad,
-        "destiny_number": dest_single,
-        "name_number": name_num,
-        "name": name.strip() or None,
-        "date_of_birth": date_str,
+    return {
         "favourable_alphabets": favourable_alphabets(rad),
         "favourable_days": info.get("favourable_days", []),
         "favourable_dates": favourable_dates,
-        "favourable_dates_display": favourable_dates_display,
+        "favourable_dates_display": ", ".join(_ordinal(d) for d in favourable_dates),
         "favourable_number": info.get("friendly_numbers", [1])[0] if info.get("friendly_numbers") else 1,
         "favourable_numbers": info.get("friendly_numbers", []),
         "direction": info.get("direction", ""),
@@ -164,21 +122,217 @@ def get_numerology(name, date_str):
         "mantra_alt": info.get("mantra_alt"),
         "fast_day": info.get("fast_day", ""),
         "radical_summary": info.get("radical_summary", ""),
-        "destiny_summary": numbers_data.get(str(dest_single), {}).get("destiny_summary", ""),
-        "name_summary": numbers_data.get(str(name_num), {}).get("name_summary", ""),
     }
 
-    # Karmic debt: when raw sum of destiny is 13, 14, 16, or 19
+
+def _karmic_debt_field(karmic_data, dest_raw):
+    """karmic_debt payload field: when raw sum of destiny is 13, 14, 16, or 19, else None."""
     karmic_raw = get_karmic_debt(dest_raw)
-    if karmic_raw is not None:
-        kd = karmic_data.get(str(karmic_raw), {})
-        result["karmic_debt"] = {
-            "number": karmic_raw,
-            "reduces_to": kd.get("reduces_to"),
-            "summary": kd.get("summary", ""),
-            "lesson": kd.get("lesson", ""),
-        }
-    else:
-        result["karmic_debt"] = None
-
-    return result
+    if karmic_raw is None:
+        return None
+    kd = karmic_data.get(str(karmic_raw), {})
+    return {
+        "number": karmic_raw,
+        "reduces_to": kd.get("reduces_to"),
+        "summary": kd.get("summary", ""),
+        "lesson": kd.get("lesson", ""),
+    }
+
+
+def _invalid_date_result():
+    return {
+        "error": "Invalid date format. Use YYYY-MM-DD.",
+        "radical_number": None,
+        "destiny_number": None,
+        "name_number": None
+    }
+
+
+# Raw destiny sums with a karmic debt -> the destiny number they reduce to
+_KARMIC_DESTINY = {raw: _reduce_to_digit(raw) for raw in (13, 14, 16, 19)}
+# (radical, destiny, name number, karmic raw sum or 0) -> (head, tail): the payload without
+# name and date_of_birth, split around them. Templates are shared, so their list fields are
+# stored as tuples and karmic_debt as a read-only mapping; _payload hands out fresh copies.
+_templates = None
+_LIST_FIELDS = ("favourable_alphabets", "favourable_days", "favourable_dates", "favourable_numbers", "favourable_colours")
+
+
+def _numerology_templates():
+    """Every payload template (9 x 9 x 9, plus the karmic debt variants), built on first use."""
+    global _templates
+    if _templates is None:
+        data = _load_data()
+        numbers_data = data.get("numbers", {})
+        karmic_data = data.get("karmic_debt", {})
+        variants = [(dest, 0) for dest in range(1, 10)] + [(dest, raw) for raw, dest in _KARMIC_DESTINY.items()]
+        templates = {}
+        for rad in range(1, 10):
+            radical_fields = _radical_fields(numbers_data, rad)
+            for dest, karmic_raw in variants:
+                for name_num in range(1, 10):
+                    head = {"radical_number": rad, "destiny_number": dest, "name_number": name_num}
+                    tail = dict(radical_fields)
+                    tail["destiny_summary"] = numbers_data.get(str(dest), {}).get("destiny_summary", "")
+                    tail["name_summary"] = numbers_data.get(str(name_num), {}).get("name_summary", "")
+                    karmic_debt = _karmic_debt_field(karmic_data, karmic_raw)
+                    tail["karmic_debt"] = None if karmic_debt is None else MappingProxyType(karmic_debt)
+                    for field in _LIST_FIELDS:
+                        tail[field] = tuple(tail[field])
+                    templates[rad, dest, name_num, karmic_raw] = (head, tail)
+        _templates = templates
+    return _templates
+
+
+def _template(rad, dest_single, name_num, dest_raw):
+    return _numerology_templates()[rad, dest_single, name_num, get_karmic_debt(dest_raw) or 0]
+
+
+def _payload(template, name, date_str):
+    head, tail = template
+    payload = {**head, "name": name.strip() or None, "date_of_birth": date_str, **tail}
+    for field in _LIST_FIELDS:
+        payload[field] = list(payload[field])
+    if payload["karmic_debt"] is not None:
+        payload["karmic_debt"] = dict(payload["karmic_debt"])
+    return payload
+
+
+def get_numerology(name, date_str):
+    """
+    Build full numerology payload from full name and date string (YYYY-MM-DD).
+    
+    Returns dict with:
+      radical_number, destiny_number, name_number,
+      favourable_alphabets, favourable_days, favourable_dates, favourable_colours,
+      gemstone, deity, mantra, fast_day, ruling_planet, favourable_numbers, direction,
+      radical_summary, destiny_summary, name_summary,
+      karmic_debt (optional, present when destiny raw sum is 13, 14, 16, or 19)
+    Everything but name and date_of_birth comes from a precomputed template.
+    """
+    parsed = _parse_date(date_str)
+    if not parsed:
+        return _invalid_date_result()
+
+    year, month, day = parsed
+    rad = radical_number(day)
+    dest_single, dest_raw = destiny_number(day, month, year)
+    name_num = name_number(name)
+
+    return _payload(_template(rad, dest_single, name_num, dest_raw), name, date_str)
+
+
+# ----- Batch (NumPy) -----
+# Same numbers as the per-record functions, over whole arrays: digit roots as (n - 1) % 9 + 1,
+# letter values through a 256-entry byte table. Dates in the canonical YYYY-MM-DD (or
+# YYYY/MM/DD) layout are parsed as arrays; any other string goes through _parse_date.
+
+# Letter value by byte (either case); 0 for everything else
+_LETTER_TABLE = bytes(
+    _LETTER_VALUES.get(chr(b).upper(), 0) if chr(b).isascii() else 0 for b in range(256)
+)
+
+
+def _digit_root(n):
+    """Digit root of positive integers (array)."""
+    return (n - 1) % 9 + 1
+
+
+def _digit_sum(n, np):
+    """Sum of decimal digits of non-negative integers (array)."""
+    total = np.zeros_like(n)
+    n = n.copy()
+    while n.any():
+        total += n % 10
+        n //= 10
+    return total
+
+
+def _parse_dates_batch(dates, np):
+    """(year, month, day, valid) arrays for date strings, like _parse_date per element."""
+    texts = [str(d).strip() if d else "" for d in dates]
+    count = len(texts)
+    year = np.zeros(count, dtype=np.int64)
+    month = np.zeros(count, dtype=np.int64)
+    day = np.zeros(count, dtype=np.int64)
+    well_formed = np.zeros(count, dtype=bool)
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=count)
+    rows = np.flatnonzero(lengths == 10)
+    if rows.size:
+        joined = "".join(texts) if rows.size == count else "".join([texts[i] for i in rows.tolist()])
+        chars = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32).reshape(-1, 10)
+        digits = chars[:, [0, 1, 2, 3, 5, 6, 8, 9]].astype(np.int64) - ord("0")
+        separators = chars[:, [4, 7]]
+        ok = (((separators == ord("-")) | (separators == ord("/"))).all(axis=1)
+              & ((digits >= 0) & (digits <= 9)).all(axis=1))
+        rows, digits = rows[ok], digits[ok]
+        year[rows] = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+        month[rows] = digits[:, 4] * 10 + digits[:, 5]
+        day[rows] = digits[:, 6] * 10 + digits[:, 7]
+        well_formed[rows] = True
+    for i in np.flatnonzero(~well_formed).tolist():
+        parsed = _parse_date(texts[i])
+        # Years beyond int64 are left invalid
+        if parsed and parsed[0] < 10 ** 18:
+            year[i], month[i], day[i] = parsed
+            well_formed[i] = True
+    valid = well_formed & (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31) & (year > 0)
+    return year, month, day, valid
+
+
+def _name_sums_batch(names, np):
+    """Sum of letter values per name (array)."""
+    texts = ["" if n is None else str(n) for n in names]
+    # upper() may change a name's length (e.g. "ß" -> "SS"), so non-ASCII names are uppercased
+    # first; letters outside latin-1 are replaced and count 0
+    texts = [t if t.isascii() else t.upper() for t in texts]
+    values = np.frombuffer("".join(texts).encode("latin-1", "replace").translate(_LETTER_TABLE), dtype=np.uint8)
+    ends = np.cumsum(np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)))
+    totals = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    return totals[ends] - totals[np.concatenate(([0], ends[:-1]))]
+
+
+def numerology_numbers_batch(names, dates):
+    """
+    Radical, destiny and name numbers for many records at once (NumPy arrays, one element per
+    record). Returns dict of arrays: radical_number, destiny_number, destiny_raw, name_number
+    and valid (False where the date is invalid; the other arrays are 0 there).
+    """
+    import numpy as np
+
+    if len(names) != len(dates):
+        raise ValueError("names and dates must have the same length")
+    year, month, day, valid = _parse_dates_batch(dates, np)
+    raw = _digit_sum(day, np) + _digit_sum(month, np) + _digit_sum(year, np)
+    name_sum = _name_sums_batch(names, np)
+    return {
+        "radical_number": np.where(valid, _digit_root(day), 0),
+        "destiny_number": np.where(valid, _digit_root(raw), 0),
+        "destiny_raw": np.where(valid, raw, 0),
+        "name_number": np.where(valid, np.where(name_sum > 0, _digit_root(name_sum), 9), 0),
+        "valid": valid,
+    }
+
+
+def _batch_templates(names, dates):
+    """Template per record (None where the date is invalid)."""
+    numbers = numerology_numbers_batch(names, dates)
+    templates = _numerology_templates()
+    return [
+        templates[rad, dest, name_num, raw if raw in _KARMIC_DESTINY else 0] if valid else None
+        for valid, rad, dest, name_num, raw in zip(
+            numbers["valid"].tolist(), numbers["radical_number"].tolist(), numbers["destiny_number"].tolist(),
+            numbers["name_number"].tolist(), numbers["destiny_raw"].tolist(),
+        )
+    ]
+
+
+def get_numerology_batch(names, dates):
+    """
+    get_numerology for many (name, date) records, e.g. a whole customer list; returns the
+    payloads in input order. Numbers are computed with numerology_numbers_batch.
+    """
+    return [
+        _payload(template, name or "", date_str) if template else _invalid_date_result()
+        for template, name, date_str in zip(_batch_templates(names, dates), names, dates)
+    ]
+
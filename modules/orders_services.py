@@ -1,11 +1,31 @@
 """
-Orders and payments: service prices (backend source of truth), Razorpay create/verify, email to admin.
+Orders and payments: service prices (backend source of truth), Razorpay create/verify, email to admin (via the outbox).
 Uses Razorpay TEST keys (rzp_test_*).
 """
+import hashlib
+import hmac
 import os
+import threading
 import uuid
 from datetime import datetime
 
+from modules import db as orders_db
+from modules.report_worker import enqueue_order_report
+
+# Razorpay API calls: (connect, read) timeouts, retries for requests that were never processed
+# (connection refused, 429/503), and kept-alive connections per process.
+# RAZORPAY_BASE_URL points the client at a local stand-in for tests.
+RAZORPAY_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("RAZORPAY_CONNECT_TIMEOUT_SECONDS", "5"))
+RAZORPAY_READ_TIMEOUT_SECONDS = float(os.environ.get("RAZORPAY_READ_TIMEOUT_SECONDS", "15"))
+RAZORPAY_MAX_RETRIES = int(os.environ.get("RAZORPAY_MAX_RETRIES", "2"))
+RAZORPAY_RETRY_BACKOFF_SECONDS = float(os.environ.get("RAZORPAY_RETRY_BACKOFF_SECONDS", "0.3"))
+RAZORPAY_POOL_SIZE = int(os.environ.get("RAZORPAY_POOL_SIZE", "10"))
+RAZORPAY_BASE_URL = os.environ.get("RAZORPAY_BASE_URL", "")
+
+_razorpay_client_lock = threading.Lock()
+# ((key_id, key_secret), razorpay.Client)
+_razorpay_client = None
+
 # Backend is source of truth: (service_id, plan_id) -> (amount_paise, service_title)
 # plan_id is None for report services
 SERVICE_PRICES = [
@@ -55,53 +75,104 @@ def validate_create_payload(data: dict) -> tuple[bool, str]:
     return True, ""
 
 
-def create_razorpay_order(amount_paise: int, receipt_prefix: str = "order_"):
-    """Create order in Razorpay (test mode). Returns dict with order_id, key_id, amount_paise, currency."""
+def _razorpay_credentials() -> tuple[str, str]:
+    return os.environ.get("RAZORPAY_KEY_ID", ""), os.environ.get("RAZORPAY_KEY_SECRET", "")
+
+
+def _razorpay_session():
+    """requests session with a keep-alive connection pool and retries that cannot double-create."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=RAZORPAY_MAX_RETRIES,
+        connect=RAZORPAY_MAX_RETRIES,
+        # A read timeout may mean the order was created: never resend on it
+        read=0,
+        status=RAZORPAY_MAX_RETRIES,
+        # Rate-limited / unavailable requests were not processed, so POST is safe to repeat
+        status_forcelist=(429, 503),
+        allowed_methods=frozenset({"GET", "POST"}),
+        backoff_factor=RAZORPAY_RETRY_BACKOFF_SECONDS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=RAZORPAY_POOL_SIZE, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_razorpay_client():
+    """
+    Shared razorpay.Client for the configured keys (rebuilt only if the keys change).
+    Its session keeps connections to the API open between checkouts.
+    """
+    global _razorpay_client
     try:
         import razorpay
     except ImportError:
         raise RuntimeError(
             "razorpay package not installed. On the server run: pip install razorpay"
         )
-    key_id = os.environ.get("RAZORPAY_KEY_ID", "")
-    key_secret = os.environ.get("RAZORPAY_KEY_SECRET", "")
+    key_id, key_secret = _razorpay_credentials()
     if not key_id or not key_secret:
         raise RuntimeError(
             "RAZORPAY_KEY_ID and RAZORPAY_KEY_SECRET must be set in the server environment"
         )
-    client = razorpay.Client(auth=(key_id, key_secret))
+    cached = _razorpay_client
+    if cached is not None and cached[0] == (key_id, key_secret):
+        return cached[1]
+    with _razorpay_client_lock:
+        if _razorpay_client is None or _razorpay_client[0] != (key_id, key_secret):
+            options = {"base_url": RAZORPAY_BASE_URL} if RAZORPAY_BASE_URL else {}
+            client = razorpay.Client(
+                session=_razorpay_session(), auth=(key_id, key_secret), **options
+            )
+            _razorpay_client = ((key_id, key_secret), client)
+        return _razorpay_client[1]
+
+
+def create_razorpay_order(amount_paise: int, receipt_prefix: str = "order_"):
+    """Create order in Razorpay (test mode). Returns dict with order_id, key_id, amount_paise, currency."""
+    client = get_razorpay_client()
     receipt = receipt_prefix + str(uuid.uuid4()).replace("-", "")[:16]
     order = client.order.create(
         data={
             "amount": amount_paise,
             "currency": "INR",
             "receipt": receipt,
-        }
+        },
+        timeout=(RAZORPAY_CONNECT_TIMEOUT_SECONDS, RAZORPAY_READ_TIMEOUT_SECONDS),
     )
     return {
         "order_id": order["id"],
         "razorpay_order_id": order["id"],
-        "key_id": key_id,
+        "key_id": client.auth[0],
         "amount_paise": amount_paise,
         "currency": "INR",
     }
 
 
-def verify_payment_signature(razorpay_order_id: str, razorpay_payment_id: str, razorpay_signature: str) -> bool:
-    import razorpay
-    key_secret = os.environ.get("RAZORPAY_KEY_SECRET", "")
-    if not key_secret:
-        return False
-    client = razorpay.Client(auth=(os.environ.get("RAZORPAY_KEY_ID", ""), key_secret))
-    try:
-        client.utility.verify_payment_signature({
-            "razorpay_order_id": razorpay_order_id,
-            "razorpay_payment_id": razorpay_payment_id,
-            "razorpay_signature": razorpay_signature,
-        })
-        return True
-    except Exception:
+def _hmac_sha256_matches(secret: str, message: bytes, signature) -> bool:
+    if not secret or not isinstance(signature, str):
         return False
+    expected = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def verify_payment_signature(razorpay_order_id: str, razorpay_payment_id: str, razorpay_signature: str) -> bool:
+    """Checkout signature check: HMAC-SHA256 of "order_id|payment_id" with the key secret (no API call)."""
+    message = f"{razorpay_order_id}|{razorpay_payment_id}".encode()
+    return _hmac_sha256_matches(_razorpay_credentials()[1], message, razorpay_signature)
+
+
+def verify_webhook_signature(raw_body: bytes, signature) -> bool:
+    """X-Razorpay-Signature check: HMAC-SHA256 of the raw body with RAZORPAY_WEBHOOK_SECRET."""
+    return _hmac_sha256_matches(os.environ.get("RAZORPAY_WEBHOOK_SECRET", ""), raw_body, signature)
 
 
 def order_payload_to_record(order_payload: dict, razorpay_order_id: str, razorpay_payment_id: str) -> dict:
@@ -134,8 +205,32 @@ def order_payload_to_record(order_payload: dict, razorpay_order_id: str, razorpa
     }
 
 
+def finalize_order(razorpay_order_id: str, razorpay_payment_id: str, order_payload: dict | None = None):
+    """
+    Record a captured payment as an order, exactly once: save it, queue its report and the
+    admin email and drop the pending payload in one transaction. Safe to call concurrently
+    from checkout verify and the webhook for the same payment: the second call inserts
+    nothing and returns None. order_payload defaults to the pending payload saved at
+    checkout (None is returned if there is none). Returns the new order's id.
+    """
+    with orders_db.transaction():
+        if order_payload is None:
+            order_payload = orders_db.get_pending_payload(razorpay_order_id)
+            if order_payload is None:
+                return None
+        record = order_payload_to_record(order_payload, razorpay_order_id, razorpay_payment_id)
+        order_id = orders_db.save_order(record)
+        if order_id is None:
+            return None
+        enqueue_order_report(order_id, record, (order_payload.get("birth_details") or {}).get("timezone"))
+        send_admin_email_for_order(record)
+        orders_db.delete_pending_payload(razorpay_order_id)
+    return order_id
+
+
 def send_admin_email_for_order(record: dict):
-    """Send one email to ADMIN_EMAIL with full order details (for forwarding to astrologer)."""
+    """Queue one email to ADMIN_EMAIL with full order details (for forwarding to astrologer).
+    Returns the outbox id, or None if email is not configured."""
     admin_email = os.environ.get("ADMIN_EMAIL")
     if not admin_email:
         return  # skip if not configured
@@ -163,22 +258,9 @@ Birth details:
         body += f"Questions:\n{record['questions']}\n"
     body += "\n---\nForward this to the astrologer as needed."
 
-    import smtplib
-    from email.mime.text import MIMEText
-    from email.mime.multipart import MIMEMultipart
-
-    host = os.environ.get("SMTP_HOST", "")
-    port = int(os.environ.get("SMTP_PORT", "587"))
-    user = os.environ.get("SMTP_USER", "")
-    password = os.environ.get("SMTP_PASSWORD", "")
-    if not host or not user or not password:
+    # Delivered by the background sender (modules/email_outbox.py), not in the request
+    from modules.email_outbox import queue_email, smtp_settings
+    if smtp_settings() is None:
         return  # skip sending if SMTP not configured
-    msg = MIMEMultipart("alternative")
-    msg["Subject"] = f"Jyotimay order: {record.get('service_title', '')} – {record.get('customer_name', '')}"
-    msg["From"] = user
-    msg["To"] = admin_email
-    msg.attach(MIMEText(body, "plain"))
-    with smtplib.SMTP(host, port) as s:
-        s.starttls()
-        s.login(user, password)
-        s.sendmail(user, [admin_email], msg.as_string())
+    subject = f"Jyotimay order: {record.get('service_title', '')} – {record.get('customer_name', '')}"
+    return queue_email(admin_email, subject, body)
@@ -4,35 +4,17 @@ Derives personality, natural strengths, negative traits, and "how the world sees
 from the D1 (Rasi) chart, based on Lagna, Moon nakshatra, planet strengths, and classical sources.
 """
 
-import json
-import os
+from .bit_chart import DEBILITATION_MASKS, DIGNITY_MASKS, DUSTHANA_MASK, KENDRA_TRIKONA, KENDRA_TRIKONA_MASK, planet_mask
+from .chart_index import PLANET_INDEX, ChartIndex
+from .knowledge_base import load_table
 
-_data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
-with open(os.path.join(_data_dir, 'personality_insights_data.json'), 'r', encoding='utf-8') as f:
-    _INSIGHTS_DATA = json.load(f)
 
-_SIGN_LORD = {
-    "Aries": "Mars", "Taurus": "Venus", "Gemini": "Mercury", "Cancer": "Moon",
-    "Leo": "Sun", "Virgo": "Mercury", "Libra": "Venus", "Scorpio": "Mars",
-    "Sagittarius": "Jupiter", "Capricorn": "Saturn", "Aquarius": "Saturn", "Pisces": "Jupiter"
-}
-_EXALTATION_SIGN = {
-    "Sun": "Aries", "Moon": "Taurus", "Mars": "Capricorn", "Mercury": "Virgo",
-    "Jupiter": "Cancer", "Venus": "Pisces", "Saturn": "Libra"
-}
-_OWN_SIGNS = {
-    "Sun": ["Leo"], "Moon": ["Cancer"], "Mars": ["Aries", "Scorpio"],
-    "Mercury": ["Gemini", "Virgo"], "Jupiter": ["Sagittarius", "Pisces"],
-    "Venus": ["Taurus", "Libra"], "Saturn": ["Capricorn", "Aquarius"]
-}
-_DEBILITATION_SIGN = {
-    "Sun": "Libra", "Moon": "Scorpio", "Mars": "Cancer", "Mercury": "Pisces",
-    "Jupiter": "Capricorn", "Venus": "Virgo", "Saturn": "Aries"
-}
-_SEVEN_GRAHAS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
-_KENDRA_TRIKONA = {1, 4, 5, 7, 9, 10}
-_DUSTHANA = {6, 8, 12}
+def _insights_data():
+    """data/personality_insights_data.json (loaded on first use)."""
+    return load_table("personality_insights_data")
 
+_SEVEN_GRAHAS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
+_SEVEN = planet_mask(_SEVEN_GRAHAS)
 
 def _ordinal(n):
     """Return ordinal string for house number: 1 -> '1st', 2 -> '2nd', etc."""
@@ -48,92 +30,28 @@ def _ordinal(n):
 
 
 def _get_d1_map(chart):
-    """Build planet -> (house, sign), house -> [(planet, sign)], house_lords, lagna_sign."""
-    planet_to_house = {}
-    house_to_planets = {}
-    house_lords = {}
-    lagna_sign = None
-
-    d1 = getattr(chart, "d1_chart", None)
-    if not d1:
-        return planet_to_house, house_to_planets, house_lords, lagna_sign
-
-    houses = getattr(d1, "houses", None)
-    if houses:
-        for house in houses:
-            hnum = getattr(house, "number", None)
-            if hnum is None:
-                continue
-            hnum = int(hnum)
-            sign = getattr(house, "sign", "") or ""
-            lord = getattr(house, "lord", "")
-            if lord:
-                house_lords[hnum] = lord
-            if hnum == 1:
-                lagna_sign = sign
-            house_to_planets[hnum] = []
-            for occ in getattr(house, "occupants", []):
-                p = getattr(occ, "celestial_body", None) or getattr(occ, "planet", None)
-                s = getattr(occ, "sign", sign) or sign
-                if p:
-                    planet_to_house[p] = (hnum, s)
-                    house_to_planets[hnum].append((p, s))
-        return planet_to_house, house_to_planets, house_lords, lagna_sign
-
-    # Fallback: planets list
-    for p in getattr(d1, "planets", []):
-        name = getattr(p, "celestial_body", None) or getattr(p, "planet", None)
-        h = getattr(p, "house", None)
-        s = getattr(p, "sign", "") or ""
-        if name and h is not None:
-            h = int(h)
-            planet_to_house[name] = (h, s)
-            house_to_planets.setdefault(h, []).append((name, s))
-            if h == 1 and lagna_sign is None:
-                lagna_sign = s
-    for h in range(1, 13):
-        if h not in house_lords and house_to_planets.get(h):
-            _, sig = house_to_planets[h][0]
-            house_lords[h] = _SIGN_LORD.get(sig, "")
-        if h == 1 and lagna_sign is None and house_to_planets.get(h):
-            _, lagna_sign = house_to_planets[1][0]
-
-    return planet_to_house, house_to_planets, house_lords, lagna_sign
+    """Build planet -> (house, sign), house -> [(planet, sign)], house_lords, lagna_sign from a chart or ChartIndex."""
+    index = ChartIndex.of(chart)
+    planet_to_house, house_to_planets, house_lords = index.maps()
+    return planet_to_house, house_to_planets, house_lords, index.lagna_sign_name()
 
 
 def _get_moon_nakshatra_from_chart(chart):
     """Get Moon's nakshatra and sign from D1 planets."""
-    d1 = getattr(chart, "d1_chart", None)
-    if not d1:
+    index = ChartIndex.of(chart)
+    if not index.has("Moon"):
         return None, None
-    for p in getattr(d1, "planets", []):
-        if getattr(p, "celestial_body", None) == "Moon":
-            naks = getattr(p, "nakshatra", None) or getattr(p, "nakshatra_name", None)
-            sign = getattr(p, "sign", None)
-            return (naks or "").strip(), (sign or "").strip()
-    return None, None
+    return index.nakshatra_of("Moon") or "", index.sign_of("Moon") or ""
 
 
-def _planet_strong(planet, house, sign):
-    """True if planet has positional or dignitary strength (own/exalt or in Kendra/Trikona)."""
-    if planet not in _SEVEN_GRAHAS:
-        return False
-    if sign in _OWN_SIGNS.get(planet, []) or _EXALTATION_SIGN.get(planet) == sign:
-        return True
-    if house in _KENDRA_TRIKONA:
-        return True
-    return False
+def _strong_planets(bits):
+    """Seven grahas (planet mask) with dignitary or positional strength (own/exalt or in Kendra/Trikona)."""
+    return _SEVEN & (bits.in_signs(DIGNITY_MASKS) | bits.placed_in(KENDRA_TRIKONA_MASK))
 
 
-def _planet_weak(planet, house, sign):
-    """True if planet is in dusthana or debilitation."""
-    if planet not in _SEVEN_GRAHAS:
-        return False
-    if house in _DUSTHANA:
-        return True
-    if _DEBILITATION_SIGN.get(planet) == sign:
-        return True
-    return False
+def _weak_planets(bits):
+    """Seven grahas (planet mask) in a dusthana or debilitated."""
+    return _SEVEN & (bits.placed_in(DUSTHANA_MASK) | bits.in_signs(DEBILITATION_MASKS))
 
 
 def get_personality_insights(chart, panchanga=None, yoga_dosha_result=None):
@@ -141,7 +59,7 @@ def get_personality_insights(chart, panchanga=None, yoga_dosha_result=None):
     Build personality, natural strengths, negative traits, and how the world sees you from the chart.
 
     Args:
-        chart: VedicBirthChart from jyotishganit
+        chart: VedicBirthChart from jyotishganit, or its ChartIndex
         panchanga: Optional dict with keys like nakshatra, nakshatra_pada (overrides Moon nakshatra if present)
         yoga_dosha_result: Optional dict from analyze_yoga_dosha (doshas list) to factor into negative traits
 
@@ -165,8 +83,10 @@ def get_personality_insights(chart, panchanga=None, yoga_dosha_result=None):
         "how_the_world_sees_you": ""
     }
 
-    planet_to_house, house_to_planets, house_lords, lagna_sign = _get_d1_map(chart)
-    moon_nakshatra, moon_sign = _get_moon_nakshatra_from_chart(chart)
+    index = ChartIndex.of(chart)
+    planet_to_house, house_to_planets, house_lords, lagna_sign = _get_d1_map(index)
+    strong, weak = _strong_planets(index.bits()), _weak_planets(index.bits())
+    moon_nakshatra, moon_sign = _get_moon_nakshatra_from_chart(index)
     if panchanga and panchanga.get("nakshatra"):
         moon_nakshatra = moon_nakshatra or panchanga["nakshatra"]
 
@@ -175,7 +95,7 @@ def get_personality_insights(chart, panchanga=None, yoga_dosha_result=None):
     out["moon_nakshatra"] = moon_nakshatra
 
     # ---- Strong planets in the kundali (planet, house, sign, meaning); always at least 2 ----
-    house_meanings = _INSIGHTS_DATA.get("planet_house_meanings_d1", {})
+    house_meanings = _insights_data().get("planet_house_meanings_d1", {})
     # House priority for fallback (1=best): 1,10,5,9,4,7,2,11,3,6,8,12
     _HOUSE_PRIORITY = (1, 10, 5, 9, 4, 7, 2, 11, 3, 6, 8, 12)
     strong_planets_list = []
@@ -183,7 +103,7 @@ def get_personality_insights(chart, panchanga=None, yoga_dosha_result=None):
         if planet not in planet_to_house:
             continue
         h, sign = planet_to_house[planet]
-        if not _planet_strong(planet, h, sign):
+        if not strong >> PLANET_INDEX[planet] & 1:
             continue
         meaning = (house_meanings.get(planet) or {}).get(str(h))
         if not meaning:
@@ -219,8 +139,8 @@ def get_personality_insights(chart, panchanga=None, yoga_dosha_result=None):
     out["strong_planets_in_houses"] = strong_planets_list
 
     # ---- Personality: Lagna + Nakshatra (descriptive paragraph, 3-4+ sentences) ----
-    sign_traits = _INSIGHTS_DATA.get("sign_personality", {})
-    naks_traits = _INSIGHTS_DATA.get("nakshatra_personality", {})
+    sign_traits = _insights_data().get("sign_personality", {})
+    naks_traits = _insights_data().get("nakshatra_personality", {})
     parts = []
     if lagna_sign and lagna_sign in sign_traits:
         parts.append(sign_traits[lagna_sign])
@@ -232,16 +152,16 @@ def get_personality_insights(chart, panchanga=None, yoga_dosha_result=None):
         out["personality"] = f"Your chart is ruled by Lagna sign {lagna_sign or 'unknown'} and Moon nakshatra {moon_nakshatra or 'unknown'}. These shape your core personality and emotional nature according to classical Vedic astrology."
 
     # ---- Natural strengths: always 3-4 descriptive traits (full sentences) ----
-    strength_meanings = _INSIGHTS_DATA.get("planet_strength_meaning", {})
-    sign_pos = _INSIGHTS_DATA.get("sign_positive_traits", {})
-    naks_pos = _INSIGHTS_DATA.get("nakshatra_positive_traits", {})
+    strength_meanings = _insights_data().get("planet_strength_meaning", {})
+    sign_pos = _insights_data().get("sign_positive_traits", {})
+    naks_pos = _insights_data().get("nakshatra_positive_traits", {})
     positive_pool = []
     seen_planet = set()
     for planet in _SEVEN_GRAHAS:
         if planet not in planet_to_house:
             continue
         h, sign = planet_to_house[planet]
-        if _planet_strong(planet, h, sign) and planet not in seen_planet:
+        if strong >> PLANET_INDEX[planet] & 1 and planet not in seen_planet:
             seen_planet.add(planet)
             meaning = strength_meanings.get(planet)
             if meaning:
@@ -250,7 +170,7 @@ def get_personality_insights(chart, panchanga=None, yoga_dosha_result=None):
         for p in ("Jupiter", "Venus", "Mercury", "Moon", "Sun"):
             if p in planet_to_house and p not in seen_planet:
                 h, sign = planet_to_house[p]
-                if h in _KENDRA_TRIKONA:
+                if h in KENDRA_TRIKONA:
                     seen_planet.add(p)
                     meaning = strength_meanings.get(p)
                     if meaning:
@@ -264,17 +184,17 @@ def get_personality_insights(chart, panchanga=None, yoga_dosha_result=None):
     out["natural_strengths"] = positive_pool[:4]
 
     # ---- Negative traits: always exactly 2 descriptive traits (full sentences) ----
-    weakness_meanings = _INSIGHTS_DATA.get("planet_weakness_meaning", {})
-    neg_house = _INSIGHTS_DATA.get("negative_trait_house", {})
-    sign_neg = _INSIGHTS_DATA.get("sign_negative_traits", {})
-    naks_neg = _INSIGHTS_DATA.get("nakshatra_negative_traits", {})
-    default_neg = _INSIGHTS_DATA.get("default_negative_traits", [])
+    weakness_meanings = _insights_data().get("planet_weakness_meaning", {})
+    neg_house = _insights_data().get("negative_trait_house", {})
+    sign_neg = _insights_data().get("sign_negative_traits", {})
+    naks_neg = _insights_data().get("nakshatra_negative_traits", {})
+    default_neg = _insights_data().get("default_negative_traits", [])
     negative_pool = []
     for planet in _SEVEN_GRAHAS:
         if planet not in planet_to_house:
             continue
         h, sign = planet_to_house[planet]
-        if _planet_weak(planet, h, sign):
+        if weak >> PLANET_INDEX[planet] & 1:
             meaning = weakness_meanings.get(planet)
             if meaning:
                 negative_pool.append(meaning)
@@ -303,9 +223,9 @@ def get_personality_insights(chart, panchanga=None, yoga_dosha_result=None):
 
     # ---- How the world sees you: descriptive 2-3 sentences (10th lord + Lagna element) ----
     tenth_lord = house_lords.get(10) if house_lords else None
-    world_by_lord = _INSIGHTS_DATA.get("world_sees_by_tenth_lord", {})
-    sign_element = _INSIGHTS_DATA.get("sign_element", {})
-    world_by_element = _INSIGHTS_DATA.get("world_sees_by_lagna_element", {})
+    world_by_lord = _insights_data().get("world_sees_by_tenth_lord", {})
+    sign_element = _insights_data().get("sign_element", {})
+    world_by_element = _insights_data().get("world_sees_by_lagna_element", {})
     world_parts = []
     if tenth_lord and tenth_lord in world_by_lord:
         world_parts.append(world_by_lord[tenth_lord])
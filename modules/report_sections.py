@@ -0,0 +1,507 @@
+"""
+Report Sections Module
+Dependency graph of the /api/birth-chart response sections, so a client can ask for a
+subset (e.g. ?sections=dasha,kundali_summary) and only the analyzers those sections need are run.
+
+Nodes are built in dependency order into a results dict; "chart" (the ChartIndex of the
+natal chart) is an internal node and is only computed if a requested section needs it.
+Independent nodes run concurrently on a shared thread (or process) pool, each with a timeout;
+per-node wall times are reported so the API can expose them as a Server-Timing header.
+"""
+
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from functools import partial
+
+from modules.chart_cache import cached_birth_chart
+from modules.compatibility import calculate_compatibility_details
+from modules.kundali_summary import get_kundali_summary
+from modules.career_analyzer import analyze_career
+from modules.wealth_analyzer import analyze_wealth
+from modules.health_analyzer import analyze_health
+from modules.marriage_analyzer import analyze_marriage
+from modules.numerology import get_numerology
+from modules.dasha import get_dasha_data
+from modules.yoga_dosha_analyzer import analyze_yoga_dosha
+from modules.personality_insights import get_personality_insights
+from modules.chart_index import ChartIndex
+from modules.chart_serializer import extract_charts_data, extract_panchanga
+from modules.saturn_ingress import table_covers
+from modules.transit import get_transit_chart
+
+# Worker pool for sections; 0 or 1 runs everything sequentially in the request thread
+REPORT_SECTION_WORKERS = int(os.environ.get("REPORT_SECTION_WORKERS", "4"))
+# "thread" or "process" (analyzers are pure Python, so processes sidestep the GIL at the cost of
+# pickling the chart for every section)
+REPORT_SECTION_EXECUTOR = os.environ.get("REPORT_SECTION_EXECUTOR", "thread").strip().lower()
+# A section still running on a worker this long after it started is reported as an error (the
+# worker is not killed)
+REPORT_SECTION_TIMEOUT_SECONDS = float(os.environ.get("REPORT_SECTION_TIMEOUT_SECONDS", "15"))
+
+# Fields every /api/birth-chart record must have
+REQUIRED_FIELDS = ('name', 'date', 'time', 'latitude', 'longitude', 'timezone')
+
+# Top-level response keys that can be requested
+TOP_LEVEL_SECTIONS = ("charts", "compatibility", "panchanga", "kundali_summary")
+
+# Keys under response["sections"]
+ANALYSIS_SECTIONS = (
+    "career", "wealth", "health", "marriage", "yoga_dosha",
+    "personality_insights", "numerology", "dasha",
+)
+
+ALL_SECTIONS = TOP_LEVEL_SECTIONS + ANALYSIS_SECTIONS
+
+# node -> nodes it reads; "chart" is the ChartIndex of the natal chart, "transit" warms the
+# shared transit chart (only needed when the Saturn ingress table does not cover today)
+SECTION_DEPENDENCIES = {
+    "chart": (),
+    "transit": (),
+    "charts": ("chart",),
+    "compatibility": ("chart",),
+    "panchanga": ("chart",),
+    "career": ("chart",),
+    "wealth": ("chart",),
+    "health": ("chart",),
+    "marriage": ("chart",),
+    "yoga_dosha": ("chart",),
+    "personality_insights": ("chart", "panchanga", "yoga_dosha"),
+    "numerology": (),
+    "dasha": ("chart",),
+    "kundali_summary": ("chart", "yoga_dosha", "dasha", "transit"),
+}
+
+# Fields every error result of a section carries, so the frontend can render it unchanged
+_ERROR_DEFAULTS = {
+    "yoga_dosha": {"yogas": [], "doshas": [], "summary": "Yoga/Dosha analysis unavailable."},
+    "kundali_summary": {"manglik_status": "Unknown", "sade_sati_status": "Unknown", "current_dasha": None},
+}
+
+
+def _error_result(name, message):
+    return {**_ERROR_DEFAULTS.get(name, {}), "error": message}
+
+
+def parse_datetime(date_str, time_str):
+    """Parse date and time strings into datetime object"""
+    try:
+        # Expected format: "YYYY-MM-DD" and "HH:MM"
+        datetime_str = f"{date_str} {time_str}"
+        return datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
+    except Exception as e:
+        raise ValueError(f"Invalid date/time format: {e}")
+
+
+def parse_sections(value):
+    """
+    Parse a comma-separated section list (or list of names) into a tuple of known names.
+    Returns None (= everything) for an empty value; raises ValueError on unknown names.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.split(",")
+    names = [str(v).strip() for v in value if str(v).strip()]
+    if not names:
+        return None
+    unknown = [n for n in names if n not in ALL_SECTIONS]
+    if unknown:
+        raise ValueError(
+            f"Unknown section(s): {', '.join(unknown)}. Valid sections: {', '.join(ALL_SECTIONS)}"
+        )
+    return tuple(dict.fromkeys(names))
+
+
+def resolve_sections(requested=None) -> list:
+    """Requested sections plus everything they depend on, in dependency order."""
+    requested = ALL_SECTIONS if requested is None else requested
+    order = []
+    seen = set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        for dep in SECTION_DEPENDENCIES[name]:
+            visit(dep)
+        order.append(name)
+
+    for name in requested:
+        visit(name)
+    return order
+
+
+# ---------- Section builders: (data, results) -> value ----------
+
+def _build_charts(data, results):
+    return extract_charts_data(results["chart"])
+
+
+def _build_compatibility(data, results):
+    try:
+        return calculate_compatibility_details(results["chart"], data['name'])
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _build_panchanga(data, results):
+    chart_index = results["chart"]
+    panchanga = extract_panchanga(chart_index)
+    panchanga_data = {}
+    if panchanga:
+        panchanga_data = {
+            "tithi": panchanga.get('tithi') if isinstance(panchanga, dict) else None,
+            "nakshatra": panchanga.get('nakshatra') if isinstance(panchanga, dict) else None,
+            "nakshatra_pada": None,  # Will extract from Moon if available
+            "yoga": panchanga.get('yoga') if isinstance(panchanga, dict) else None,
+            "karana": panchanga.get('karana') if isinstance(panchanga, dict) else None,
+            "vaara": panchanga.get('vaara') if isinstance(panchanga, dict) else None
+        }
+    # Nakshatra Pada from Moon
+    if chart_index.has("Moon"):
+        panchanga_data["nakshatra_pada"] = chart_index.pada_of("Moon")
+    return panchanga_data
+
+
+def _build_analysis(fn, data, results):
+    try:
+        return fn(results["chart"]) or {}
+    except Exception as e:
+        return {"error": f"Analysis error: {str(e)}"}
+
+
+def _build_yoga_dosha(data, results):
+    try:
+        return analyze_yoga_dosha(results["chart"])
+    except Exception as e:
+        return _error_result("yoga_dosha", str(e))
+
+
+def _build_personality_insights(data, results):
+    try:
+        return get_personality_insights(
+            results["chart"],
+            panchanga=results.get("panchanga"),
+            yoga_dosha_result=results.get("yoga_dosha")
+        )
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _build_numerology(data, results):
+    try:
+        return get_numerology(data['name'], data['date'])
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _build_dasha(data, results):
+    try:
+        dasha = get_dasha_data(results["chart"])
+        return dasha if dasha is not None else {"error": "Dasha data not available"}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _build_kundali_summary(data, results):
+    # Manglik, Sade Sati, current Dasha (for display above charts)
+    try:
+        return get_kundali_summary(
+            results["chart"],
+            yoga_dosha_result=results.get("yoga_dosha"),
+            dasha_data=results.get("dasha"),
+            latitude=float(data.get("latitude")),
+            longitude=float(data.get("longitude")),
+            timezone_offset=float(data.get("timezone", 5.5))
+        )
+    except Exception as e:
+        return _error_result("kundali_summary", str(e))
+
+
+def _build_transit(data, results):
+    # Compute the shared transit chart now, overlapping the natal chart, instead of inside
+    # kundali_summary; get_kundali_summary then finds it cached
+    if not table_covers(datetime.utcnow()):
+        get_transit_chart()
+    return None
+
+
+SECTION_BUILDERS = {
+    "charts": _build_charts,
+    "compatibility": _build_compatibility,
+    "panchanga": _build_panchanga,
+    "career": partial(_build_analysis, analyze_career),
+    "wealth": partial(_build_analysis, analyze_wealth),
+    "health": partial(_build_analysis, analyze_health),
+    "marriage": partial(_build_analysis, analyze_marriage),
+    "yoga_dosha": _build_yoga_dosha,
+    "personality_insights": _build_personality_insights,
+    "numerology": _build_numerology,
+    "dasha": _build_dasha,
+    "kundali_summary": _build_kundali_summary,
+    "transit": _build_transit,
+}
+
+# Nodes that only have an effect in this process (always run on the thread pool)
+_THREAD_ONLY = {"transit"}
+
+
+# ---------- Scheduler ----------
+
+_executor_lock = threading.Lock()
+_executors = {}
+# Process pool workers put the token of each node they start on this queue (see _drain_started)
+_started_queue = None
+_started_tokens = {}  # token -> (started dict of the request, node name)
+_next_token = itertools.count()
+# How often a request checks whether its queued nodes have started; a node still queued after
+# this long is taken back and run in the request thread
+_START_POLL_SECONDS = 0.05
+
+
+def _init_process_worker(started_queue):
+    global _started_queue
+    _started_queue = started_queue
+
+
+def _get_executor(kind):
+    """Shared pool of REPORT_SECTION_WORKERS workers of the given kind ("thread" or "process")."""
+    global _started_queue
+    executor = _executors.get(kind)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(kind)
+            if executor is None:
+                if kind == "process":
+                    # Not forked from this multi-threaded server (locks held by other threads,
+                    # open database connections); workers start from a clean forkserver process
+                    context = multiprocessing.get_context("forkserver")
+                    _started_queue = context.Queue()
+                    executor = ProcessPoolExecutor(
+                        max_workers=REPORT_SECTION_WORKERS, mp_context=context,
+                        initializer=_init_process_worker, initargs=(_started_queue,),
+                    )
+                else:
+                    executor = ThreadPoolExecutor(
+                        max_workers=REPORT_SECTION_WORKERS, thread_name_prefix="report-section"
+                    )
+                _executors[kind] = executor
+    return executor
+
+
+def _run_node(name, data, inputs, started=None, token=None):
+    start = time.perf_counter()
+    if started is not None:
+        started[name] = start
+    if token is not None:
+        _started_queue.put(token)
+    try:
+        value = SECTION_BUILDERS[name](data, inputs)
+    except Exception as e:
+        value = _error_result(name, str(e))
+    return value, (time.perf_counter() - start) * 1000
+
+
+def _drain_started():
+    """Record the start of every process pool node the workers have reported so far."""
+    while True:
+        try:
+            token = _started_queue.get_nowait()
+        except queue.Empty:
+            return
+        with _executor_lock:
+            entry = _started_tokens.pop(token, None)
+        if entry is not None:
+            started, name = entry
+            started.setdefault(name, time.perf_counter())
+
+
+def _forget_token(token):
+    if token is not None:
+        with _executor_lock:
+            _started_tokens.pop(token, None)
+
+
+def _build_sequential(order, data, load_chart, results, timings):
+    for name in order:
+        start = time.perf_counter()
+        if name == "chart":
+            # Single pass over D1 shared by every analyzer
+            results["chart"] = ChartIndex.of(load_chart())
+        else:
+            results[name] = _run_node(name, data, results)[0]
+        timings[name] = (time.perf_counter() - start) * 1000
+    return results
+
+
+def build_sections(data: dict, load_chart, requested=None, timings=None) -> dict:
+    """
+    Run the builders needed for requested (None = all) and return {node: value}, including
+    dependencies. load_chart() must return the natal chart (VedicBirthChart or ChartIndex);
+    it is not called if no requested section needs it. Errors from load_chart propagate;
+    analyzer errors and timeouts are reported inside their section.
+
+    A node is submitted to the pool as soon as all its dependencies are done; the natal chart
+    is loaded in the calling thread while nodes that do not need it (transit, numerology) run.
+    Each node's timeout counts from when a worker starts it. Whenever the calling thread would
+    wait while one of its nodes is still queued (pool busy with other requests), it takes that
+    node back and runs it itself, as the sequential path does, so queueing never fails a section.
+    If timings is a dict, it is filled with {node: wall time in ms}.
+    """
+    order = resolve_sections(requested)
+    results = {}
+    timings = {} if timings is None else timings
+    if REPORT_SECTION_WORKERS <= 1:
+        return _build_sequential(order, data, load_chart, results, timings)
+
+    kind = "process" if REPORT_SECTION_EXECUTOR == "process" else "thread"
+    pending = list(order)
+    running = {}  # future -> (name, submitted at, start token of a process pool node or None)
+    # node -> start time, set by _run_node on the thread pool; process pool workers report the
+    # nodes they start, which _drain_started records (polled every _START_POLL_SECONDS)
+    started = {}
+
+    def submit_ready():
+        for name in list(pending):
+            if name == "chart" or any(dep not in results for dep in SECTION_DEPENDENCIES[name]):
+                continue
+            pending.remove(name)
+            inputs = {dep: results[dep] for dep in SECTION_DEPENDENCIES[name]}
+            token = None
+            if name in _THREAD_ONLY or kind == "thread":
+                future = _get_executor("thread").submit(_run_node, name, data, inputs, started)
+            else:
+                executor = _get_executor("process")
+                token = next(_next_token)
+                with _executor_lock:
+                    _started_tokens[token] = (started, name)
+                future = executor.submit(_run_node, name, data, inputs, None, token)
+            running[future] = (name, time.perf_counter(), token)
+
+    submit_ready()
+    if "chart" in pending:
+        pending.remove("chart")
+        start = time.perf_counter()
+        try:
+            results["chart"] = ChartIndex.of(load_chart())
+        except Exception:
+            for future, (_, _, token) in running.items():
+                future.cancel()
+                _forget_token(token)
+            raise
+        timings["chart"] = (time.perf_counter() - start) * 1000
+        submit_ready()
+
+    while running:
+        if kind == "process":
+            _drain_started()
+        now = time.perf_counter()
+        for future, (name, submitted, token) in list(running.items()):
+            if name in started or now - submitted < _START_POLL_SECONDS or not future.cancel():
+                continue
+            # Still queued behind other requests: run it in this thread instead of waiting for a worker
+            running.pop(future)
+            _forget_token(token)
+            inputs = {dep: results[dep] for dep in SECTION_DEPENDENCIES[name]}
+            results[name], timings[name] = _run_node(name, data, inputs)
+            break
+        else:
+            now = time.perf_counter()
+            timeout = REPORT_SECTION_TIMEOUT_SECONDS
+            for name, _, _ in running.values():
+                if name in started:
+                    timeout = min(timeout, started[name] + REPORT_SECTION_TIMEOUT_SECONDS - now)
+                else:
+                    # Queued (taken back after _START_POLL_SECONDS) or handed to a worker but not started yet
+                    timeout = min(timeout, _START_POLL_SECONDS)
+            done, _ = wait(list(running), timeout=max(timeout, 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, _, token = running.pop(future)
+                _forget_token(token)
+                try:
+                    results[name], timings[name] = future.result()
+                except Exception as e:
+                    # Worker failure (e.g. a broken process pool); builders catch their own errors
+                    results[name] = _error_result(name, str(e))
+            now = time.perf_counter()
+            for future, (name, _, _) in list(running.items()):
+                if name in started and now - started[name] >= REPORT_SECTION_TIMEOUT_SECONDS:
+                    running.pop(future)
+                    results[name] = _error_result(
+                        name, f"Section timed out after {REPORT_SECTION_TIMEOUT_SECONDS:g}s"
+                    )
+                    timings[name] = (now - started[name]) * 1000
+        submit_ready()
+    return results
+
+
+def build_birth_chart_report(data: dict, requested=None, chart=None, timings=None) -> dict:
+    """
+    Full /api/birth-chart payload for one birth record (see api_server.get_birth_chart).
+    requested: tuple from parse_sections (None = everything). chart: precomputed natal chart
+    for these inputs, else it is taken from the shared chart cache when first needed.
+    Raises ValueError for missing fields or a bad date/time.
+    """
+    # Validate required fields
+    for field in REQUIRED_FIELDS:
+        if field not in data:
+            raise ValueError(f"Missing required field: {field}")
+
+    # Parse datetime
+    date_of_birth = parse_datetime(data['date'], data['time'])
+
+    # 1. Calculate the chart (only if a requested section needs it)
+    def load_chart():
+        if chart is not None:
+            return chart
+        return cached_birth_chart(
+            date_of_birth,
+            float(data['latitude']),
+            float(data['longitude']),
+            float(data['timezone'])
+        )
+
+    # 2. Run the requested sections and their dependencies (independent ones in parallel)
+    built = build_sections(data, load_chart, requested, timings=timings)
+    sections = {
+        name: built[name] for name in ANALYSIS_SECTIONS
+        if name in built and (requested is None or name in requested)
+    }
+
+    # 3. Build complete response: numerology and dasha ONLY inside sections (never at top level)
+    result = {
+        "success": True,
+        "basic_details": {
+            "name": data['name'],
+            "dob": data['date'],
+            "time": data['time'],
+            "place": data.get('place', ''),  # Optional
+            "latitude": data['latitude'],
+            "longitude": data['longitude'],
+            "timezone": data['timezone']
+        },
+        "charts": built.get("charts"),
+        "compatibility": built.get("compatibility"),
+        "panchanga": built.get("panchanga"),
+        "kundali_summary": built.get("kundali_summary"),
+        "sections": sections,
+        "input": {
+            'name': data['name'],
+            'date': data['date'],
+            'time': data['time'],
+            'latitude': data['latitude'],
+            'longitude': data['longitude'],
+            'timezone': data['timezone']
+        }
+    }
+    if requested is not None:
+        for name in TOP_LEVEL_SECTIONS:
+            if name not in requested:
+                result.pop(name)
+    return result
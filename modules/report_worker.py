@@ -0,0 +1,137 @@
+"""
+Report Worker Module
+Background generation of the full birth-chart report for each paid order, so the admin order
+view has it ready instead of recomputing the chart. Jobs live in the SQLite report_jobs table
+(no external broker); a small pool of daemon threads claims them, stores the report
+zlib-compressed in order_reports, and retries failures with exponential backoff.
+"""
+
+import json
+import logging
+import os
+import threading
+import zlib
+
+from modules import db as orders_db
+
+# Worker threads per process; 0 disables background generation
+REPORT_WORKERS = int(os.environ.get("REPORT_WORKERS", "2"))
+REPORT_JOB_MAX_ATTEMPTS = int(os.environ.get("REPORT_JOB_MAX_ATTEMPTS", "3"))
+# Retry delay is REPORT_JOB_RETRY_SECONDS * 2 ** (attempt - 1)
+REPORT_JOB_RETRY_SECONDS = int(os.environ.get("REPORT_JOB_RETRY_SECONDS", "30"))
+# How often idle workers look for due jobs (new jobs from this process wake them at once)
+REPORT_JOB_POLL_SECONDS = float(os.environ.get("REPORT_JOB_POLL_SECONDS", "5"))
+# A running job whose worker has not finished after this long is picked up again
+REPORT_JOB_LOCK_TIMEOUT_SECONDS = int(os.environ.get("REPORT_JOB_LOCK_TIMEOUT_SECONDS", "600"))
+# Orders carry no timezone; birth times are taken as IST unless birth_details.timezone was sent
+DEFAULT_BIRTH_TIMEZONE = float(os.environ.get("DEFAULT_BIRTH_TIMEZONE", "5.5"))
+
+logger = logging.getLogger(__name__)
+
+_wakeup = threading.Event()
+_start_lock = threading.Lock()
+_threads = []
+
+
+def order_report_input(record: dict, timezone=None) -> dict:
+    """/api/birth-chart request body for an orders-table record."""
+    return {
+        "name": record.get("customer_name"),
+        "date": record.get("date_of_birth"),
+        "time": record.get("time_of_birth"),
+        "place": record.get("place_of_birth") or "",
+        "latitude": record.get("latitude"),
+        "longitude": record.get("longitude"),
+        "timezone": DEFAULT_BIRTH_TIMEZONE if timezone in (None, "") else timezone,
+    }
+
+
+def enqueue_order_report(order_id: int, record: dict, timezone=None):
+    """Queue report generation for a saved order (local workers wake once it is committed)."""
+    orders_db.enqueue_report_job(order_id, order_report_input(record, timezone), REPORT_JOB_MAX_ATTEMPTS)
+
+
+def _wake_on_commit(tables):
+    # Write listener: a job is only claimable once the enclosing transaction has committed
+    if "report_jobs" in tables:
+        _wakeup.set()
+
+
+def compress_report(report: dict) -> bytes:
+    return zlib.compress(json.dumps(report, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def decompress_report(blob: bytes) -> dict:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def get_order_report(order_id: int):
+    """
+    Precomputed report state for an order, or None if it was never queued:
+    { "status": queued|running|done|failed, "attempts", "error", "report": dict | None }
+    """
+    row = orders_db.get_order_report(order_id)
+    if not row:
+        return None
+    return {
+        "status": row["status"],
+        "attempts": row["attempts"],
+        "error": row["last_error"],
+        "report": decompress_report(row["report"]) if row["report"] is not None else None,
+    }
+
+
+def run_report_job(job: dict):
+    """Generate and store one claimed job's report, recording failures for retry."""
+    from modules.report_sections import build_birth_chart_report
+    try:
+        report = build_birth_chart_report(job["payload"])
+    except ValueError as e:
+        # Bad birth details: retrying will not help
+        orders_db.fail_report_job(job["id"], str(e))
+        return False
+    except Exception as e:
+        logger.exception("Report job %s (order %s) failed", job["id"], job["order_id"])
+        retry_in = None
+        if job["attempts"] < job["max_attempts"]:
+            retry_in = REPORT_JOB_RETRY_SECONDS * 2 ** (job["attempts"] - 1)
+        orders_db.fail_report_job(job["id"], str(e), retry_in)
+        return False
+    orders_db.complete_report_job(job["id"], job["order_id"], compress_report(report))
+    return True
+
+
+def process_pending_jobs(limit=None) -> int:
+    """Run due jobs in the calling thread until none are left (or limit); returns jobs run."""
+    n = 0
+    while limit is None or n < limit:
+        job = orders_db.claim_report_job(REPORT_JOB_LOCK_TIMEOUT_SECONDS)
+        if job is None:
+            break
+        run_report_job(job)
+        n += 1
+    return n
+
+
+def _worker_loop():
+    while True:
+        try:
+            if process_pending_jobs():
+                continue
+        except Exception:
+            logger.exception("Report worker error")
+        _wakeup.wait(REPORT_JOB_POLL_SECONDS)
+        _wakeup.clear()
+
+
+def start_report_workers(n=None):
+    """Start the background worker threads once per process (no-op if REPORT_WORKERS is 0)."""
+    n = REPORT_WORKERS if n is None else n
+    with _start_lock:
+        if _threads or n <= 0:
+            return
+        orders_db.add_write_listener(_wake_on_commit)
+        for i in range(n):
+            t = threading.Thread(target=_worker_loop, name=f"report-worker-{i}", daemon=True)
+            t.start()
+            _threads.append(t)
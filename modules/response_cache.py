@@ -0,0 +1,115 @@
+"""
+Response Cache Module
+In-process TTL cache for polled admin GET endpoints (/api/admin/stats, /api/admin/orders, ...).
+Entries are keyed on path + query string, dropped as soon as a committed write touches the
+orders (modules.db write listeners), and served with an ETag so an unchanged response
+becomes a bodyless 304 for clients sending If-None-Match.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+# Upper bound on staleness for writes made by other processes (gunicorn workers)
+ADMIN_CACHE_TTL_SECONDS = float(os.environ.get("ADMIN_CACHE_TTL_SECONDS", "30"))
+ADMIN_CACHE_MAX_ENTRIES = int(os.environ.get("ADMIN_CACHE_MAX_ENTRIES", "256"))
+
+# Response headers kept with a cached body
+_KEPT_HEADERS = ("X-Next-Cursor",)
+
+
+class ResponseCache:
+    """LRU + TTL map of request key -> (body, mimetype, etag, headers); cleared by invalidate()."""
+
+    def __init__(self, ttl_seconds=ADMIN_CACHE_TTL_SECONDS, max_entries=ADMIN_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # Bumped on every invalidation, so a response computed before a write is never stored after it
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry["stored_at"] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def generation(self):
+        return self._generation
+
+    def put(self, key, entry, generation):
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            entry["stored_at"] = time.monotonic()
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *_):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "ttl_seconds": self.ttl_seconds}
+
+
+admin_response_cache = ResponseCache()
+
+
+def _etag(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def cached_get(cache: ResponseCache = admin_response_cache):
+    """
+    Decorator for Flask GET views returning JSON: serve from cache while fresh, and answer
+    If-None-Match with 304. Only 200 responses are cached.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            from flask import current_app, make_response, request
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+            entry = cache.get(key)
+            if entry is None:
+                generation = cache.generation()
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                body = response.get_data()
+                entry = {
+                    "body": body,
+                    "mimetype": response.mimetype,
+                    "etag": _etag(body),
+                    "headers": {h: response.headers[h] for h in _KEPT_HEADERS if h in response.headers},
+                }
+                cache.put(key, entry, generation)
+            response = current_app.response_class(entry["body"], mimetype=entry["mimetype"])
+            for name, value in entry["headers"].items():
+                response.headers[name] = value
+            response.set_etag(entry["etag"])
+            # Browsers must revalidate each poll (cheap 304 when nothing changed)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response.make_conditional(request)
+        return wrapped
+    return decorator
@@ -0,0 +1,254 @@
+"""
+Saturn Ingress Module
+Precomputed table of Saturn's sidereal (True Chitra Paksha) sign ingresses, stored in
+data/saturn_ingress.json, with bisect lookups for "which sign is Saturn in at time T" and
+full Sade Sati windows for a natal Moon sign. No ephemeris call is made at request time.
+
+Rebuild the table (needs jyotishganit and its ephemeris files) with:
+    python -m modules.saturn_ingress
+"""
+
+import bisect
+import json
+import os
+from datetime import datetime, timedelta
+
+SIGNS_ORDER = [
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+]
+
+_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+SATURN_INGRESS_PATH = os.path.join(_DATA_DIR, 'saturn_ingress.json')
+
+_EPOCH = datetime(1970, 1, 1)
+_TIME_FORMAT = "%Y-%m-%dT%H:%MZ"
+# Saturn's retrograde loop never keeps it out of a sign for a year
+_RETROGRADE_GAP_MINUTES = 365 * 24 * 60
+
+# Loaded lazily: sorted ingress times (minutes since epoch, UTC), sign index entered at each,
+# and the end of the scanned range (the sign after the last ingress is unknown beyond it)
+_ingress_minutes = None
+_ingress_signs = None
+_valid_until = None
+
+
+def _to_minutes(dt: datetime) -> int:
+    return int((dt - _EPOCH).total_seconds() // 60)
+
+
+def _from_minutes(minutes: int) -> datetime:
+    return _EPOCH + timedelta(minutes=minutes)
+
+
+def _load_table():
+    global _ingress_minutes, _ingress_signs, _valid_until
+    if _ingress_minutes is None:
+        with open(SATURN_INGRESS_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        minutes, signs = [], []
+        for ts, sign_idx in data["ingresses"]:
+            minutes.append(_to_minutes(datetime.strptime(ts, _TIME_FORMAT)))
+            signs.append(int(sign_idx))
+        _valid_until = _to_minutes(datetime.strptime(data["valid_until"], _TIME_FORMAT))
+        _ingress_signs = signs
+        _ingress_minutes = minutes
+    return _ingress_minutes, _ingress_signs
+
+
+def table_covers(when: datetime) -> bool:
+    """True if when (naive UTC) lies inside the range scanned when the table was built."""
+    try:
+        minutes, _ = _load_table()
+    except (OSError, ValueError, KeyError):
+        return False
+    m = _to_minutes(when)
+    return bool(minutes) and minutes[0] <= m < _valid_until
+
+
+def saturn_sign_at(when: datetime):
+    """Saturn's sidereal sign at when (naive UTC datetime), or None outside the table range."""
+    if not table_covers(when):
+        return None
+    minutes, signs = _load_table()
+    i = bisect.bisect_right(minutes, _to_minutes(when)) - 1
+    return SIGNS_ORDER[signs[i]]
+
+
+def sade_sati_windows(moon_sign: str) -> list:
+    """
+    All Sade Sati periods in the table for a natal Moon sign.
+    A period runs from Saturn's first entry into the 12th sign from the Moon until it finally
+    leaves the 2nd; retrograde back-and-forth across either edge stays within one period.
+
+    Returns list of dicts: { start, peak_start, peak_end, end } as naive UTC datetimes
+    (peak = Saturn in the Moon sign itself; fields may be None or provisional when the table
+    starts or ends mid-period).
+    """
+    if not moon_sign or moon_sign.strip() not in SIGNS_ORDER:
+        return []
+    moon_idx = SIGNS_ORDER.index(moon_sign.strip())
+    sade_sati_signs = {(moon_idx - 1) % 12, moon_idx, (moon_idx + 1) % 12}
+    minutes, signs = _load_table()
+
+    windows = []
+    current = None
+    for m, sign_idx in zip(minutes, signs):
+        inside = sign_idx in sade_sati_signs
+        if inside and current is None:
+            current = {"start": m, "peak_start": None, "peak_end": None, "end": None}
+        elif not inside and current is not None:
+            current["end"] = m
+            windows.append(current)
+            current = None
+        if current is not None:
+            if sign_idx == moon_idx and current["peak_start"] is None:
+                current["peak_start"] = m
+            # Leaving the Moon sign (forward or retrograde) moves the provisional peak end
+            if sign_idx != moon_idx and current["peak_start"] is not None:
+                current["peak_end"] = m
+    if current is not None:
+        windows.append(current)
+
+    # Retrograde dips just outside the span (e.g. back out of the 12th) belong to the same period
+    merged = []
+    for w in windows:
+        prev = merged[-1] if merged else None
+        if prev is not None and prev["end"] is not None and w["start"] - prev["end"] < _RETROGRADE_GAP_MINUTES:
+            prev["end"] = w["end"]
+            prev["peak_start"] = prev["peak_start"] or w["peak_start"]
+            prev["peak_end"] = w["peak_end"] or prev["peak_end"]
+        else:
+            merged.append(w)
+    windows = merged
+
+    # A period that begins before the table (Saturn already inside at the first row) has no known start
+    if windows and windows[0]["start"] == minutes[0]:
+        windows[0]["start"] = None
+
+    return [
+        {k: (_from_minutes(v) if v is not None else None) for k, v in w.items()}
+        for w in windows
+    ]
+
+
+def sade_sati_phase(moon_sign: str, saturn_sign: str):
+    """'Rising' (Saturn 12th from Moon), 'Peak' (1st), 'Setting' (2nd) or None."""
+    if not moon_sign or not saturn_sign:
+        return None
+    try:
+        moon_idx = SIGNS_ORDER.index(moon_sign.strip())
+        saturn_idx = SIGNS_ORDER.index(saturn_sign.strip())
+    except ValueError:
+        return None
+    return {
+        (moon_idx - 1) % 12: "Rising",
+        moon_idx: "Peak",
+        (moon_idx + 1) % 12: "Setting",
+    }.get(saturn_idx)
+
+
+def sade_sati_report(moon_sign: str, when: datetime = None):
+    """
+    Sade Sati status for a natal Moon sign at when (UTC, defaults to now) from the table.
+
+    Returns None if the table does not cover when, else dict:
+      { present, phase, saturn_sign, current: window | None, next: window | None }
+    with window dates as "YYYY-MM-DD" strings.
+    """
+    when = when or datetime.utcnow()
+    saturn_sign = saturn_sign_at(when)
+    if saturn_sign is None:
+        return None
+
+    def _fmt(window):
+        if not window:
+            return None
+        return {k: (v.strftime("%Y-%m-%d") if v else None) for k, v in window.items()}
+
+    phase = sade_sati_phase(moon_sign, saturn_sign)
+    current = None
+    upcoming = None
+    for w in sade_sati_windows(moon_sign):
+        started = w["start"] is None or w["start"] <= when
+        if started and (w["end"] is None or when < w["end"]):
+            current = w
+        elif w["start"] is not None and w["start"] > when:
+            upcoming = w
+            break
+    return {
+        "present": phase is not None,
+        "phase": phase,
+        "saturn_sign": saturn_sign,
+        "current": _fmt(current),
+        "next": _fmt(upcoming),
+    }
+
+
+# ---------- Build step (offline; requires jyotishganit ephemeris) ----------
+
+def _saturn_sidereal_longitudes(t):
+    """Sidereal longitude of Saturn for a Skyfield time (scalar or array), as jyotishganit computes it."""
+    from jyotishganit.core.astronomical import get_ephemeris, _get_spica
+    eph = get_ephemeris()
+    earth = eph['earth']
+    _, spica_lon, _ = earth.at(t).observe(_get_spica()).apparent().ecliptic_latlon()
+    ayanamsa = (spica_lon.degrees - 180.0) % 360
+    _, saturn_lon, _ = earth.at(t).observe(eph['saturn barycenter']).apparent().ecliptic_latlon()
+    return (saturn_lon.degrees - ayanamsa) % 360
+
+
+def build_ingress_table(start_year=1900, end_year=2050, step_days=2):
+    """
+    Scan Saturn's sidereal longitude from 1 Jan start_year to 31 Dec end_year and return
+    [(ingress_utc_datetime, sign_index), ...] refined to the minute. The first row is
+    the sign at the start of the range. DE421 covers roughly 1900-2053.
+    """
+    from jyotishganit.core.astronomical import get_timescale
+    ts = get_timescale()
+
+    start = datetime(start_year, 1, 1)
+    n_steps = int((datetime(end_year, 12, 31) - start).days // step_days) + 1
+    times = [start + timedelta(days=i * step_days) for i in range(n_steps)]
+    t = ts.utc([d.year for d in times], [d.month for d in times], [d.day for d in times])
+    sign_idx = [int(lon // 30) % 12 for lon in _saturn_sidereal_longitudes(t)]
+
+    def _sign_at(dt):
+        lon = float(_saturn_sidereal_longitudes(ts.utc(dt.year, dt.month, dt.day, dt.hour, dt.minute)))
+        return int(lon // 30) % 12
+
+    table = [(start, sign_idx[0])]
+    for i in range(1, n_steps):
+        if sign_idx[i] == sign_idx[i - 1]:
+            continue
+        lo, hi = times[i - 1], times[i]
+        while hi - lo > timedelta(minutes=1):
+            mid = lo + (hi - lo) / 2
+            mid = mid.replace(second=0, microsecond=0)
+            if mid <= lo:
+                break
+            if _sign_at(mid) == sign_idx[i - 1]:
+                lo = mid
+            else:
+                hi = mid
+        table.append((hi, sign_idx[i]))
+    return table
+
+
+def write_ingress_table(path=SATURN_INGRESS_PATH, start_year=1900, end_year=2050):
+    table = build_ingress_table(start_year, end_year)
+    data = {
+        "planet": "Saturn",
+        "ayanamsa": "True Chitra Paksha",
+        "source": "jyotishganit (JPL DE421)",
+        "valid_until": datetime(end_year, 12, 31).strftime(_TIME_FORMAT),
+        "ingresses": [[dt.strftime(_TIME_FORMAT), idx] for dt, idx in table],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(",", ":"))
+    return len(table)
+
+
+if __name__ == '__main__':
+    n = write_ingress_table()
+    print(f"Wrote {n} Saturn ingress rows to {os.path.abspath(SATURN_INGRESS_PATH)}")
@@ -0,0 +1,63 @@
+"""
+Startup Module
+Cold-start accounting for the API worker: wall time of each startup phase (imports, DB init,
+admin seeding, data loading), and optional deferral of DB init, admin seeding and the
+background threads to the first request, so a new worker can accept traffic sooner.
+
+STARTUP_DEFER_DB_INIT=1 defers that work. STARTUP_PROFILE=1 also loads every knowledge base at
+startup (so its cost shows up) and prints the phase timings as JSON to stderr; see
+benchmarks/profile_startup.py for the full report.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+STARTUP_DEFER_DB_INIT = os.environ.get("STARTUP_DEFER_DB_INIT", "0") not in ("0", "false", "False", "")
+STARTUP_PROFILE = os.environ.get("STARTUP_PROFILE", "0") not in ("0", "false", "False", "")
+
+# Phase name -> milliseconds, in the order the phases ran
+timings = {}
+
+
+@contextmanager
+def phase(name: str):
+    """Time the block as startup phase name (repeated phases add up)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+
+def run_once(fn):
+    """Wrap fn so only the first call (from any thread) runs it; later calls wait for it to finish."""
+    lock = threading.Lock()
+    done = False
+
+    def wrapper():
+        nonlocal done
+        if done:
+            return
+        with lock:
+            if not done:
+                fn()
+                done = True
+    return wrapper
+
+
+def report():
+    """Phase timings plus whether the chart library was loaded during startup."""
+    return {
+        "phases_ms": {name: round(ms, 2) for name, ms in timings.items()},
+        "total_ms": round(sum(timings.values()), 2),
+        "deferred_db_init": STARTUP_DEFER_DB_INIT,
+        "jyotishganit_loaded": "jyotishganit" in sys.modules,
+    }
+
+
+def print_report():
+    print(json.dumps(report()), file=sys.stderr)
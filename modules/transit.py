@@ -0,0 +1,51 @@
+"""
+Transit Module
+Process-wide "transit of the day" chart for slow-moving planets (Saturn, Jupiter, Rahu, Ketu).
+Sidereal signs are geocentric and do not depend on the observer's location, so one chart per
+time bucket serves every request; Sade Sati only needs Saturn's sign, which changes every ~2.5 years.
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+
+# Width of a transit bucket; a sign change is picked up at most this long after it happens
+TRANSIT_BUCKET_HOURS = float(os.environ.get("TRANSIT_BUCKET_HOURS", "6"))
+
+_lock = threading.Lock()
+# bucket start (UTC) -> chart; only the current bucket is kept
+_transit_charts = {}
+
+
+def _bucket_start(now_utc: datetime) -> datetime:
+    bucket_seconds = max(int(TRANSIT_BUCKET_HOURS * 3600), 60)
+    epoch = datetime(2000, 1, 1)
+    elapsed = int((now_utc - epoch).total_seconds())
+    return epoch + timedelta(seconds=elapsed - elapsed % bucket_seconds)
+
+
+def get_transit_chart(now=None):
+    """
+    Transit chart for the bucket containing now (UTC, defaults to datetime.utcnow()).
+    Computed once per bucket and shared process-wide. Houses/Lagna are for 0°N 0°E and
+    should not be used; only planet signs are meaningful.
+    """
+    bucket = _bucket_start(now or datetime.utcnow())
+    chart = _transit_charts.get(bucket)
+    if chart is not None:
+        return chart
+    with _lock:
+        chart = _transit_charts.get(bucket)
+        if chart is None:
+            from jyotishganit import calculate_birth_chart
+            chart = calculate_birth_chart(
+                birth_date=bucket,
+                latitude=0.0,
+                longitude=0.0,
+                timezone_offset=0.0,
+                name="Transit"
+            )
+            _transit_charts.clear()
+            _transit_charts[bucket] = chart
+    return chart
+
@@ -2,8 +2,25 @@
 Yoga and Dosha Analyzer Module
 Detects 50+ planetary Yogas and Doshas present in the D1 (Rasi) chart.
 Based on BPHS, Phaladeepika, Saravali and related sources.
+
+Each yoga and dosha is a declarative rule (_YOGA_RULES, _DOSHA_RULES) whose condition is a
+bitmask test over a 12-house x 9-planet occupancy bitboard, built at import as a predicate
+over precomputed masks; each rule list is combined into one function. The rules are checked
+against the original hand-written checks by benchmarks/check_yoga_rules.py. Results for whole-sign charts are cached by configuration (Lagna sign and
+planet signs; see modules/yoga_dosha_cache.py).
 """
 
+from operator import attrgetter
+from types import SimpleNamespace
+
+from .bit_chart import (
+    ALL_PLANETS, ALL_SIGNS, APOKLIMA, DEBILITATION_SIGN, DIGNITY_MASKS, DUSTHANA, KENDRA, KENDRA_TRIKONA,
+    KENDRA_TRIKONA_MASK, PANAPHARA, TRIKONA, UPACHAYA, cells, house_mask, planet_mask, rotate, sign_mask,
+)
+from .chart_index import PLANET_INDEX, PLANETS, SIGN_INDEX, SIGNS, ChartIndex
+from .chart_index import SIGN_LORD as _SIGN_LORD_INDEX
+from .yoga_dosha_cache import yoga_dosha_cache
+
 # Seven traditional planets + nodes (Rahu, Ketu)
 _TRADITIONAL_PLANETS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
 _SEVEN_GRAHAS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
@@ -14,32 +31,15 @@ _MALEFICS = {"Sun", "Mars", "Saturn", "Rahu", "Ketu"}
 # Benefics (natural)
 _BENEFICS = {"Moon", "Mercury", "Jupiter", "Venus"}
 
-# House lords: sign -> lord
-_SIGN_LORD = {
-    "Aries": "Mars", "Taurus": "Venus", "Gemini": "Mercury", "Cancer": "Moon",
-    "Leo": "Sun", "Virgo": "Mercury", "Libra": "Venus", "Scorpio": "Mars",
-    "Sagittarius": "Jupiter", "Capricorn": "Saturn", "Aquarius": "Saturn", "Pisces": "Jupiter"
-}
-
 # Kendra (angle), Trikona, Upachaya, Panaphara, Apoklima, Dusthana
-_KENDRA = {1, 4, 7, 10}
-_TRIKONA = {1, 5, 9}
-_KENDRA_TRIKONA = _KENDRA | _TRIKONA
-_UPACHAYA = {3, 6, 10, 11}
-_PANAPHARA = {2, 5, 8, 11}
-_APOKLIMA = {3, 6, 9, 12}
-_DUSTHANA = {6, 8, 12}
-
-# Exaltation and own signs (for strength checks)
-_EXALTATION_SIGN = {
-    "Sun": "Aries", "Moon": "Taurus", "Mars": "Capricorn", "Mercury": "Virgo",
-    "Jupiter": "Cancer", "Venus": "Pisces", "Saturn": "Libra"
-}
-_OWN_SIGNS = {
-    "Sun": ["Leo"], "Moon": ["Cancer"], "Mars": ["Aries", "Scorpio"],
-    "Mercury": ["Gemini", "Virgo"], "Jupiter": ["Sagittarius", "Pisces"],
-    "Venus": ["Taurus", "Libra"], "Saturn": ["Capricorn", "Aquarius"]
-}
+_KENDRA = KENDRA
+_TRIKONA = TRIKONA
+_KENDRA_TRIKONA = KENDRA_TRIKONA
+_UPACHAYA = UPACHAYA
+_PANAPHARA = PANAPHARA
+_APOKLIMA = APOKLIMA
+_DUSTHANA = DUSTHANA
+
 # Pancha Mahapurusha: planet -> (own + exaltation) signs in Kendra
 _PANCHA_SIGNS = {
     "Mars": ["Aries", "Scorpio", "Capricorn"],
@@ -108,584 +108,703 @@ _DOSHA_EFFECTS = {
 }
 
 
-def _planet_in_own_or_exaltation(planet, sign):
-    """True if planet is in its own or exaltation sign."""
-    if sign in _OWN_SIGNS.get(planet, []):
-        return True
-    if _EXALTATION_SIGN.get(planet) == sign:
-        return True
-    return False
+_HOUSE_LORD_YOGAS = [
+    (1, "Chamara Yoga", "Lagna occupied or aspected by benefics and Lagna lord in own or exaltation sign in Kendra or Trikona."),
+    (2, "Dhenu Yoga", "2nd house occupied or aspected by benefic and 2nd lord in own or exaltation sign in Kendra or Trikona."),
+    (3, "Shaurya Yoga", "3rd house with benefic and 3rd lord in own or exaltation sign in Kendra or Trikona."),
+    (4, "Jaladhi Yoga", "4th house similarly disposed and 4th lord in own or exaltation in Kendra or Trikona."),
+    (5, "Chhatra Yoga", "5th house similarly disposed and 5th lord in own or exaltation in Kendra or Trikona."),
+    (6, "Astra Yoga (6th)", "6th house occupied or aspected by benefic and 6th lord in own or exaltation in Kendra or Trikona."),
+    (7, "Kama Yoga", "7th house similarly disposed and 7th lord in own or exaltation in Kendra or Trikona."),
+    (8, "Asura Yoga", "8th house with benefic and 8th lord in own or exaltation in Kendra or Trikona."),
+    (9, "Bhagya Yoga", "9th house similarly disposed and 9th lord in own or exaltation in Kendra or Trikona."),
+    (10, "Khyati Yoga", "10th house similarly disposed and 10th lord in own or exaltation in Kendra or Trikona."),
+    (11, "Parijata Yoga", "11th house similarly disposed and 11th lord in own or exaltation in Kendra or Trikona."),
+    (12, "Musala (12th) Yoga", "12th house with benefic and 12th lord in own or exaltation in Kendra or Trikona."),
+]
+
+# Lord of each planet's exaltation sign
+_EXALTATION_LORD = {
+    "Sun": "Mars", "Moon": "Venus", "Mars": "Moon", "Mercury": "Jupiter",
+    "Jupiter": "Moon", "Venus": "Mercury", "Saturn": "Venus"
+}
 
+_SIGNS_BY_NATURE = {
+    "movable": ["Aries", "Cancer", "Libra", "Capricorn"],
+    "fixed": ["Taurus", "Leo", "Scorpio", "Aquarius"],
+    "dual": ["Gemini", "Virgo", "Sagittarius", "Pisces"],
+}
+_ODD_SIGNS = ["Aries", "Gemini", "Leo", "Libra", "Sagittarius", "Aquarius"]
+_EVEN_SIGNS = ["Taurus", "Cancer", "Virgo", "Scorpio", "Capricorn", "Pisces"]
 
-def _house_offset_from(base_house, offset):
-    """House number that is offset from base (1-based)."""
-    if base_house is None:
-        return None
-    return ((base_house - 1 + offset - 1) % 12) + 1
 
+# ----- Bitmask encoding -----
+# Rules test a chart's BitChart (see modules/bit_chart.py) plus a few derived masks
+# (_ChartBits); each rule is a predicate over them with its masks worked out at import.
 
-def _get_d1_planet_house_map(chart):
-    """
-    Build planet -> (house_number, sign) and house_number -> list of (planet, sign) from D1.
-    Returns (planet_to_house: dict, house_to_planets: dict, house_lords: dict).
-    """
-    planet_to_house = {}
-    house_to_planets = {}
-    house_lords = {}
-
-    d1 = getattr(chart, "d1_chart", None)
-    if not d1:
-        return planet_to_house, house_to_planets, house_lords
-
-    # Prefer houses: each house has number, sign, lord, occupants
-    houses = getattr(d1, "houses", None)
-    if houses:
-        for house in houses:
-            hnum = getattr(house, "number", None)
-            if hnum is None:
-                continue
-            hnum = int(hnum)
-            sign = getattr(house, "sign", "")
-            lord = getattr(house, "lord", "")
-            if lord:
-                house_lords[hnum] = lord
-            house_to_planets[hnum] = []
-            occupants = getattr(house, "occupants", [])
-            for occ in occupants:
-                p = getattr(occ, "celestial_body", None) or getattr(occ, "planet", None)
-                s = getattr(occ, "sign", sign)
-                if p:
-                    planet_to_house[p] = (hnum, s)
-                    house_to_planets[hnum].append((p, s))
-        return planet_to_house, house_to_planets, house_lords
-
-    # Fallback: use planets list if each has house
-    planets = getattr(d1, "planets", [])
-    for p in planets:
-        name = getattr(p, "celestial_body", None) or getattr(p, "planet", None)
-        h = getattr(p, "house", None)
-        s = getattr(p, "sign", "")
-        if name and h is not None:
-            h = int(h)
-            planet_to_house[name] = (h, s)
-            house_to_planets.setdefault(h, []).append((name, s))
-
-    # House lords from first occupant's sign or from houses if available later
-    for h in range(1, 13):
-        if h not in house_lords and house_to_planets.get(h):
-            # Infer sign from first occupant
-            _, sign = house_to_planets[h][0]
-            house_lords[h] = _SIGN_LORD.get(sign, "")
 
-    return planet_to_house, house_to_planets, house_lords
+def _cells(houses, planets):
+    """Board mask of planets (9-bit mask) in houses (house numbers)."""
+    return cells(house_mask(houses), planets)
 
 
-def _moon_house(chart):
-    """Get Moon's D1 house number."""
-    d1 = getattr(chart, "d1_chart", None)
-    if not d1:
-        return None
-    for p in getattr(d1, "planets", []):
-        if getattr(p, "celestial_body", None) == "Moon":
-            return getattr(p, "house", None)
-    # From house map
-    planet_to_house, _, _ = _get_d1_planet_house_map(chart)
-    if "Moon" in planet_to_house:
-        return planet_to_house["Moon"][0]
-    return None
-
-
-def _house_from_moon(moon_house, offset):
-    """House number that is offset from Moon (1 = same, 2 = next, etc.)."""
-    return _house_offset_from(moon_house, offset)
-
-
-def _sun_house(chart, planet_to_house):
-    """Get Sun's D1 house number."""
-    if "Sun" in planet_to_house:
-        return planet_to_house["Sun"][0]
-    return None
-
-
-def _add_yoga(result, name, description, effects=None):
-    """Append yoga if name not already present. effects = detailed results from classical texts."""
-    if not any(r.get("name") == name for r in result):
-        entry = {"name": name, "description": description, "type": "yoga"}
-        if effects is not None:
-            entry["effects"] = effects
-        else:
-            src_effects = _YOGA_EFFECTS.get(name)
-            if src_effects:
-                entry["effects"] = src_effects
-        result.append(entry)
+_SEVEN = planet_mask(_SEVEN_GRAHAS)
+_SUN, _MOON = PLANET_INDEX["Sun"], PLANET_INDEX["Moon"]
 
 
-def detect_yogas(chart):
+class _ChartBits:
     """
-    Detect 50+ planetary Yogas present in the D1 chart.
-    Returns list of dicts: [{ "name": "...", "description": "...", "type": "yoga", "effects": "..."? }, ...]
-    When available from classical texts (Phaladeepika, Saravali), "effects" gives detailed results/phal.
+    The facts of one chart the rules test. board holds house occupants (as house_to_planets
+    lists them) and positions each planet's own house (as planet_to_house gives it).
     """
-    result = []
-    planet_to_house, house_to_planets, house_lords = _get_d1_planet_house_map(chart)
-    if not planet_to_house:
+
+    __slots__ = (
+        "board", "positions", "moon_board", "sun_board", "moon_positions",
+        "placed", "house", "sign", "sign_bit", "dignified", "kendra_trikona", "strong",
+        "lord", "kendra_lords", "trikona_lords", "moon", "lagna_occupant_sign",
+        "seven_houses", "seven_signs", "seven_known",
+    )
+
+    def __init__(self, index):
+        bits = index.bits()
+        self.board = board = bits.board
+        self.positions = positions = bits.positions
+        self.placed = placed = bits.placed
+        self.house = index.planet_house
+        self.sign = index.planet_sign
+        self.sign_bit = bits.planet_sign_bit
+        self.dignified = bits.in_signs(DIGNITY_MASKS)
+        self.kendra_trikona = bits.placed_in(KENDRA_TRIKONA_MASK)
+        self.strong = self.kendra_trikona & self.dignified
+        self.lord = lord = index.house_lord
+        self.kendra_lords = self.trikona_lords = 0
+        for h in _KENDRA:
+            if lord[h] >= 0:
+                self.kendra_lords |= 1 << lord[h]
+        for h in _TRIKONA:
+            if lord[h] >= 0:
+                self.trikona_lords |= 1 << lord[h]
+        self.moon = moon = index.planet_house[_MOON]
+        self.moon_board = rotate(board, moon) if moon else None
+        self.moon_positions = rotate(positions, moon) if moon else None
+        self.sun_board = rotate(board, index.planet_house[_SUN]) if placed & (1 << _SUN) else None
+        first = index.house_occupants[1]
+        self.lagna_occupant_sign = bits.planet_sign_bit[first[0]] if first else 0
+        self.seven_houses = bits.houses_of(_SEVEN)
+        self.seven_signs = bits.signs_of(_SEVEN)
+        self.seven_known = (bits.planets_in_signs(ALL_SIGNS) & _SEVEN).bit_count()
+
+
+# ----- Rule conditions -----
+# Each builder returns a predicate over _ChartBits, closing over its masks worked out here.
+
+_BOARD_VIEWS = {"lagna": attrgetter("board"), "moon": attrgetter("moon_board"), "sun": attrgetter("sun_board")}
+
+
+def _lord(house):
+    """Planet argument meaning "the lord of house"."""
+    return ("lord", house)
+
+
+def _planet_set(planets):
+    """Function of chart bits -> 9-bit mask of planets given by name or as _lord(h) (None if a lord is unknown)."""
+    fixed = planet_mask(p for p in planets if isinstance(p, str))
+    lord_houses = tuple(p[1] for p in planets if not isinstance(p, str))
+
+    def mask(bits):
+        result = fixed
+        for h in lord_houses:
+            lord = bits.lord[h]
+            if lord < 0:
+                return None
+            result |= 1 << lord
         return result
+    return mask
+
+
+def _gatherer(houses, planets):
+    """Function of a board -> 9-bit mask of planets in houses of it, one shift per house."""
+    shifts = tuple(9 * (h - 1) for h in sorted(set(houses)))
+    planets = planet_mask(planets)
+
+    def gather(board):
+        gathered = 0
+        for shift in shifts:
+            gathered |= board >> shift
+        return gathered & planets
+    return gather
+
+
+def _all(*conditions):
+    def test(bits):
+        for condition in conditions:
+            if not condition(bits):
+                return False
+        return True
+    return test
+
+
+def _any(*conditions):
+    def test(bits):
+        for condition in conditions:
+            if condition(bits):
+                return True
+        return False
+    return test
+
+
+def _not(condition):
+    return lambda bits: not condition(bits)
+
+
+def _view(base, test):
+    """test (a function of a board) of the board counted from base (lagna, moon or sun)."""
+    view = _BOARD_VIEWS[base]
+    if base == "lagna":
+        return lambda bits: test(bits.board)
+
+    def viewed(bits):
+        board = view(bits)
+        return board is not None and test(board)
+    return viewed
+
+
+def _occupied(base, houses, planets):
+    """Some of planets occupies one of houses counted from base."""
+    mask = _cells(houses, planet_mask(planets))
+    return _view(base, lambda board: board & mask != 0)
+
+
+def _vacant(base, houses, planets):
+    """base is in the chart and none of planets occupies houses counted from it."""
+    mask = _cells(houses, planet_mask(planets))
+    return _view(base, lambda board: board & mask == 0)
+
+
+def _gathered(base, houses, planets, n):
+    """At least n of planets occupy houses counted from base."""
+    gather = _gatherer(houses, planets)
+    return _view(base, lambda board: gather(board).bit_count() >= n)
+
+
+def _spread(houses, min_houses, min_planets):
+    """At least min_houses of houses occupied, holding min_planets planets between them."""
+    each = tuple(_cells((h,), ALL_PLANETS) for h in houses)
+    every = _cells(houses, ALL_PLANETS)
+
+    def test(bits):
+        board = bits.board
+        return sum(board & mask != 0 for mask in each) >= min_houses and (board & every).bit_count() >= min_planets
+    return test
+
+
+def _crowded(houses, n):
+    """One of houses holds at least n planets."""
+    each = tuple(_cells((h,), ALL_PLANETS) for h in houses)
+
+    def test(bits):
+        board = bits.board
+        for mask in each:
+            if (board & mask).bit_count() >= n:
+                return True
+        return False
+    return test
+
+
+def _placed(planet, houses=None, signs=None):
+    """planet is in the chart [in one of houses] [in one of signs]."""
+    p = PLANET_INDEX[planet]
+    bit = 1 << p
+    if houses is None:
+        test = lambda bits: bits.placed & bit != 0
+    else:
+        mask = _cells(houses, bit)
+        test = lambda bits: bits.positions & mask != 0
+    if signs is None:
+        return test
+    signs = sign_mask(signs)
+    return lambda bits: test(bits) and bits.sign_bit[p] & signs != 0
+
+
+def _placed_count(planets, houses, n):
+    """At least n of planets are placed in houses."""
+    gather = _gatherer(houses, planets)
+    return lambda bits: gather(bits.positions).bit_count() >= n
+
+
+def _dignified(planet):
+    """planet is in its own or exaltation sign."""
+    bit = 1 << PLANET_INDEX[planet]
+    return lambda bits: bits.dignified & bit != 0
+
+
+def _strong(*planets):
+    """Every one of planets (names or _lord(h)) in a Kendra or Trikona in own or exaltation sign."""
+    planet_set = _planet_set(planets)
+
+    def test(bits):
+        mask = planet_set(bits)
+        return mask is not None and bits.strong & mask == mask
+    return test
+
+
+def _angular_one_dignified(*planets):
+    """Every one of planets in a Kendra or Trikona, at least one in own or exaltation sign."""
+    planet_set = _planet_set(planets)
+
+    def test(bits):
+        mask = planet_set(bits)
+        return mask is not None and bits.kendra_trikona & mask == mask and bits.dignified & mask != 0
+    return test
+
+
+def _moon_counted_from(planet, houses):
+    """Moon's house counted from planet's is one of houses (((moon - planet - 1) % 12) + 1)."""
+    p = PLANET_INDEX[planet]
+    bit, mask = 1 << p, house_mask(houses)
+
+    def test(bits):
+        moon = bits.moon
+        return moon and bits.placed & bit != 0 and mask >> ((moon - bits.house[p] - 1) % 12) & 1 == 1
+    return test
+
+
+def _lagna_sun_moon_in(signs):
+    """Lagna (sign of the first occupant of house 1), Sun and Moon all in signs."""
+    outside = ALL_SIGNS & ~sign_mask(signs)
+
+    def test(bits):
+        lagna, sun, moon = bits.lagna_occupant_sign, bits.sign_bit[_SUN], bits.sign_bit[_MOON]
+        return lagna and sun and moon and (lagna | sun | moon) & outside == 0
+    return test
+
+
+def _lagna_or_moon_lord_in(houses):
+    """The Lagna lord and the lord of the Moon's house are known, and one of them is in houses."""
+    gather = _gatherer(houses, _TRADITIONAL_PLANETS)
+
+    def test(bits):
+        lord, moon = bits.lord, bits.moon
+        return (lord[1] >= 0 and moon and lord[moon] >= 0
+                and gather(bits.positions) & (1 << lord[1] | 1 << lord[moon]) != 0)
+    return test
+
+
+def _exchange(a, b):
+    """Lords of houses a and b are in each other's house."""
+    def test(bits):
+        lord_a, lord_b = bits.lord[a], bits.lord[b]
+        return lord_a >= 0 and lord_b >= 0 and bits.house[lord_a] == b and bits.house[lord_b] == a
+    return test
+
+
+def _lords_conjunct(a, b, houses):
+    """Lords of houses a and b share a house, one of houses."""
+    mask = house_mask(houses)
+
+    def test(bits):
+        lord_a, lord_b = bits.lord[a], bits.lord[b]
+        if lord_a < 0 or lord_b < 0 or bits.placed >> lord_a & 1 == 0 or bits.placed >> lord_b & 1 == 0:
+            return False
+        house = bits.house[lord_a]
+        return house == bits.house[lord_b] and mask >> (house - 1) & 1 == 1
+    return test
+
+
+def _kendra_trikona_lord_crossed():
+    """A Kendra lord placed in a Trikona, or a Trikona lord placed in a Kendra."""
+    in_trikona = _gatherer(_TRIKONA, _TRADITIONAL_PLANETS)
+    in_kendra = _gatherer(_KENDRA, _TRADITIONAL_PLANETS)
 
-    moon_house = _moon_house(chart)
-    sun_house = _sun_house(chart, planet_to_house)
+    def test(bits):
+        positions = bits.positions
+        return (bits.kendra_lords & in_trikona(positions) | bits.trikona_lords & in_kendra(positions)) != 0
+    return test
 
+
+def _kendra_and_trikona_lord_in(houses):
+    """A planet ruling both a Kendra and a Trikona is placed in houses."""
+    gather = _gatherer(houses, _TRADITIONAL_PLANETS)
+    return lambda bits: bits.kendra_lords & bits.trikona_lords & gather(bits.positions) != 0
+
+
+def _seven_in_houses(n):
+    """The seven grahas (those in the chart) occupy exactly n different houses."""
+    return lambda bits: bits.seven_houses.bit_count() == n
+
+
+def _seven_in_signs(signs):
+    """At least five of the seven grahas have a known sign, and all of those are in signs."""
+    outside = ALL_SIGNS & ~sign_mask(signs)
+    return lambda bits: bits.seven_known >= 5 and bits.seven_signs & outside == 0
+
+
+def _first_placed_lord_in(lord_houses, house):
+    """The lords of lord_houses are all known and the first of them in the chart is in house."""
+    def test(bits):
+        lords = [bits.lord[h] for h in lord_houses]
+        if min(lords) < 0:
+            return False
+        for lord in lords:
+            if bits.placed >> lord & 1 == 1:
+                return bits.house[lord] == house
+        return house == 0
+    return test
+
+
+def _debilitated_with(planet, helper):
+    """planet in its debilitation sign with helper in a Kendra from Lagna or Moon."""
+    p = PLANET_INDEX[planet]
+    mask = _cells(_KENDRA, 1 << PLANET_INDEX[helper])
+    debilitated = 1 << SIGN_INDEX[DEBILITATION_SIGN[planet]]
+
+    def test(bits):
+        if bits.sign_bit[p] != debilitated:
+            return False
+        moon_positions = bits.moon_positions
+        return bits.positions & mask != 0 or moon_positions is not None and moon_positions & mask != 0
+    return test
+
+
+def _dispositor_strong(planet):
+    """The lord of the sign planet (a _lord(h)) occupies is strong (see _strong)."""
+    h = planet[1]
+
+    def test(bits):
+        lord = bits.lord[h]
+        if lord < 0 or bits.placed >> lord & 1 == 0:
+            return False
+        sign = bits.sign[lord]
+        return sign >= 0 and bits.strong >> _SIGN_LORD_INDEX[sign] & 1 == 1
+    return test
+
+
+# ----- Rules -----
+# (name, description, test) in output order. Consecutive rules with the same name are
+# alternatives: the first that holds is reported and the rest are skipped.
+
+_YOGA_RULES = [
     # ----- 1–5: Pancha Mahapurusha (planet in Kendra in own/exaltation sign) -----
-    for yoga_name, planet, signs, desc in [
-        ("Ruchaka", "Mars", _PANCHA_SIGNS["Mars"], "Mars in a Kendra (1, 4, 7 or 10) in own or exaltation sign."),
-        ("Bhadra", "Mercury", _PANCHA_SIGNS["Mercury"], "Mercury in a Kendra in own or exaltation sign."),
-        ("Hamsa", "Jupiter", _PANCHA_SIGNS["Jupiter"], "Jupiter in a Kendra in own or exaltation sign."),
-        ("Malavya", "Venus", _PANCHA_SIGNS["Venus"], "Venus in a Kendra in own or exaltation sign."),
-        ("Sasa", "Saturn", _PANCHA_SIGNS["Saturn"], "Saturn in a Kendra in own or exaltation sign."),
-    ]:
-        if planet not in planet_to_house:
-            continue
-        h, sign = planet_to_house[planet]
-        if h in _KENDRA and sign in signs:
-            _add_yoga(result, f"{yoga_name} Yoga", desc)
-
-    # ----- 6–9: Lunar Yogas (from Moon: 2nd and 12th) -----
-    if moon_house is not None:
-        h2 = _house_from_moon(moon_house, 2)
-        h12 = _house_from_moon(moon_house, 12)
-        count_2 = len([x for x in house_to_planets.get(h2, []) if x[0] not in ("Rahu", "Ketu")])
-        count_12 = len([x for x in house_to_planets.get(h12, []) if x[0] not in ("Rahu", "Ketu")])
-        if count_2 == 0 and count_12 == 0:
-            _add_yoga(result, "Kemadruma Yoga", "No planets in 2nd and 12th from Moon.")
-        elif count_2 > 0 and count_12 == 0:
-            _add_yoga(result, "Sunapha Yoga", "Planet(s) in 2nd from Moon only.")
-        elif count_12 > 0 and count_2 == 0:
-            _add_yoga(result, "Anapha Yoga", "Planet(s) in 12th from Moon only.")
-        elif count_2 > 0 and count_12 > 0:
-            _add_yoga(result, "Durudhara Yoga", "Planets in both 2nd and 12th from Moon.")
+    ("Ruchaka Yoga", "Mars in a Kendra (1, 4, 7 or 10) in own or exaltation sign.", _placed("Mars", _KENDRA, _PANCHA_SIGNS["Mars"])),
+    ("Bhadra Yoga", "Mercury in a Kendra in own or exaltation sign.", _placed("Mercury", _KENDRA, _PANCHA_SIGNS["Mercury"])),
+    ("Hamsa Yoga", "Jupiter in a Kendra in own or exaltation sign.", _placed("Jupiter", _KENDRA, _PANCHA_SIGNS["Jupiter"])),
+    ("Malavya Yoga", "Venus in a Kendra in own or exaltation sign.", _placed("Venus", _KENDRA, _PANCHA_SIGNS["Venus"])),
+    ("Sasa Yoga", "Saturn in a Kendra in own or exaltation sign.", _placed("Saturn", _KENDRA, _PANCHA_SIGNS["Saturn"])),
+
+    # ----- 6–9: Lunar Yogas (from Moon: 2nd and 12th, nodes not counted) -----
+    ("Kemadruma Yoga", "No planets in 2nd and 12th from Moon.", _vacant("moon", (2, 12), _SEVEN_GRAHAS)),
+    ("Sunapha Yoga", "Planet(s) in 2nd from Moon only.",
+     _all(_occupied("moon", (2,), _SEVEN_GRAHAS), _vacant("moon", (12,), _SEVEN_GRAHAS))),
+    ("Anapha Yoga", "Planet(s) in 12th from Moon only.",
+     _all(_occupied("moon", (12,), _SEVEN_GRAHAS), _vacant("moon", (2,), _SEVEN_GRAHAS))),
+    ("Durudhara Yoga", "Planets in both 2nd and 12th from Moon.",
+     _all(_occupied("moon", (2,), _SEVEN_GRAHAS), _occupied("moon", (12,), _SEVEN_GRAHAS))),
 
     # ----- 10–11: Sun-based Vesi / Vasi / Ubhayachari (from Sun) -----
-    if sun_house is not None:
-        h2_sun = _house_offset_from(sun_house, 2)
-        h12_sun = _house_offset_from(sun_house, 12)
-        plan_2 = {p for p, _ in house_to_planets.get(h2_sun, []) if p in _BENEFICS}
-        plan_12 = {p for p, _ in house_to_planets.get(h12_sun, []) if p in _BENEFICS}
-        mal_2 = {p for p, _ in house_to_planets.get(h2_sun, []) if p in _MALEFICS}
-        mal_12 = {p for p, _ in house_to_planets.get(h12_sun, []) if p in _MALEFICS}
-        if plan_2 and not plan_12:
-            _add_yoga(result, "Subhavesi Yoga", "Benefic(s) in 2nd from Sun only.")
-        if plan_12 and not plan_2:
-            _add_yoga(result, "Subhavasi Yoga", "Benefic(s) in 12th from Sun only.")
-        if plan_2 and plan_12:
-            _add_yoga(result, "Subhobhayachari Yoga", "Benefics in both 2nd and 12th from Sun.")
-        if mal_2 and not mal_12:
-            _add_yoga(result, "Papavesi Yoga", "Malefic(s) in 2nd from Sun only.")
-        if mal_12 and not mal_2:
-            _add_yoga(result, "Papavasi Yoga", "Malefic(s) in 12th from Sun only.")
-        if mal_2 and mal_12:
-            _add_yoga(result, "Papobhayachari Yoga", "Malefics in both 2nd and 12th from Sun.")
+    ("Subhavesi Yoga", "Benefic(s) in 2nd from Sun only.",
+     _all(_occupied("sun", (2,), _BENEFICS), _vacant("sun", (12,), _BENEFICS))),
+    ("Subhavasi Yoga", "Benefic(s) in 12th from Sun only.",
+     _all(_occupied("sun", (12,), _BENEFICS), _vacant("sun", (2,), _BENEFICS))),
+    ("Subhobhayachari Yoga", "Benefics in both 2nd and 12th from Sun.",
+     _all(_occupied("sun", (2,), _BENEFICS), _occupied("sun", (12,), _BENEFICS))),
+    ("Papavesi Yoga", "Malefic(s) in 2nd from Sun only.",
+     _all(_occupied("sun", (2,), _MALEFICS), _vacant("sun", (12,), _MALEFICS))),
+    ("Papavasi Yoga", "Malefic(s) in 12th from Sun only.",
+     _all(_occupied("sun", (12,), _MALEFICS), _vacant("sun", (2,), _MALEFICS))),
+    ("Papobhayachari Yoga", "Malefics in both 2nd and 12th from Sun.",
+     _all(_occupied("sun", (2,), _MALEFICS), _occupied("sun", (12,), _MALEFICS))),
 
     # ----- 12–13: Subha / Papa Kartari (2nd and 12th from Lagna) -----
-    ben_2 = {p for p, _ in house_to_planets.get(2, []) if p in _BENEFICS}
-    ben_12 = {p for p, _ in house_to_planets.get(12, []) if p in _BENEFICS}
-    mal_2_lag = {p for p, _ in house_to_planets.get(2, []) if p in _MALEFICS}
-    mal_12_lag = {p for p, _ in house_to_planets.get(12, []) if p in _MALEFICS}
-    if ben_2 and ben_12:
-        _add_yoga(result, "Subha Kartari Yoga", "Benefics in 2nd and 12th from Lagna.")
-    if mal_2_lag and mal_12_lag:
-        _add_yoga(result, "Papa Kartari Yoga", "Malefics in 2nd and 12th from Lagna.")
+    ("Subha Kartari Yoga", "Benefics in 2nd and 12th from Lagna.",
+     _all(_occupied("lagna", (2,), _BENEFICS), _occupied("lagna", (12,), _BENEFICS))),
+    ("Papa Kartari Yoga", "Malefics in 2nd and 12th from Lagna.",
+     _all(_occupied("lagna", (2,), _MALEFICS), _occupied("lagna", (12,), _MALEFICS))),
 
     # ----- 14: Amala (benefic in 10th from Lagna or Moon) -----
-    for base, label in [(1, "Lagna"), (moon_house, "Moon")]:
-        if base is None:
-            continue
-        h10 = _house_offset_from(base, 10)
-        occupants = [p for p, _ in house_to_planets.get(h10, [])]
-        if any(p in _BENEFICS for p in occupants):
-            _add_yoga(result, "Amala Yoga", "Benefic in 10th from " + label + ".")
+    ("Amala Yoga", "Benefic in 10th from Lagna.", _occupied("lagna", (10,), _BENEFICS)),
+    ("Amala Yoga", "Benefic in 10th from Moon.", _occupied("moon", (10,), _BENEFICS)),
 
     # ----- 15: Mahabhagya (Lagna, Sun, Moon all odd for male day / all even for female night; we check odd/even only) -----
-    lagna_sign = house_to_planets.get(1, [])[0][1] if house_to_planets.get(1) else None
-    sun_sign = planet_to_house.get("Sun", (None, None))[1] if "Sun" in planet_to_house else None
-    moon_sign = planet_to_house.get("Moon", (None, None))[1] if "Moon" in planet_to_house else None
-    odd_signs = {"Aries", "Gemini", "Leo", "Libra", "Sagittarius", "Aquarius"}
-    even_signs = {"Taurus", "Cancer", "Virgo", "Scorpio", "Capricorn", "Pisces"}
-    if lagna_sign and sun_sign and moon_sign:
-        if all(s in odd_signs for s in (lagna_sign, sun_sign, moon_sign)):
-            _add_yoga(result, "Mahabhagya Yoga (male/day)", "Lagna, Sun and Moon in odd signs (male or day birth).")
-        if all(s in even_signs for s in (lagna_sign, sun_sign, moon_sign)):
-            _add_yoga(result, "Mahabhagya Yoga (female/night)", "Lagna, Sun and Moon in even signs (female or night birth).")
+    ("Mahabhagya Yoga (male/day)", "Lagna, Sun and Moon in odd signs (male or day birth).", _lagna_sun_moon_in(_ODD_SIGNS)),
+    ("Mahabhagya Yoga (female/night)", "Lagna, Sun and Moon in even signs (female or night birth).", _lagna_sun_moon_in(_EVEN_SIGNS)),
 
     # ----- 16–17: Kesari, Sakata (Moon from Jupiter) -----
-    if "Jupiter" in planet_to_house and moon_house is not None:
-        jup_house = planet_to_house["Jupiter"][0]
-        moon_from_jup = ((moon_house - jup_house - 1) % 12) + 1
-        if moon_from_jup in (1, 4, 7, 10):
-            _add_yoga(result, "Kesari Yoga", "Moon in Kendra (1st, 4th, 7th or 10th) from Jupiter.")
-        if moon_from_jup in (6, 8, 12):
-            moon_in_kendra_lag = moon_house in _KENDRA
-            if not moon_in_kendra_lag:
-                _add_yoga(result, "Sakata Yoga", "Moon in 6th, 8th or 12th from Jupiter (Moon not in Kendra from Lagna).")
+    ("Kesari Yoga", "Moon in Kendra (1st, 4th, 7th or 10th) from Jupiter.", _moon_counted_from("Jupiter", (1, 4, 7, 10))),
+    ("Sakata Yoga", "Moon in 6th, 8th or 12th from Jupiter (Moon not in Kendra from Lagna).",
+     _all(_moon_counted_from("Jupiter", (6, 8, 12)), _not(_placed("Moon", _KENDRA)))),
 
     # ----- 18–20: Adhama, Sama, Varishta (Moon from Sun) -----
-    if sun_house is not None and moon_house is not None:
-        moon_from_sun = ((moon_house - sun_house - 1) % 12) + 1
-        if moon_from_sun in (1, 4, 7, 10):
-            _add_yoga(result, "Adhama Yoga", "Moon in Kendra from Sun.")
-        if moon_from_sun in (2, 5, 8, 11):
-            _add_yoga(result, "Sama Yoga", "Moon in Panaphara (2nd, 5th, 8th, 11th) from Sun.")
-        if moon_from_sun in (3, 6, 9, 12):
-            _add_yoga(result, "Varishta Yoga", "Moon in Apoklima (3rd, 6th, 9th, 12th) from Sun.")
+    ("Adhama Yoga", "Moon in Kendra from Sun.", _moon_counted_from("Sun", _KENDRA)),
+    ("Sama Yoga", "Moon in Panaphara (2nd, 5th, 8th, 11th) from Sun.", _moon_counted_from("Sun", _PANAPHARA)),
+    ("Varishta Yoga", "Moon in Apoklima (3rd, 6th, 9th, 12th) from Sun.", _moon_counted_from("Sun", _APOKLIMA)),
 
     # ----- 21: Vasumati (all benefics in Upachaya 3,6,10,11 from Lagna or Moon) -----
-    for base in [1, moon_house]:
-        if base is None:
-            continue
-        upachaya_houses = [_house_offset_from(base, h) for h in (3, 6, 10, 11)]
-        benefics_placed = set()
-        for uh in upachaya_houses:
-            for p, _ in house_to_planets.get(uh, []):
-                if p in _BENEFICS:
-                    benefics_placed.add(p)
-        if len(benefics_placed) >= 3:
-            _add_yoga(result, "Vasumati Yoga", "All benefics in Upachaya houses (3, 6, 10, 11) from Lagna or Moon.")
+    ("Vasumati Yoga", "All benefics in Upachaya houses (3, 6, 10, 11) from Lagna or Moon.",
+     _any(_gathered("lagna", _UPACHAYA, _BENEFICS, 3), _gathered("moon", _UPACHAYA, _BENEFICS, 3))),
 
     # ----- 22: Pushkala (lords of Lagna and Moon's signs together in Kendra or mutual friend, strong planet aspects Lagna) -----
-    if house_lords.get(1) and moon_house and house_lords.get(moon_house):
-        lagna_lord = house_lords[1]
-        moon_sign_lord = house_lords[moon_house]
-        for planet, (h, _) in planet_to_house.items():
-            if planet not in (lagna_lord, moon_sign_lord):
-                continue
-            if h in _KENDRA_TRIKONA:
-                _add_yoga(result, "Pushkala Yoga", "Lords of Lagna and Moon's signs in Kendra/Trikona with strength.")
-                break
+    ("Pushkala Yoga", "Lords of Lagna and Moon's signs in Kendra/Trikona with strength.", _lagna_or_moon_lord_in(_KENDRA_TRIKONA)),
 
     # ----- 23–24: Shubhamala, Ashubhamala (planets in 5,6,7 vs 8,6,12) -----
-    signs_occupied = set()
-    for _, (_, s) in planet_to_house.items():
-        if s:
-            signs_occupied.add(s)
-    houses_5_6_7 = [_house_offset_from(1, x) for x in (5, 6, 7)]
-    count_567 = sum(1 for h in houses_5_6_7 if house_to_planets.get(h))
-    if count_567 >= 2:
-        occup_567 = sum(len(house_to_planets.get(h, [])) for h in houses_5_6_7)
-        if occup_567 >= 5:
-            _add_yoga(result, "Shubhamala Yoga", "Planets in 5th, 6th and 7th houses.")
-    for h in (8, 6, 12):
-        if len(house_to_planets.get(h, [])) >= 3:
-            _add_yoga(result, "Ashubhamala Yoga", "Planets in 8th, 6th and 12th houses.")
-            break
+    ("Shubhamala Yoga", "Planets in 5th, 6th and 7th houses.", _spread((5, 6, 7), 2, 5)),
+    ("Ashubhamala Yoga", "Planets in 8th, 6th and 12th houses.", _crowded((8, 6, 12), 3)),
 
     # ----- 25–26: Lakshmi, Gouri -----
-    if "Venus" in planet_to_house and 9 in house_lords:
-        vh, vs = planet_to_house["Venus"]
-        lord9 = house_lords[9]
-        if vh in _KENDRA_TRIKONA and _planet_in_own_or_exaltation("Venus", vs):
-            if lord9 in planet_to_house:
-                l9h, l9s = planet_to_house[lord9]
-                if l9h in _KENDRA_TRIKONA and _planet_in_own_or_exaltation(lord9, l9s):
-                    _add_yoga(result, "Lakshmi Yoga", "Venus and 9th lord in own or exaltation sign in Kendra or Trikona.")
-    if "Moon" in planet_to_house and "Jupiter" in planet_to_house:
-        mh, ms = planet_to_house["Moon"]
-        if mh in _KENDRA_TRIKONA and _planet_in_own_or_exaltation("Moon", ms):
-            _add_yoga(result, "Gouri Yoga", "Moon in own or exaltation sign in Kendra or Trikona (Jupiter strong).")
+    ("Lakshmi Yoga", "Venus and 9th lord in own or exaltation sign in Kendra or Trikona.", _strong("Venus", _lord(9))),
+    ("Gouri Yoga", "Moon in own or exaltation sign in Kendra or Trikona (Jupiter strong).",
+     _all(_placed("Jupiter"), _strong("Moon"))),
 
     # ----- 27: Saraswati (Mercury, Jupiter, Venus in Kendra/Trikona or in 2nd with Jupiter strong) -----
-    me_jup_ven = ["Mercury", "Jupiter", "Venus"]
-    in_kt = [p for p in me_jup_ven if p in planet_to_house and planet_to_house[p][0] in _KENDRA_TRIKONA]
-    in_2 = [p for p in me_jup_ven if p in planet_to_house and planet_to_house[p][0] == 2]
-    if len(in_kt) >= 3:
-        _add_yoga(result, "Saraswati Yoga", "Mercury, Jupiter and Venus in Kendra or Trikona.")
-    elif len(in_kt) >= 2 and "Jupiter" in planet_to_house:
-        jh, js = planet_to_house["Jupiter"]
-        if _planet_in_own_or_exaltation("Jupiter", js) and (2 in (planet_to_house.get(p, (None,))[0] for p in me_jup_ven if p in planet_to_house)):
-            _add_yoga(result, "Saraswati Yoga", "Mercury, Jupiter, Venus in Kendra/Trikona or 2nd house, with Jupiter in own or exaltation sign.")
+    ("Saraswati Yoga", "Mercury, Jupiter and Venus in Kendra or Trikona.",
+     _placed_count(("Mercury", "Jupiter", "Venus"), _KENDRA_TRIKONA, 3)),
+    ("Saraswati Yoga", "Mercury, Jupiter, Venus in Kendra/Trikona or 2nd house, with Jupiter in own or exaltation sign.",
+     _all(_placed_count(("Mercury", "Jupiter", "Venus"), _KENDRA_TRIKONA, 2), _dignified("Jupiter"),
+          _placed_count(("Mercury", "Jupiter", "Venus"), (2,), 1))),
 
     # ----- 28–30: Srikanta, Srinatha, Varunchi (Virinchi) -----
-    if house_lords.get(1) and "Sun" in planet_to_house and "Moon" in planet_to_house:
-        lord1 = house_lords[1]
-        l1h, l1s = planet_to_house.get(lord1, (None, None))
-        sun_h, sun_s = planet_to_house["Sun"]
-        moon_h, moon_s = planet_to_house["Moon"]
-        if l1h and l1h in _KENDRA_TRIKONA and sun_h in _KENDRA_TRIKONA and moon_h in _KENDRA_TRIKONA:
-            if _planet_in_own_or_exaltation(lord1, l1s) or _planet_in_own_or_exaltation("Sun", sun_s) or _planet_in_own_or_exaltation("Moon", moon_s):
-                _add_yoga(result, "Srikanta Yoga", "Lagna lord, Sun and Moon in exaltation, own or friend's sign in Kendra or Trikona.")
-    if 9 in house_lords and "Venus" in planet_to_house and "Mercury" in planet_to_house:
-        lord9 = house_lords[9]
-        vh, vs = planet_to_house["Venus"]
-        mh, ms = planet_to_house["Mercury"]
-        if vh in _KENDRA_TRIKONA and mh in _KENDRA_TRIKONA:
-            if lord9 in planet_to_house:
-                l9h, l9s = planet_to_house[lord9]
-                if l9h in _KENDRA_TRIKONA and (_planet_in_own_or_exaltation("Venus", vs) or _planet_in_own_or_exaltation(lord9, l9s) or _planet_in_own_or_exaltation("Mercury", ms)):
-                    _add_yoga(result, "Srinatha Yoga", "Venus, 9th lord and Mercury in exaltation or own sign in Kendra or Trikona.")
-    if 5 in house_lords and "Jupiter" in planet_to_house and "Saturn" in planet_to_house:
-        lord5 = house_lords[5]
-        jh, js = planet_to_house["Jupiter"]
-        sh, ss = planet_to_house["Saturn"]
-        if jh in _KENDRA_TRIKONA and sh in _KENDRA_TRIKONA and lord5 in planet_to_house:
-            l5h, l5s = planet_to_house[lord5]
-            if l5h in _KENDRA_TRIKONA and (_planet_in_own_or_exaltation("Jupiter", js) or _planet_in_own_or_exaltation("Saturn", ss) or _planet_in_own_or_exaltation(lord5, l5s)):
-                _add_yoga(result, "Varunchi (Virinchi) Yoga", "Jupiter, 5th lord and Saturn in exaltation or own sign in Kendra or Trikona.")
+    ("Srikanta Yoga", "Lagna lord, Sun and Moon in exaltation, own or friend's sign in Kendra or Trikona.",
+     _angular_one_dignified(_lord(1), "Sun", "Moon")),
+    ("Srinatha Yoga", "Venus, 9th lord and Mercury in exaltation or own sign in Kendra or Trikona.",
+     _angular_one_dignified("Venus", _lord(9), "Mercury")),
+    ("Varunchi (Virinchi) Yoga", "Jupiter, 5th lord and Saturn in exaltation or own sign in Kendra or Trikona.",
+     _angular_one_dignified("Jupiter", "Saturn", _lord(5))),
 
     # ----- 31–33: Parivartana (Maha, Dainya, Kahala) -----
-    for (a, b), yoga_type, formation in [
-        ((1, 2), "Maha", "Lords of houses 1 and 2 exchange places."),
-        ((1, 4), "Maha", "Lords of houses 1 and 4 exchange places."),
-        ((1, 5), "Maha", "Lords of houses 1 and 5 exchange places."),
-        ((1, 7), "Maha", "Lords of houses 1 and 7 exchange places."),
-        ((1, 9), "Maha", "Lords of houses 1 and 9 exchange places."),
-        ((1, 10), "Maha", "Lords of houses 1 and 10 exchange places."),
-        ((9, 10), "Maha", "Lords of houses 9 and 10 exchange places."),
-        ((1, 3), "Kahala", "Lords of houses 1 and 3 exchange places."),
-        ((6, 8), "Dainya", "Lords of houses 6 and 8 exchange places."),
-        ((6, 12), "Dainya", "Lords of houses 6 and 12 exchange places."),
-        ((8, 12), "Dainya", "Lords of houses 8 and 12 exchange places."),
-    ]:
-        if a not in house_lords or b not in house_lords:
-            continue
-        lord_a, lord_b = house_lords[a], house_lords[b]
-        if lord_a not in planet_to_house or lord_b not in planet_to_house:
-            continue
-        if planet_to_house[lord_a][0] == b and planet_to_house[lord_b][0] == a:
-            if yoga_type == "Maha":
-                _add_yoga(result, "Parivartana (Maha) Yoga", formation)
-            elif yoga_type == "Kahala":
-                _add_yoga(result, "Kahala (Parivartana) Yoga", formation)
-            else:
-                _add_yoga(result, "Parivartana (Dainya) Yoga", formation)
+    *[("Parivartana (Maha) Yoga", f"Lords of houses {a} and {b} exchange places.", _exchange(a, b))
+      for a, b in ((1, 2), (1, 4), (1, 5), (1, 7), (1, 9), (1, 10), (9, 10))],
+    ("Kahala (Parivartana) Yoga", "Lords of houses 1 and 3 exchange places.", _exchange(1, 3)),
+    *[("Parivartana (Dainya) Yoga", f"Lords of houses {a} and {b} exchange places.", _exchange(a, b))
+      for a, b in ((6, 8), (6, 12), (8, 12))],
 
     # ----- 34: Raja Yoga (9th-10th lord conjunction) -----
-    if 9 in house_lords and 10 in house_lords:
-        lord9, lord10 = house_lords[9], house_lords[10]
-        if lord9 in planet_to_house and lord10 in planet_to_house:
-            h9, h10 = planet_to_house[lord9][0], planet_to_house[lord10][0]
-            if h9 == h10 and h9 in _KENDRA_TRIKONA:
-                _add_yoga(result, "Raja Yoga (9th-10th lord)", "Lords of 9th and 10th in conjunction in a Kendra or Trikona house.")
+    ("Raja Yoga (9th-10th lord)", "Lords of 9th and 10th in conjunction in a Kendra or Trikona house.",
+     _lords_conjunct(9, 10, _KENDRA_TRIKONA)),
 
     # ----- 35: Raja Yoga (Kendra lord in Trikona or Trikona lord in Kendra) -----
-    kendra_lords = {house_lords[h] for h in _KENDRA if h in house_lords and house_lords[h]}
-    trikona_lords = {house_lords[h] for h in _TRIKONA if h in house_lords and house_lords[h]}
-    for planet, (h, _) in planet_to_house.items():
-        if planet not in _TRADITIONAL_PLANETS:
-            continue
-        if (planet in kendra_lords and h in _TRIKONA) or (planet in trikona_lords and h in _KENDRA):
-            _add_yoga(result, "Raja Yoga (Kendra-Trikona)", "A Kendra lord in a Trikona house, or a Trikona lord in a Kendra house.")
-            break
+    ("Raja Yoga (Kendra-Trikona)", "A Kendra lord in a Trikona house, or a Trikona lord in a Kendra house.",
+     _kendra_trikona_lord_crossed()),
 
     # ----- 36: Shankha (Kendra and Trikona lords together) -----
-    for planet, (h, _) in planet_to_house.items():
-        if planet in kendra_lords and planet in trikona_lords and h in _KENDRA_TRIKONA:
-            _add_yoga(result, "Shankha Yoga", "Same planet as lord of a Kendra and of a Trikona, placed together in a Kendra or Trikona house.")
-            break
+    ("Shankha Yoga", "Same planet as lord of a Kendra and of a Trikona, placed together in a Kendra or Trikona house.",
+     _kendra_and_trikona_lord_in(_KENDRA_TRIKONA)),
 
     # ----- 37–43: Sankhya / planetary distribution (Veena, Dhanu, Harsha, etc.) -----
-    seven_in = set()
-    for p in _SEVEN_GRAHAS:
-        if p in planet_to_house:
-            seven_in.add(planet_to_house[p][0])
-    n_signs = len(seven_in)
-    if n_signs == 7:
-        _add_yoga(result, "Veena (Vallaki) Yoga", "Seven planets in seven different signs.")
-    elif n_signs == 6:
-        _add_yoga(result, "Dhanu (Dharma) Yoga", "Seven planets in six signs.")
-    elif n_signs == 5:
-        _add_yoga(result, "Harsha Yoga", "Seven planets in five signs.")
-    elif n_signs == 4:
-        _add_yoga(result, "Kendra Sankhya Yoga", "Seven planets in four signs.")
-    elif n_signs == 3:
-        _add_yoga(result, "Shula Yoga", "Seven planets in three signs.")
-    elif n_signs == 2:
-        _add_yoga(result, "Yuga Yoga", "Seven planets in two signs; heretical, without wealth. (Inauspicious)")
-    elif n_signs == 1:
-        _add_yoga(result, "Gola Yoga", "All seven planets in one sign.")
+    ("Veena (Vallaki) Yoga", "Seven planets in seven different signs.", _seven_in_houses(7)),
+    ("Dhanu (Dharma) Yoga", "Seven planets in six signs.", _seven_in_houses(6)),
+    ("Harsha Yoga", "Seven planets in five signs.", _seven_in_houses(5)),
+    ("Kendra Sankhya Yoga", "Seven planets in four signs.", _seven_in_houses(4)),
+    ("Shula Yoga", "Seven planets in three signs.", _seven_in_houses(3)),
+    ("Yuga Yoga", "Seven planets in two signs; heretical, without wealth. (Inauspicious)", _seven_in_houses(2)),
+    ("Gola Yoga", "All seven planets in one sign.", _seven_in_houses(1)),
 
     # ----- 44: Adhiyoga (Mercury, Jupiter, Venus in 6,7,8 from Lagna or Moon) -----
-    for base in [1, moon_house]:
-        if base is None:
-            continue
-        h6 = _house_offset_from(base, 6)
-        h7 = _house_offset_from(base, 7)
-        h8 = _house_offset_from(base, 8)
-        occup = set()
-        for h in (h6, h7, h8):
-            for p, _ in house_to_planets.get(h, []):
-                if p in ("Mercury", "Jupiter", "Venus"):
-                    occup.add(p)
-        if len(occup) >= 3:
-            _add_yoga(result, "Adhiyoga", "Mercury, Jupiter and Venus occupy 6th, 7th and 8th houses from Lagna or Moon.")
-            break
-
-    # ----- 45–56: House-lord strength yogas (Chamar, Dhenu, Shaurya, Jaladhi, Chhatra, Astra, Kama, Asura, Bhagya, Khyati, Parijata, Musala 12th) -----
-    def _house_lord_strong(house_num):
-        if house_num not in house_lords:
-            return False
-        lord = house_lords[house_num]
-        if lord not in planet_to_house:
-            return False
-        h, s = planet_to_house[lord]
-        if h not in _KENDRA_TRIKONA:
-            return False
-        return _planet_in_own_or_exaltation(lord, s)
-
-    house_yogas = [
-        (1, "Chamara Yoga", "Lagna occupied or aspected by benefics and Lagna lord in own or exaltation sign in Kendra or Trikona."),
-        (2, "Dhenu Yoga", "2nd house occupied or aspected by benefic and 2nd lord in own or exaltation sign in Kendra or Trikona."),
-        (3, "Shaurya Yoga", "3rd house with benefic and 3rd lord in own or exaltation sign in Kendra or Trikona."),
-        (4, "Jaladhi Yoga", "4th house similarly disposed and 4th lord in own or exaltation in Kendra or Trikona."),
-        (5, "Chhatra Yoga", "5th house similarly disposed and 5th lord in own or exaltation in Kendra or Trikona."),
-        (6, "Astra Yoga (6th)", "6th house occupied or aspected by benefic and 6th lord in own or exaltation in Kendra or Trikona."),
-        (7, "Kama Yoga", "7th house similarly disposed and 7th lord in own or exaltation in Kendra or Trikona."),
-        (8, "Asura Yoga", "8th house with benefic and 8th lord in own or exaltation in Kendra or Trikona."),
-        (9, "Bhagya Yoga", "9th house similarly disposed and 9th lord in own or exaltation in Kendra or Trikona."),
-        (10, "Khyati Yoga", "10th house similarly disposed and 10th lord in own or exaltation in Kendra or Trikona."),
-        (11, "Parijata Yoga", "11th house similarly disposed and 11th lord in own or exaltation in Kendra or Trikona."),
-        (12, "Musala (12th) Yoga", "12th house with benefic and 12th lord in own or exaltation in Kendra or Trikona."),
-    ]
-    for hnum, yname, ydesc in house_yogas:
-        if _house_lord_strong(hnum):
-            # Check benefic on house for 1,2,3,4,5, etc. (simplified: any benefic in that house or aspecting)
-            occupants = house_to_planets.get(hnum, [])
-            has_benefic = any(p in _BENEFICS for p, _ in occupants)
-            if hnum in (1, 2, 3, 4, 5, 9, 10, 11) and (has_benefic or hnum == 1):
-                _add_yoga(result, yname, ydesc)
-            elif hnum in (6, 7, 8, 12):
-                _add_yoga(result, yname, ydesc)
-
-    # ----- 57–61: Vipareeta / Dusthana lord yogas (Harsha, Sarala, Vimala) -----
-    if 6 in house_lords and 8 in house_lords and 12 in house_lords:
-        L6, L8, L12 = house_lords[6], house_lords[8], house_lords[12]
-        for lor in (L6, L8, L12):
-            if lor not in planet_to_house:
-                continue
-            ih = planet_to_house[lor][0]
-            if ih == 6:
-                _add_yoga(result, "Harsha (Vipareeta) Yoga", "6th lord in 6th house (Vipareeta Raja).")
-            if ih == 8:
-                _add_yoga(result, "Sarala (Vipareeta) Yoga", "6th, 8th or 12th lord in 8th house (Vipareeta Raja).")
-            if ih == 12:
-                _add_yoga(result, "Vimala (Vipareeta) Yoga", "Lord of 6th, 8th or 12th in 12th house (Vipareeta Raja).")
-            break
+    ("Adhiyoga", "Mercury, Jupiter and Venus occupy 6th, 7th and 8th houses from Lagna or Moon.",
+     _any(_gathered("lagna", (6, 7, 8), ("Mercury", "Jupiter", "Venus"), 3),
+          _gathered("moon", (6, 7, 8), ("Mercury", "Jupiter", "Venus"), 3))),
+
+    # ----- 45–56: House-lord strength yogas (lord strong; houses 2–5 and 9–11 also need a benefic in them) -----
+    *[(name, description,
+       _strong(_lord(h)) if h in (1, 6, 7, 8, 12) else _all(_strong(_lord(h)), _occupied("lagna", (h,), _BENEFICS)))
+      for h, name, description in _HOUSE_LORD_YOGAS],
+
+    # ----- 57–61: Vipareeta / Dusthana lord yogas (the first of the 6th, 8th, 12th lords in the chart) -----
+    ("Harsha (Vipareeta) Yoga", "6th lord in 6th house (Vipareeta Raja).", _first_placed_lord_in((6, 8, 12), 6)),
+    ("Sarala (Vipareeta) Yoga", "6th, 8th or 12th lord in 8th house (Vipareeta Raja).", _first_placed_lord_in((6, 8, 12), 8)),
+    ("Vimala (Vipareeta) Yoga", "Lord of 6th, 8th or 12th in 12th house (Vipareeta Raja).", _first_placed_lord_in((6, 8, 12), 12)),
 
     # ----- 62: Neechabhanga Raja (planet in debilitation, lord of debilitation or exaltation lord in Kendra from Lagna/Moon) -----
-    debilitation_sign = {"Sun": "Libra", "Moon": "Scorpio", "Mars": "Cancer", "Mercury": "Pisces", "Jupiter": "Capricorn", "Venus": "Virgo", "Saturn": "Aries"}
-    exalt_lord = {"Sun": "Mars", "Moon": "Venus", "Mars": "Moon", "Mercury": "Jupiter", "Jupiter": "Moon", "Venus": "Mercury", "Saturn": "Venus"}
-    for planet, deb_sign in debilitation_sign.items():
-        if planet not in planet_to_house:
-            continue
-        h, sign = planet_to_house[planet]
-        if sign != deb_sign:
-            continue
-        deb_lord = _SIGN_LORD.get(deb_sign)
-        if deb_lord and deb_lord in planet_to_house:
-            dh = planet_to_house[deb_lord][0]
-            kendra_from_moon = {_house_offset_from(moon_house, k) for k in (1, 4, 7, 10)} if moon_house else set()
-            if dh in _KENDRA or dh in kendra_from_moon:
-                _add_yoga(result, "Neechabhanga Raja Yoga", "Planet in debilitation and lord of debilitation sign in Kendra from Lagna or Moon.")
-                break
-        exc_l = exalt_lord.get(planet)
-        if exc_l and exc_l in planet_to_house:
-            eh = planet_to_house[exc_l][0]
-            kendra_from_moon = {_house_offset_from(moon_house, k) for k in (1, 4, 7, 10)} if moon_house else set()
-            if eh in _KENDRA or eh in kendra_from_moon:
-                _add_yoga(result, "Neechabhanga Raja Yoga", "Planet in debilitation and exaltation lord of that planet in Kendra from Lagna or Moon.")
-                break
+    *[rule for planet, sign in DEBILITATION_SIGN.items() for rule in (
+        ("Neechabhanga Raja Yoga", "Planet in debilitation and lord of debilitation sign in Kendra from Lagna or Moon.",
+         _debilitated_with(planet, PLANETS[_SIGN_LORD_INDEX[SIGN_INDEX[sign]]])),
+        ("Neechabhanga Raja Yoga", "Planet in debilitation and exaltation lord of that planet in Kendra from Lagna or Moon.",
+         _debilitated_with(planet, _EXALTATION_LORD[planet])),
+    )],
 
     # ----- 63: Parvata (lord of sign where Lagna lord is, in exaltation/own in Kendra/Trikona) -----
-    if 1 in house_lords:
-        L1 = house_lords[1]
-        if L1 in planet_to_house:
-            h1, s1 = planet_to_house[L1]
-            sign_lord = _SIGN_LORD.get(s1)
-            if sign_lord and sign_lord in planet_to_house:
-                sh, ss = planet_to_house[sign_lord]
-                if sh in _KENDRA_TRIKONA and _planet_in_own_or_exaltation(sign_lord, ss):
-                    _add_yoga(result, "Parvata Yoga", "Lord of the sign where Lagna lord is placed, itself in exaltation or own sign in Kendra or Trikona.")
+    ("Parvata Yoga", "Lord of the sign where Lagna lord is placed, itself in exaltation or own sign in Kendra or Trikona.",
+     _dispositor_strong(_lord(1))),
 
     # ----- Nabhasa: Rajju, Musala, Nala (seven planets in movable/fixed/dual) -----
-    signs_by_nature = {"movable": ["Aries", "Cancer", "Libra", "Capricorn"],
-                       "fixed": ["Taurus", "Leo", "Scorpio", "Aquarius"],
-                       "dual": ["Gemini", "Virgo", "Sagittarius", "Pisces"]}
-    nature_of = {}
-    for nat, signs in signs_by_nature.items():
-        for s in signs:
-            nature_of[s] = nat
-    sign_natures = [nature_of.get(s, "") for p, (_, s) in planet_to_house.items() if p in _SEVEN_GRAHAS and s]
-    if len(sign_natures) >= 5:
-        if all(n == "movable" for n in sign_natures):
-            _add_yoga(result, "Rajju Yoga", "All seven planets in movable signs.")
-        elif all(n == "fixed" for n in sign_natures):
-            _add_yoga(result, "Musala (Nabhasa) Yoga", "All seven planets in fixed signs.")
-        elif all(n == "dual" for n in sign_natures):
-            _add_yoga(result, "Nala Yoga", "All seven planets in dual signs.")
+    ("Rajju Yoga", "All seven planets in movable signs.", _seven_in_signs(_SIGNS_BY_NATURE["movable"])),
+    ("Musala (Nabhasa) Yoga", "All seven planets in fixed signs.", _seven_in_signs(_SIGNS_BY_NATURE["fixed"])),
+    ("Nala Yoga", "All seven planets in dual signs.", _seven_in_signs(_SIGNS_BY_NATURE["dual"])),
+]
+
+# (name, description, severity, test), as for _YOGA_RULES
+_DOSHA_RULES = [
+    # ----- Mangal (Kuja) Dosha: Mars in 1, 2, 4, 7, 8, 12 -----
+    *[("Mangal Dosha (Kuja Dosha)", f"Mars in house {h}.", "moderate" if h in (2, 12) else "high", _placed("Mars", (h,)))
+      for h in (1, 2, 4, 7, 8, 12)],
+
+    # ----- Papa Kartari: malefics flanking a house (7th = marriage, 1st = self, 5th = progeny) -----
+    *[("Papa Kartari Dosha", f"Malefics in houses on both sides of house {target} (e.g. 6th and 8th around 7th).", "moderate",
+       _all(_occupied("lagna", (((target - 2) % 12) + 1,), _MALEFICS), _occupied("lagna", ((target % 12) + 1,), _MALEFICS)))
+      for target in (7, 1, 5)],
+
+    # ----- Kemadruma as dosha (affliction angle; like Kemadruma Yoga but counting the nodes) -----
+    ("Kemadruma Dosha", "Moon without any planet in 2nd and 12th houses from it.", "moderate",
+     _vacant("moon", (2, 12), _TRADITIONAL_PLANETS)),
+]
+
+
+def _compile(rules):
+    """
+    Combine rules into one function, chart bits -> mask of the rules that hold (bit i for
+    rules[i]). Consecutive rules with the same name are tried in order and only the first
+    alternative that holds is reported.
+    """
+    groups = []
+    for i, (rule_name, *_, test) in enumerate(rules):
+        if i and rules[i - 1][0] == rule_name:
+            groups[-1].append((test, 1 << i))
+        else:
+            groups.append([(test, 1 << i)])
+    groups = tuple(tuple(group) for group in groups)
+
+    def fired_mask(bits):
+        fired = 0
+        if not bits.placed:
+            return fired
+        for alternatives in groups:
+            for test, bit in alternatives:
+                if test(bits):
+                    fired |= bit
+                    break
+        return fired
+    return fired_mask
+
+
+def _yoga_entry(name, description):
+    entry = {"name": name, "description": description, "type": "yoga"}
+    if _YOGA_EFFECTS.get(name):
+        entry["effects"] = _YOGA_EFFECTS[name]
+    return entry
+
+
+def _dosha_entry(name, description, severity):
+    entry = {"name": name, "description": description, "severity": severity, "type": "dosha"}
+    if name in _DOSHA_EFFECTS:
+        entry["effects"] = _DOSHA_EFFECTS[name]
+    return entry
+
+
+_yoga_mask = _compile(_YOGA_RULES)
+_dosha_mask = _compile(_DOSHA_RULES)
+_YOGA_ENTRIES = tuple(_yoga_entry(name, *details) for name, *details, _ in _YOGA_RULES)
+_DOSHA_ENTRIES = tuple(_dosha_entry(name, *details) for name, *details, _ in _DOSHA_RULES)
 
+
+def _entries(fired, entries):
+    """Fresh copies of the entries whose bits are set in fired, in rule order."""
+    result = []
+    while fired:
+        low = fired & -fired
+        result.append(entries[low.bit_length() - 1].copy())
+        fired ^= low
     return result
 
 
+# ----- Configuration cache -----
+# Whole-sign charts are fully determined by the Lagna sign and each planet's sign, so their
+# results are cached (modules/yoga_dosha_cache.py) under that configuration packed into
+# 40 bits: Lagna sign in bits 0-3, then 4 bits per planet index (0xF if absent).
+
+_ABSENT = 0xF
+# house_lord of a whole-sign chart, by Lagna sign
+_LORDS_BY_LAGNA = tuple(
+    [-1] + [_SIGN_LORD_INDEX[(lagna + h - 1) % 12] for h in range(1, 13)] for lagna in range(12)
+)
+
+
+def chart_configuration(index):
+    """
+    Packed configuration key of a chart (ChartIndex), or None when its houses, lords or
+    occupants do not follow from the Lagna and planet signs alone.
+    """
+    lagna = index.lagna_sign
+    if lagna < 0 or index.house_lord != _LORDS_BY_LAGNA[lagna]:
+        return None
+    occupants = index.house_occupants
+    key = lagna
+    placed = 0
+    for p, h in enumerate(index.planet_house):
+        if not h:
+            key |= _ABSENT << 4 * (p + 1)
+            continue
+        s = index.planet_sign[p]
+        if s < 0 or (s - lagna) % 12 + 1 != h or p not in occupants[h]:
+            return None
+        key |= s << 4 * (p + 1)
+        placed += 1
+    if sum(map(len, occupants)) != placed:
+        return None
+    return key
+
+
+def configuration_chart(key):
+    """ChartIndex of the whole-sign chart with configuration key (see chart_configuration)."""
+    lagna = key & 0xF
+    signs = [key >> 4 * (p + 1) & 0xF for p in range(9)]
+    if lagna >= 12 or key >> 40 or any(12 <= s < _ABSENT for s in signs):
+        raise ValueError(f"not a chart configuration: {key:#x}")
+    houses = []
+    for h in range(1, 13):
+        sign = (lagna + h - 1) % 12
+        occupants = [SimpleNamespace(celestial_body=PLANETS[p], sign=SIGNS[sign]) for p in range(9) if signs[p] == sign]
+        houses.append(SimpleNamespace(
+            number=h, sign=SIGNS[sign], lord=PLANETS[_SIGN_LORD_INDEX[sign]], occupants=occupants,
+        ))
+    return ChartIndex(SimpleNamespace(d1_chart=SimpleNamespace(houses=houses, planets=[])))
+
+
+def _cached_masks(index):
+    """(yoga mask, dosha mask) of a ChartIndex, from the configuration cache when it has a key."""
+    key = chart_configuration(index)
+    if key is None:
+        yoga_dosha_cache.count_uncacheable()
+        masks = None
+    else:
+        masks = yoga_dosha_cache.get(key)
+    if masks is None:
+        bits = _ChartBits(index)
+        masks = (_yoga_mask(bits), _dosha_mask(bits))
+        if key is not None:
+            yoga_dosha_cache.put(key, masks)
+    return masks
+
+
+def prewarm_yoga_dosha_cache(keys):
+    """Evaluate and cache the given configuration keys; returns how many were added."""
+    added = 0
+    for key in keys:
+        bits = _ChartBits(configuration_chart(key))
+        yoga_dosha_cache.put(key, (_yoga_mask(bits), _dosha_mask(bits)))
+        added += 1
+    yoga_dosha_cache.prewarmed += added
+    return added
+
+
+def detect_yogas(chart):
+    """
+    Detect 50+ planetary Yogas present in the D1 chart.
+    Returns list of dicts: [{ "name": "...", "description": "...", "type": "yoga", "effects": "..."? }, ...]
+    When available from classical texts (Phaladeepika, Saravali), "effects" gives detailed results/phal.
+    """
+    index = ChartIndex.of(chart)
+    if yoga_dosha_cache.enabled:
+        return _entries(_cached_masks(index)[0], _YOGA_ENTRIES)
+    return _entries(_yoga_mask(_ChartBits(index)), _YOGA_ENTRIES)
+
+
 def detect_doshas(chart):
     """
     Detect Doshas (afflictions) present in the D1 chart.
     Returns list of dicts: [{ "name": "...", "description": "...", "severity": "low|moderate|high", "type": "dosha" }, ...]
     """
-    result = []
-    planet_to_house, house_to_planets, house_lords = _get_d1_planet_house_map(chart)
-    if not planet_to_house:
-        return result
-
-    # ----- Mangal (Kuja) Dosha: Mars in 1, 2, 4, 7, 8, 12 -----
-    mangal_houses = {1, 2, 4, 7, 8, 12}
-    if "Mars" in planet_to_house:
-        h, sign = planet_to_house["Mars"]
-        if h in mangal_houses:
-            entry = {
-                "name": "Mangal Dosha (Kuja Dosha)",
-                "description": f"Mars in house {h}.",
-                "severity": "moderate" if h in (2, 12) else "high",
-                "type": "dosha"
-            }
-            if "Mangal Dosha (Kuja Dosha)" in _DOSHA_EFFECTS:
-                entry["effects"] = _DOSHA_EFFECTS["Mangal Dosha (Kuja Dosha)"]
-            result.append(entry)
-
-    # ----- Papa Kartari: malefics flanking a house (e.g. 6th and 8th around 7th) -----
-    for target in [7, 1, 5]:  # 7th = marriage, 1st = self, 5th = progeny
-        left = ((target - 1 - 1) % 12) + 1   # house before target (e.g. 6 for 7th)
-        right = (target % 12) + 1             # house after target (e.g. 8 for 7th)
-        left_planets = {p for p, _ in house_to_planets.get(left, [])}
-        right_planets = {p for p, _ in house_to_planets.get(right, [])}
-        mal_left = left_planets & _MALEFICS
-        mal_right = right_planets & _MALEFICS
-        if mal_left and mal_right:
-            entry = {
-                "name": "Papa Kartari Dosha",
-                "description": f"Malefics in houses on both sides of house {target} (e.g. 6th and 8th around 7th).",
-                "severity": "moderate",
-                "type": "dosha"
-            }
-            if "Papa Kartari Dosha" in _DOSHA_EFFECTS:
-                entry["effects"] = _DOSHA_EFFECTS["Papa Kartari Dosha"]
-            result.append(entry)
-            break
-
-    # ----- Kemadruma as dosha (affliction angle; same condition as Kemadruma Yoga) -----
-    moon_house = _moon_house(chart)
-    if moon_house is not None:
-        h2 = _house_from_moon(moon_house, 2)
-        h12 = _house_from_moon(moon_house, 12)
-        if len(house_to_planets.get(h2, [])) == 0 and len(house_to_planets.get(h12, [])) == 0:
-            # Add once as dosha (affliction); yoga list already has Kemadruma Yoga
-            if not any(d.get("name") == "Kemadruma Dosha" for d in result):
-                entry = {
-                    "name": "Kemadruma Dosha",
-                    "description": "Moon without any planet in 2nd and 12th houses from it.",
-                    "severity": "moderate",
-                    "type": "dosha"
-                }
-                if "Kemadruma Dosha" in _DOSHA_EFFECTS:
-                    entry["effects"] = _DOSHA_EFFECTS["Kemadruma Dosha"]
-                result.append(entry)
-
-    return result
+    index = ChartIndex.of(chart)
+    if yoga_dosha_cache.enabled:
+        return _entries(_cached_masks(index)[1], _DOSHA_ENTRIES)
+    return _entries(_dosha_mask(_ChartBits(index)), _DOSHA_ENTRIES)
 
 
 def analyze_yoga_dosha(chart):
@@ -693,14 +812,20 @@ def analyze_yoga_dosha(chart):
     Analyze D1 chart for Yogas and Doshas. Returns a single dict for sections.
     
     Args:
-        chart: VedicBirthChart object
+        chart: VedicBirthChart object or ChartIndex
     
     Returns:
         dict: { "yogas": [...], "doshas": [...], "summary": "...", "chart": "d1" }.
         Each yoga/dosha may include "effects" (detailed results from classical sources) when available.
     """
-    yogas = detect_yogas(chart)
-    doshas = detect_doshas(chart)
+    index = ChartIndex.of(chart)
+    if yoga_dosha_cache.enabled:
+        yoga_fired, dosha_fired = _cached_masks(index)
+    else:
+        bits = _ChartBits(index)
+        yoga_fired, dosha_fired = _yoga_mask(bits), _dosha_mask(bits)
+    yogas = _entries(yoga_fired, _YOGA_ENTRIES)
+    doshas = _entries(dosha_fired, _DOSHA_ENTRIES)
 
     # Remove duplicate Kemadruma if added both as yoga and dosha (keep in yogas and in doshas for different angle)
     summary_parts = []
@@ -0,0 +1,128 @@
+"""
+Yoga/Dosha Cache Module
+LRU of yoga/dosha results keyed by the packed D1 configuration (Lagna sign and each planet's
+sign, see yoga_dosha_analyzer.chart_configuration), so a configuration seen before skips rule
+evaluation. Values are the bitmasks of the rules that fired, a few bytes per entry.
+The cache can be pre-warmed from a file of configurations (one hex key per line), e.g. the
+hot keys exported from /api/admin/yoga-dosha-cache on a production worker.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+YOGA_DOSHA_CACHE_MAX_ENTRIES = int(os.environ.get("YOGA_DOSHA_CACHE_MAX_ENTRIES", "4096"))
+# Configurations evaluated in the background at worker start (empty: none)
+YOGA_DOSHA_CACHE_WARM_FILE = os.environ.get("YOGA_DOSHA_CACHE_WARM_FILE", "")
+
+logger = logging.getLogger(__name__)
+
+_start_lock = threading.Lock()
+_prewarm_thread = None
+
+
+def read_warm_file(path):
+    """Configuration keys listed in path (hex, one per line; blank lines and # comments skipped)."""
+    keys = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                keys.append(int(line, 16))
+    return keys
+
+
+class YogaDoshaCache:
+    """Thread-safe LRU of configuration key -> (yoga mask, dosha mask)."""
+
+    def __init__(self, max_entries=YOGA_DOSHA_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Charts whose houses, signs and lords do not follow from the configuration
+        self.uncacheable = 0
+        self.evictions = 0
+        self.prewarmed = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def get(self, key):
+        """Return cached masks for key or None (counts a hit or a miss)."""
+        with self._lock:
+            masks = self._entries.get(key)
+            if masks is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return masks
+
+    def put(self, key, masks):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = masks
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def count_uncacheable(self):
+        with self._lock:
+            self.uncacheable += 1
+
+    def hot_keys(self, n=None):
+        """Up to n keys, most recently used first, as hex strings (the warm file format)."""
+        with self._lock:
+            keys = list(reversed(self._entries))
+        return [f"{key:010x}" for key in keys[:n]]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "uncacheable": self.uncacheable,
+                "evictions": self.evictions,
+                "prewarmed": self.prewarmed,
+            }
+
+
+# Process-wide cache used by yoga_dosha_analyzer
+yoga_dosha_cache = YogaDoshaCache()
+
+
+def _prewarm(path):
+    from .yoga_dosha_analyzer import prewarm_yoga_dosha_cache
+    try:
+        # Hottest first; evaluated coldest first so the hottest end up most recently used
+        keys = read_warm_file(path)[:yoga_dosha_cache.max_entries]
+        added = prewarm_yoga_dosha_cache(reversed(keys))
+        logger.info("Yoga/dosha cache pre-warmed with %d configurations from %s", added, path)
+    except Exception:
+        logger.exception("Yoga/dosha cache pre-warm from %s failed", path)
+
+
+def start_prewarm(path=YOGA_DOSHA_CACHE_WARM_FILE):
+    """Pre-warm the process-wide cache from path in a background thread (no-op without a path)."""
+    global _prewarm_thread
+    if not path or not yoga_dosha_cache.enabled:
+        return None
+    with _start_lock:
+        if _prewarm_thread is None:
+            _prewarm_thread = threading.Thread(target=_prewarm, args=(path,), name="yoga-dosha-prewarm", daemon=True)
+            _prewarm_thread.start()
+    return _prewarm_thread